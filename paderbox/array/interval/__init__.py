@@ -14,6 +14,7 @@ of a long audio file (> 2h) in memory.
 from .core import zeros, ones
 from .core import ArrayInterval
 from .core import ArrayInterval_from_str as from_str
+from .core import union, intersection, count_active, at_least_k_active
 
 from .rttm import from_rttm
 from .rttm import from_rttm_str
@@ -21,3 +22,5 @@ from .rttm import to_rttm
 from .rttm import to_rttm_str
 from .kaldi import from_kaldi_segments
 from .kaldi import from_kaldi_segments_str
+from .index import ActivityIndex, TrackIndex
+from .binary import dump_binary, load_binary
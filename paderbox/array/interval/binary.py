@@ -0,0 +1,144 @@
+"""
+Compact binary file format for `ArrayInterval`s and nested dicts of them
+(e.g. file-id -> speaker -> ArrayInterval, as returned by `from_rttm`).
+
+The human readable string format (`ArrayInterval.to_serializable`) is slow
+to parse for millions of intervals. This format stores a small json header
+with the structure of the nested dict, followed by the interval boundaries
+of all ArrayIntervals as one little endian int64 block. Loading maps the
+block into memory (`np.memmap`), so the ArrayIntervals share the memory of
+the file and nothing is parsed or copied until an ArrayInterval is
+modified.
+
+Layout:
+    magic (8 bytes), header length (uint64, little endian), json header,
+    padding to a multiple of 64 bytes, int64 boundaries.
+
+The files use the suffix `.intervals` and can be written and read with
+`pb.io.dump` and `pb.io.load`.
+"""
+import contextlib
+import json
+from pathlib import Path
+
+import numpy as np
+
+from paderbox.array.interval.core import ArrayInterval, zeros, ones
+
+__all__ = [
+    'dump_binary',
+    'load_binary',
+]
+
+_MAGIC = b'PBINTV01'
+_ALIGNMENT = 64
+_DTYPE = np.dtype('<i8')
+
+
+def _encode(obj, boundaries, offset):
+    """
+    Returns the json header of obj and the new offset. A leaf
+    (ArrayInterval) is encoded as list [offset, size, shape, inverse_mode],
+    a dict as json object.
+    """
+    if isinstance(obj, ArrayInterval):
+        b = obj._boundaries
+        boundaries.append(b)
+        return [offset, len(b), obj.shape, obj.inverse_mode], offset + len(b)
+    elif isinstance(obj, dict):
+        header = {}
+        for k, v in obj.items():
+            if not isinstance(k, str):
+                raise TypeError(
+                    f'Only str keys are supported, got {k!r} of type '
+                    f'{type(k)}.'
+                )
+            header[k], offset = _encode(v, boundaries, offset)
+        return header, offset
+    else:
+        raise TypeError(
+            f'Expect an ArrayInterval or a dict of ArrayIntervals, '
+            f'got {type(obj)}: {obj!r}'
+        )
+
+
+def _decode(header, data):
+    if isinstance(header, dict):
+        return {k: _decode(v, data) for k, v in header.items()}
+    offset, size, shape, inverse_mode = header
+    ai = ones(shape) if inverse_mode else zeros(shape)
+    ai._set_array(data[offset:offset + size], normalized=True, copy=False)
+    return ai
+
+
+def dump_binary(obj, path):
+    """
+    Writes an ArrayInterval or a nested dict of ArrayIntervals to `path`.
+
+    >>> import tempfile
+    >>> from paderbox.array.interval import from_str
+    >>> data = {'S02': {
+    ...     'P1': from_str('0:16000, 32000:48000', shape=None),
+    ...     'P2': from_str('0:32000', shape=64000),
+    ... }}
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     dump_binary(data, Path(tmpdir) / 'activity.intervals')
+    ...     print(load_binary(Path(tmpdir) / 'activity.intervals'))
+    {'S02': {'P1': ArrayInterval("0:16000, 32000:48000", shape=None), 'P2': ArrayInterval("0:32000", shape=(64000,))}}
+    """
+    boundaries = []
+    tree, size = _encode(obj, boundaries, 0)
+    header = json.dumps(
+        {'size': size, 'tree': tree}, separators=(',', ':')).encode()
+    position = len(_MAGIC) + 8 + len(header)
+    padding = -position % _ALIGNMENT
+
+    with Path(path).open('wb') as fd:
+        fd.write(_MAGIC)
+        fd.write(np.uint64(len(header)).astype('<u8').tobytes())
+        fd.write(header)
+        fd.write(b'\0' * padding)
+        for b in boundaries:
+            fd.write(np.ascontiguousarray(b, dtype=_DTYPE).tobytes())
+
+
+def load_binary(path, mmap=True):
+    """
+    Reads a file that was written with `dump_binary`.
+
+    Args:
+        path: The file or an opened binary file object.
+        mmap: If True, the boundaries are mapped into memory (zero copy,
+            read only). The ArrayIntervals copy them, when they are
+            modified. If False, the boundaries are read into memory.
+
+    Returns:
+        ArrayInterval or nested dict of ArrayIntervals.
+    """
+    if hasattr(path, 'read'):
+        fd_context = contextlib.nullcontext(path)
+    else:
+        fd_context = Path(path).open('rb')
+    with fd_context as fd:
+        magic = fd.read(len(_MAGIC))
+        if magic != _MAGIC:
+            raise ValueError(
+                f'{getattr(fd, "name", path)} is not an ArrayInterval binary file '
+                f'(magic {magic!r} instead of {_MAGIC!r}).'
+            )
+        header_length = int(np.frombuffer(fd.read(8), dtype='<u8')[0])
+        header = json.loads(fd.read(header_length).decode())
+        offset = len(_MAGIC) + 8 + header_length
+        offset += -offset % _ALIGNMENT
+
+        if header['size'] == 0:
+            data = np.zeros(0, dtype=_DTYPE)
+        elif mmap:
+            data = np.memmap(
+                fd, dtype=_DTYPE, mode='r', offset=offset,
+                shape=(header['size'],),
+            )
+        else:
+            fd.seek(offset)
+            data = np.fromfile(fd, dtype=_DTYPE, count=header['size'])
+    return _decode(header['tree'], data)
@@ -9,10 +9,7 @@ from typing import Optional, Union, Iterable
 
 import numpy as np
 from paderbox.array.interval.util import (
-    cy_non_intersection,
-    cy_intersection,
     cy_parse_item,
-    cy_str_to_intervals,
     cy_invert_intervals,
 )
 
@@ -33,8 +30,6 @@ def ArrayInterval_from_str(string, shape, inverse_mode=False) -> 'ArrayInterval'
     if string == '':
         pass
     else:
-        if not ',' in string:
-            string = string + ','
         try:
             ai.add_intervals_from_str(string)
         except Exception as e:
@@ -56,7 +51,13 @@ def ArrayInterval_from_pairs(pairs: 'list[list[int]]', shape=None, inverse_mode=
 
     """
     ai = zeros(shape)
-    ai.add_intervals([slice(start, end) for start, end in pairs])
+    try:
+        pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    except (TypeError, ValueError):
+        # e.g. None as start or end
+        ai.add_intervals([slice(start, end) for start, end in pairs])
+    else:
+        ai._set_array(_parse_pairs(pairs, ai.shape))
     ai.inverse_mode = inverse_mode
     return ai
 
@@ -65,6 +66,105 @@ def intervals_to_str(intervals):
     return ', '.join(f'{start}:{end}' for start, end in intervals)
 
 
+def _parse_pairs(pairs: np.ndarray, shape) -> np.ndarray:
+    """
+    Vectorized `cy_parse_item` for an (N, 2) array of start and end values:
+    Negative values are counted from the end and the values are clipped to
+    the shape.
+
+    >>> _parse_pairs(np.array([[1, 4], [-5, -1], [8, 20]]), (10,))
+    array([[ 1,  4],
+           [ 5,  9],
+           [ 8, 10]])
+    """
+    if shape is None:
+        if np.any(pairs < 0):
+            raise ValueError(
+                'Shape has to be given if a negative index is used')
+        return pairs
+    size = shape[-1]
+    pairs = np.where(pairs < 0, pairs + size, pairs)
+    pairs[:, 0] = np.maximum(pairs[:, 0], 0)
+    pairs[:, 1] = np.minimum(pairs[:, 1], size)
+    return pairs
+
+
+def _str_to_intervals(string: str) -> np.ndarray:
+    """
+    Parses the string representation of intervals.
+
+    Args:
+        string: Format "<start>:<end>, <start>:<end>, ..."
+
+    Returns:
+        Array with shape (N, 2) and dtype int64.
+
+    >>> _str_to_intervals('1:4, 5:20,21:25,')
+    array([[ 1,  4],
+           [ 5, 20],
+           [21, 25]])
+    >>> _str_to_intervals('1:4, 5')
+    Traceback (most recent call last):
+    ...
+    ValueError: Expect intervals in the format "<start>:<end>, <start>:<end>, ...", got '1:4, 5'
+    >>> _str_to_intervals('1:4, 5:a')
+    Traceback (most recent call last):
+    ...
+    ValueError: Expect intervals in the format "<start>:<end>, <start>:<end>, ...", got '1:4, 5:a'
+    """
+    string = string.strip(', \n')
+    if not string:
+        return np.zeros((0, 2), dtype=np.int64)
+    num_intervals = string.count(':')
+    try:
+        if string.count(',') + 1 != num_intervals:
+            raise ValueError(string)
+        # numpy converts the str tokens (surrounding whitespace is allowed)
+        # with int.
+        values = np.array(
+            string.replace(':', ',').split(','), dtype=np.int64)
+    except ValueError as e:
+        raise ValueError(
+            'Expect intervals in the format "<start>:<end>, <start>:<end>, '
+            f'...", got {string if len(string) < 100 else string[:100] + "..."!r}'
+        ) from e
+    return values.reshape(-1, 2)
+
+
+def _normalize_intervals(intervals) -> np.ndarray:
+    """
+    Sorts the intervals by their start, removes empty intervals and merges
+    overlapping and touching intervals.
+
+    Returns:
+        Array with shape (N, 2) and dtype int64, where the flattened array
+        is strictly increasing.
+
+    >>> _normalize_intervals([(20, 30), (0, 1), (1, 3), (5, 5), (2, 4)])
+    array([[ 0,  4],
+           [20, 30]])
+    >>> _normalize_intervals([])
+    array([], shape=(0, 2), dtype=int64)
+    """
+    intervals = np.array(intervals, dtype=np.int64).reshape(-1, 2)
+    intervals = intervals[intervals[:, 0] < intervals[:, 1]]
+    if len(intervals) > 1:
+        if np.any(intervals[1:, 0] < intervals[:-1, 0]):
+            intervals = intervals[np.argsort(intervals[:, 0], kind='stable')]
+        ends = np.maximum.accumulate(intervals[:, 1])
+        first = np.ones(len(intervals), dtype=bool)
+        first[1:] = intervals[1:, 0] > ends[:-1]
+        if not np.all(first):
+            first = np.flatnonzero(first)
+            last = np.append(first[1:], len(intervals)) - 1
+            intervals = np.stack([intervals[first, 0], ends[last]], axis=-1)
+    return intervals
+
+
+_EMPTY_BOUNDARIES = np.zeros(0, dtype=np.int64)
+_EMPTY_BOUNDARIES.flags.writeable = False
+
+
 def _normalize_shape(shape):
     if shape is None:
         return None
@@ -230,7 +330,7 @@ class ArrayInterval:
         if isinstance(array, ArrayInterval):
             self._shape = array.shape
             self.inverse_mode = array.inverse_mode
-            self.intervals = array.intervals
+            self._set_array(array._array, normalized=True)
         else:
             array = np.asarray(array)
             if array.ndim != 1:
@@ -244,29 +344,17 @@ class ArrayInterval:
                     f'{array!r} with dtype={array.dtype}'
                 )
 
-            if inverse_mode:
-                array = np.logical_not(array)
-            diff = np.diff(array.astype(np.int32))
-
-            rising = list(np.atleast_1d(np.squeeze(np.where(diff > 0), axis=0)) + 1)
-            falling = list(np.atleast_1d(np.squeeze(np.where(diff < 0), axis=0)) + 1)
+            # The edges (rising and falling) are the boundaries of the
+            # intervals. They alternate, hence they are already normalized.
+            edges = np.flatnonzero(array[1:] != array[:-1]) + 1
+            if len(array) and array[0] != inverse_mode:
+                edges = np.concatenate([[0], edges])
+            if len(array) and array[-1] != inverse_mode:
+                edges = np.concatenate([edges, [len(array)]])
 
-            if array[0] == 1:
-                rising = [0] + rising
-
-            if array[-1] == 1:
-                falling = falling + [len(array)]
-
-            # ai = ArrayInterval(shape=array.shape)
             self.inverse_mode = inverse_mode
             self._shape = array.shape
-
-            if inverse_mode:
-                for start, stop in zip(rising, falling):
-                    self[start:stop] = 0
-            else:
-                for start, stop in zip(rising, falling):
-                    self[start:stop] = 1
+            self._set_array(edges, normalized=True)
 
     @property
     def shape(self):
@@ -275,15 +363,15 @@ class ArrayInterval:
     @shape.setter
     def shape(self, shape):
         self._shape = _normalize_shape(shape)
-        if self._intervals and self._shape is not None:
-            assert self.normalized_intervals[-1][-1] <= self._shape[-1], (shape, self._shape, self.normalized_intervals)
+        if self._size and self._shape is not None:
+            assert self._boundaries[-1] <= self._shape[-1], (shape, self._shape, self.normalized_intervals)
 
     def __copy__(self):
         if self.inverse_mode:
             ai = ones(shape=self.shape)
         else:
             ai = zeros(shape=self.shape)
-        ai.intervals = self.intervals
+        ai._set_array(self._array, normalized=True)
         return ai
 
     def __array__(self, dtype=bool):
@@ -357,38 +445,129 @@ class ArrayInterval:
             self.inverse_mode,
         )
 
-    _intervals_normalized = True
-    # _normalized_intervals = ()
-    _intervals = ()
+    # The intervals are stored as a flat, strictly increasing int64 array of
+    # boundaries [start_0, end_0, start_1, end_1, ...], i.e. a normalized
+    # (N, 2) array in row major order. The buffer has spare capacity at the
+    # end, so appending is amortized O(1), and updates splice the buffer in
+    # place. The parity of `np.searchsorted(boundaries, index)` tells whether
+    # an index lies inside an interval.
+    _buffer = _EMPTY_BOUNDARIES
+    _size = 0  # Number of intervals in _buffer
+    _intervals_cache = ()
 
     def __len__(self):
         return self.shape[0]
 
+    @property
+    def _boundaries(self) -> np.ndarray:
+        return self._buffer[:2 * self._size]
+
+    @property
+    def _array(self) -> np.ndarray:
+        """
+        The normalized intervals as (N, 2) int64 array. This is a view of the
+        internal storage, do not modify it.
+        """
+        return self._boundaries.reshape(-1, 2)
+
+    def _set_array(self, array, normalized=False, copy=True):
+        if normalized:
+            array = np.array(
+                array, dtype=np.int64, copy=copy or None).reshape(-1, 2)
+        else:
+            array = _normalize_intervals(array)
+        self._buffer = array.reshape(-1)
+        self._size = len(array)
+        self._intervals_cache = None
+
+    def _splice(self, begin, end, boundaries):
+        """
+        Replaces `self._boundaries[begin:end]` with `boundaries`.
+        """
+        old_length = 2 * self._size
+        new_length = old_length - (end - begin) + len(boundaries)
+        buffer = self._buffer
+        # The buffer is read-only, when it is shared (e.g. the empty default
+        # or a memory map of a file), hence copy on write.
+        if new_length > len(buffer) or not buffer.flags.writeable:
+            buffer = np.empty(max(new_length, 2 * len(buffer), 16), np.int64)
+            buffer[:begin] = self._buffer[:begin]
+            buffer[begin + len(boundaries):new_length] = \
+                self._buffer[end:old_length]
+            self._buffer = buffer
+        elif end - begin != len(boundaries):
+            buffer[begin + len(boundaries):new_length] = buffer[end:old_length]
+        if boundaries:
+            buffer[begin:begin + len(boundaries)] = boundaries
+        self._size = new_length // 2
+        self._intervals_cache = None
+
+    def _add(self, start, stop):
+        """Sets [start, stop) to True (i.e. adds the interval)."""
+        if start >= stop:
+            return
+        boundaries = self._boundaries
+        begin = int(np.searchsorted(boundaries, start, side='left'))
+        end = int(np.searchsorted(boundaries, stop, side='right'))
+        # An odd number of boundaries before an index means that the index
+        # is inside (or at the end of) an interval, that is extended.
+        self._splice(begin, end, (
+            ([] if begin % 2 else [start]) + ([] if end % 2 else [stop])
+        ))
+
+    def _remove(self, start, stop):
+        """Sets [start, stop) to False (i.e. removes the interval)."""
+        if start >= stop:
+            return
+        boundaries = self._boundaries
+        begin = int(np.searchsorted(boundaries, start, side='left'))
+        end = int(np.searchsorted(boundaries, stop, side='right'))
+        # An odd number of boundaries means that an interval overlaps start
+        # or stop and has to be shortened.
+        self._splice(begin, end, (
+            ([start] if begin % 2 else []) + ([stop] if end % 2 else [])
+        ))
+
+    def _intersection(self, start, stop) -> np.ndarray:
+        """
+        The normalized intervals cut to [start, stop) as (N, 2) int64 array.
+        """
+        boundaries = self._boundaries
+        begin = int(np.searchsorted(boundaries, start, side='right'))
+        end = int(np.searchsorted(boundaries, stop, side='left'))
+        if begin >= end and not begin % 2:
+            return np.zeros((0, 2), dtype=np.int64)
+        return np.concatenate([
+            np.array([start] if begin % 2 else [], dtype=np.int64),
+            boundaries[begin:end],
+            np.array([stop] if end % 2 else [], dtype=np.int64),
+        ]).reshape(-1, 2)
+
     @property
     def normalized_intervals(self) -> tuple:
         """
         Normalized intervals. Normalized here means that overlapping intervals
         are merged.
-
-        Note:
-            Changes the internal representation to the normalized intervals.
         """
-        if not self._intervals_normalized:
-            self._intervals = self._normalize(self._intervals)
-            self._intervals_normalized = True
-        return self._intervals
+        if self._intervals_cache is None:
+            self._intervals_cache = tuple(map(tuple, self._array.tolist()))
+        return self._intervals_cache
 
     @property
     def intervals(self) -> tuple:
         """
         A representation of the intervals as tuples of start and end values.
+
+        The intervals are always stored normalized, hence this is the same as
+        `normalized_intervals`.
         """
-        return self._intervals
+        return self.normalized_intervals
 
     @intervals.setter
     def intervals(self, item):
-        self._intervals_normalized = False
-        self._intervals = tuple(item)
+        if not isinstance(item, np.ndarray):
+            item = tuple(item)
+        self._set_array(item)
 
     @staticmethod
     def _normalize(intervals):
@@ -406,23 +585,7 @@ class ArrayInterval:
         >>> ArrayInterval._normalize([(0, 1), (1, 3), (3, 10)])
         ((0, 10),)
         """
-        intervals = [(s, e) for s, e in sorted(intervals) if s < e]
-        for i in range(len(intervals)):
-            try:
-                s, e = intervals[i]
-            except IndexError:
-                break
-            try:
-                next_s, next_e = intervals[i + 1]
-                while next_s <= e:
-                    e = max(e, next_e)
-                    del intervals[i + 1]
-                    next_s, next_e = intervals[i + 1]
-            except IndexError:
-                pass
-            finally:
-                intervals[i] = (s, e)
-        return tuple(intervals)
+        return tuple(map(tuple, _normalize_intervals(intervals).tolist()))
 
     @property
     def _intervals_as_str(self):
@@ -508,7 +671,8 @@ class ArrayInterval:
         Args:
             string_intervals: Format "<start>:<end>,<start>:<end>..."
         """
-        self.intervals = self.intervals + cy_str_to_intervals(string_intervals)
+        self.intervals = np.concatenate([
+            self._array, _str_to_intervals(string_intervals)])
 
     def add_intervals(self, intervals: Iterable[slice]):
         """
@@ -520,9 +684,11 @@ class ArrayInterval:
 
         """
         # Short circuit
-        self.intervals = self.intervals + tuple(
-            [cy_parse_item(i, self.shape) for i in intervals]
-        )
+        self.intervals = np.concatenate([
+            self._array,
+            np.array([cy_parse_item(i, self.shape) for i in intervals],
+                     dtype=np.int64).reshape(-1, 2),
+        ])
 
     def __setitem__(self, item, value):
         """
@@ -617,9 +783,9 @@ class ArrayInterval:
             if self.inverse_mode:
                 value = not value
             if value:
-                self.intervals = self.intervals + ((start, stop),)
+                self._add(start, stop)
             else:
-                self.intervals = cy_non_intersection((start, stop), self.intervals)
+                self._remove(start, stop)
         elif isinstance(value, (tuple, list, np.ndarray, ArrayInterval)):
             if not isinstance(value, ArrayInterval):
                 # Inverse mode has to be the same as self.inverse_mode to have
@@ -632,14 +798,20 @@ class ArrayInterval:
                     f'Could not broadcast input with length {len(value)} into '
                     f'shape {stop - start}'
                 )
-            value_intervals = value.intervals
+            value_intervals = value._array
             if value.inverse_mode != self.inverse_mode:
-                value_intervals = cy_invert_intervals(
-                    value_intervals, value.shape[-1]
-                )
-            intervals = cy_non_intersection((start, stop), self.intervals)
-            self.intervals = intervals + tuple([
-                (s + start, e + start) for s, e in value_intervals
+                value_intervals = np.array(cy_invert_intervals(
+                    value.normalized_intervals, value.shape[-1]
+                ), dtype=np.int64).reshape(-1, 2)
+            self._remove(start, stop)
+            # After the removal, [start, stop) is a gap, hence inserting the
+            # shifted intervals at the position of start keeps the intervals
+            # sorted and only the neighbours may have to be merged.
+            position = int(np.searchsorted(
+                self._boundaries, start, side='right')) // 2
+            array = self._array
+            self.intervals = np.concatenate([
+                array[:position], value_intervals + start, array[position:],
             ])
         else:
             raise NotImplementedError(
@@ -698,11 +870,10 @@ class ArrayInterval:
                     f'Index {item} is out of bounds for ArrayInterval with '
                     f'shape {self.shape}'
                 )
-            # Could be optimized
-            for s, e in self.normalized_intervals:
-                if e > index:
-                    return (index >= s) ^ self.inverse_mode
-            return self.inverse_mode
+            # An odd number of boundaries <= index means that the index is
+            # inside an interval.
+            position = np.searchsorted(self._boundaries, index, side='right')
+            return bool(position % 2) ^ self.inverse_mode
 
         start, stop = cy_parse_item(item, self.shape)
 
@@ -710,19 +881,16 @@ class ArrayInterval:
         if stop <= start:
             return np.zeros(0, dtype=bool)
 
-        intervals = cy_intersection((start, stop), self.normalized_intervals)
+        boundaries = self._intersection(start, stop).reshape(-1) - start
 
+        # The boundaries are unique, hence the cumulative sum of +1 at the
+        # starts and -1 at the ends is 1 inside and 0 outside the intervals.
+        steps = np.zeros(stop - start + 1, dtype=np.int8)
+        steps[boundaries[0::2]] = 1
+        steps[boundaries[1::2]] = -1
+        arr = np.cumsum(steps[:-1], dtype=np.int8).astype(bool)
         if self.inverse_mode:
-            arr = np.ones(stop - start, dtype=bool)
-
-            for i_start, i_end in intervals:
-                arr[i_start - start:i_end - start] = False
-        else:
-            arr = np.zeros(stop - start, dtype=bool)
-
-            for i_start, i_end in intervals:
-                arr[i_start - start:i_end - start] = True
-
+            np.logical_not(arr, out=arr)
         return arr
 
     def pad(self, pad_width, mode='constant', **kwargs):
@@ -778,10 +946,10 @@ class ArrayInterval:
         shape = shape if shape is None else [*shape[:-1],
                                              shape[-1] + pad_width[0] + pad_width[1]]
 
-        return ArrayInterval.from_pairs([
-            [s + pad_width[0], e + pad_width[0]]
-            for s, e in self.normalized_intervals
-        ], shape, self.inverse_mode)
+        ai = zeros(shape)
+        ai._set_array(self._array + pad_width[0], normalized=True)
+        ai.inverse_mode = self.inverse_mode
+        return ai
 
     def _slice_doctest(self):
         """
@@ -824,7 +992,7 @@ class ArrayInterval:
             shape, = [sentinel] if self.ai.shape is None else self.ai.shape
 
             start, stop = cy_parse_item(item, [shape])
-            intervals = cy_intersection((start, stop), self.ai.normalized_intervals)
+            intervals = self.ai._intersection(start, stop)
 
             if shape == sentinel:
                 assert start >= 0, (item, start, stop)
@@ -838,10 +1006,10 @@ class ArrayInterval:
                 shape = stop - start
                 assert shape >= 0, (shape, item, start, stop)
 
-            return ArrayInterval.from_pairs([
-                [s-start, e-start]
-                for s, e in intervals
-            ], shape, self.ai.inverse_mode)
+            ai = zeros(shape)
+            ai._set_array(intervals - start, normalized=True)
+            ai.inverse_mode = self.ai.inverse_mode
+            return ai
 
     def sum(self, axis=None, out=None):
         """
@@ -858,10 +1026,10 @@ class ArrayInterval:
         """
         assert out is None, (out, axis, self)
         assert axis is None or axis in (0, -1), (axis, out, self)
-        if not self.normalized_intervals:
+        if not self._size:
             sum = 0
         else:
-            a, b = np.sum(self.normalized_intervals, axis=0)
+            a, b = np.sum(self._array, axis=0)
             sum = b - a
         if self.inverse_mode:
             sum = self.shape[0] - sum
@@ -892,7 +1060,7 @@ class ArrayInterval:
                     f'{self.shape} {other.shape}'
                 )
             ai = zeros(shape=self.shape)
-            ai.intervals = self.intervals + other.intervals
+            ai.intervals = np.concatenate([self._array, other._array])
             return ai
         # elif self.inverse_mode is True and other.inverse_mode is True:
         #     assert other.shape == self.shape, (self.shape, other.shape)
@@ -923,7 +1091,7 @@ class ArrayInterval:
             ai = zeros(shape=self.shape)
         else:
             ai = ones(shape=self.shape)
-        ai.intervals = self.intervals
+        ai._set_array(self._array, normalized=True)
         return ai
 
     def __and__(self, other):
@@ -951,16 +1119,7 @@ class ArrayInterval:
                     f'Cannot broadcast together ArrayIntervals with shapes '
                     f'{self.shape} {other.shape}'
                 )
-            ai = zeros(shape=self.shape)
-
-            normalized_intervals = self.normalized_intervals
-            intervals = []
-            for (start, stop) in other.normalized_intervals:
-                intervals.extend(cy_intersection(
-                    (start, stop), normalized_intervals))
-
-            ai.intervals = intervals
-            return ai
+            return intersection(self, other)
         else:
             raise NotImplementedError(self.inverse_mode, other.inverse_mode)
 
@@ -1185,3 +1344,206 @@ def _combine(func, *array_intervals, out=None):
         # print(s, e, values, func(*values))
         out[s:e] = func(*[ai[s] for ai in array_intervals])
     return out
+
+
+def _common_shape(array_intervals):
+    shapes = {ai.shape for ai in array_intervals}
+    if len(shapes) != 1:
+        raise ValueError(
+            f'Cannot broadcast together ArrayIntervals with shapes '
+            f'{" ".join(map(str, shapes))}'
+        )
+    shape, = shapes
+    return shape
+
+
+def _active_intervals(ai: ArrayInterval) -> np.ndarray:
+    """
+    The intervals where `ai` is True as (N, 2) int64 array, independent of
+    `ai.inverse_mode`.
+    """
+    if not ai.inverse_mode:
+        return ai._array
+    if ai.shape is None:
+        raise ValueError(
+            f'An {ai.__class__.__name__} with inverse_mode=True needs a '
+            f'shape for this operation, because it is True until infinity.'
+        )
+    # Removes the empty intervals at the edges (i.e. (0, 0) and
+    # (size, size)).
+    return _normalize_intervals(np.concatenate([
+        [0], ai._boundaries, [ai.shape[-1]]
+    ]))
+
+
+def _sweep(boundaries):
+    """
+    Sweeps over the concatenated boundaries of several normalized interval
+    sets.
+
+    Args:
+        boundaries: 1-dimensional int64 array, concatenation of the flat
+            boundaries (start_0, end_0, start_1, ...) of several tracks.
+
+    Returns:
+        edges: Sorted, unique positions, where the number of active
+            tracks changes.
+        counts: counts[i] is the number of active tracks in
+            [edges[i], edges[i+1]). After the last edge, the count is zero.
+    """
+    # Each start increases and each end decreases the count by one.
+    steps = np.tile(np.array([1, -1], dtype=np.int64), len(boundaries) // 2)
+    order = np.argsort(boundaries, kind='stable')
+    boundaries = boundaries[order]
+    steps = steps[order]
+
+    first = np.ones(len(boundaries), dtype=bool)
+    first[1:] = boundaries[1:] != boundaries[:-1]
+    first = np.flatnonzero(first)
+    edges = boundaries[first]
+    counts = np.cumsum(np.add.reduceat(steps, first)) if len(first) else steps
+    return edges, counts
+
+
+def count_active(*array_intervals):
+    """
+    Counts the number of active (i.e. True) ArrayIntervals for each
+    position with one vectorized sweep over all interval boundaries.
+
+    Args:
+        *array_intervals: ArrayIntervals with the same shape, e.g. the
+            activities of all speakers of a session.
+
+    Returns:
+        intervals: Array with shape (N, 2) and dtype int64 with the
+            maximal sections, where the count is constant and larger than
+            zero.
+        counts: Array with shape (N,), the number of active
+            ArrayIntervals in each section. Outside the sections, no
+            ArrayInterval is active.
+
+    >>> a = ArrayInterval.from_str('0:10, 20:30', shape=40)
+    >>> b = ArrayInterval.from_str('5:25', shape=40)
+    >>> c = ArrayInterval.from_str('8:10, 10:12, 35:40', shape=40)
+    >>> intervals, counts = count_active(a, b, c)
+    >>> for (start, stop), count in zip(intervals.tolist(), counts.tolist()):
+    ...     print(f'{start}:{stop} {count}')
+    0:5 1
+    5:8 2
+    8:10 3
+    10:12 2
+    12:20 1
+    20:25 2
+    25:30 1
+    35:40 1
+
+    Overlap statistics, e.g. the number of samples with overlapping speech:
+    >>> int(np.sum(np.diff(intervals[counts >= 2], axis=-1)))
+    12
+    """
+    _common_shape(array_intervals)
+    return _sections(*_sweep(_concatenate_active(array_intervals)))
+
+
+def _concatenate_active(array_intervals):
+    return np.concatenate([
+        np.zeros(0, dtype=np.int64),
+        *[_active_intervals(ai).reshape(-1) for ai in array_intervals],
+    ])
+
+
+def _sections(edges, counts):
+    """
+    Converts the output of `_sweep` to the maximal sections with a constant,
+    positive count, see `count_active`.
+    """
+    if len(edges) == 0:
+        return np.zeros((0, 2), dtype=np.int64), np.zeros(0, dtype=np.int64)
+
+    # The section i is [edges[i], edges[i+1]). Merge neighbouring sections
+    # with the same count and drop the inactive sections.
+    counts = counts[:-1]
+    change = np.ones(len(counts), dtype=bool)
+    change[1:] = counts[1:] != counts[:-1]
+    starts = edges[:-1][change]
+    intervals = np.stack([starts, np.append(starts[1:], edges[-1])], axis=-1)
+    counts = counts[change]
+    active = counts > 0
+    return intervals[active], counts[active]
+
+
+def at_least_k_active(array_intervals, k):
+    """
+    Positions, where at least `k` of the `array_intervals` are active,
+    calculated with one vectorized sweep over all interval boundaries.
+
+    Args:
+        array_intervals: List of ArrayIntervals with the same shape.
+        k: Minimum number of active ArrayIntervals.
+
+    Returns:
+        ArrayInterval
+
+    >>> a = ArrayInterval.from_str('0:10, 20:30', shape=40)
+    >>> b = ArrayInterval.from_str('5:25', shape=40)
+    >>> c = ArrayInterval.from_str('8:12, 35:40', shape=40)
+    >>> at_least_k_active([a, b, c], 2)
+    ArrayInterval("5:12, 20:25", shape=(40,))
+    >>> at_least_k_active([a, b, c], 3)
+    ArrayInterval("8:10", shape=(40,))
+    """
+    array_intervals = list(array_intervals)
+    if k < 1:
+        raise ValueError(f'k has to be positive, got {k}')
+    ai = zeros(_common_shape(array_intervals))
+    edges, counts = _sweep(_concatenate_active(array_intervals))
+    ai._set_array(_at_least_k_boundaries(edges, counts, k), normalized=True)
+    return ai
+
+
+def _at_least_k_boundaries(edges, counts, k):
+    """
+    Flat boundaries of the sections, where the count of `_sweep` is at
+    least k.
+    """
+    if len(edges) == 0:
+        return edges
+    # The count after the last edge is zero, hence each section, where the
+    # count is at least k, ends at an edge.
+    active = counts >= k
+    change = np.flatnonzero(active[1:] != active[:-1]) + 1
+    if active[0]:
+        change = np.concatenate([[0], change])
+    return edges[change]
+
+
+def union(*array_intervals):
+    """
+    Logical or of all `array_intervals`, i.e. the positions, where at least
+    one ArrayInterval is active (e.g. any speaker).
+
+    >>> a = ArrayInterval.from_str('0:10, 20:30', shape=40)
+    >>> b = ArrayInterval.from_str('5:25', shape=40)
+    >>> c = ArrayInterval.from_str('8:12, 35:40', shape=40)
+    >>> union(a, b, c)
+    ArrayInterval("0:30, 35:40", shape=(40,))
+    """
+    if not array_intervals:
+        raise ValueError('union needs at least one ArrayInterval')
+    return at_least_k_active(array_intervals, 1)
+
+
+def intersection(*array_intervals):
+    """
+    Logical and of all `array_intervals`, i.e. the positions, where all
+    ArrayIntervals are active.
+
+    >>> a = ArrayInterval.from_str('0:10, 20:30', shape=40)
+    >>> b = ArrayInterval.from_str('5:25', shape=40)
+    >>> c = ArrayInterval.from_str('8:12, 22:40', shape=40)
+    >>> intersection(a, b, c)
+    ArrayInterval("8:10, 22:25", shape=(40,))
+    """
+    if not array_intervals:
+        raise ValueError('intersection needs at least one ArrayInterval')
+    return at_least_k_active(array_intervals, len(array_intervals))
@@ -0,0 +1,295 @@
+"""
+Index for fast queries on the activity of several tracks (e.g. speakers),
+like "which speakers are active in [t0, t1)" or "where are more than two
+speakers active".
+
+The index is built once from the nested dict that is returned by e.g.
+`from_rttm` (file-id -> speaker -> ArrayInterval) and consists only of
+numpy arrays, hence it is cheap to serialize.
+"""
+import collections.abc
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from paderbox.array.interval.core import (
+    ArrayInterval,
+    zeros,
+    _active_intervals,
+    _at_least_k_boundaries,
+    _common_shape,
+    _sections,
+    _sweep,
+)
+
+__all__ = [
+    'TrackIndex',
+    'ActivityIndex',
+]
+
+
+class TrackIndex:
+    """
+    Activity index for the tracks (e.g. speakers) of one session.
+
+    Stores the boundaries of all tracks in one array (one segment per
+    track) and the number of active tracks for each section between two
+    boundaries. Point, range and count queries are binary searches.
+
+    >>> tracks = {
+    ...     'A': ArrayInterval.from_str('0:10, 20:30', shape=None),
+    ...     'B': ArrayInterval.from_str('5:25', shape=None),
+    ...     'C': ArrayInterval.from_str('8:12, 35:40', shape=None),
+    ... }
+    >>> index = TrackIndex.from_dict(tracks)
+    >>> index.active(9)
+    ['A', 'B', 'C']
+    >>> index.active(12, 21)
+    ['A', 'B']
+    >>> index.active(30, 35)
+    []
+    >>> index.count(9), index.count(22), index.count(32)
+    (3, 2, 0)
+    >>> index.at_least_k_active(2)
+    ArrayInterval("5:12, 20:25", shape=None)
+    >>> index['B']
+    ArrayInterval("5:25", shape=None)
+    """
+    def __init__(
+            self,
+            names: Tuple[str, ...],
+            boundaries: np.ndarray,
+            offsets: np.ndarray,
+            shape: Optional[tuple] = None,
+            edges: Optional[np.ndarray] = None,
+            counts: Optional[np.ndarray] = None,
+    ):
+        """
+        Use `TrackIndex.from_dict` to build an index from ArrayIntervals.
+
+        Args:
+            names: The names of the tracks.
+            boundaries: Concatenation of the flat, normalized boundaries
+                (start_0, end_0, start_1, ...) of all tracks.
+            offsets: The boundaries of track `i` are
+                `boundaries[offsets[i]:offsets[i+1]]`.
+            shape: The common shape of the tracks.
+            edges, counts: Result of the sweep over all boundaries. Computed
+                from the boundaries, when they are not given.
+        """
+        self.names = tuple(names)
+        self.boundaries = np.asarray(boundaries, dtype=np.int64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        self.shape = None if shape is None else tuple(shape)
+        assert len(self.offsets) == len(self.names) + 1, (names, offsets)
+
+        if edges is None or counts is None:
+            edges, counts = _sweep(self.boundaries)
+        self.edges = np.asarray(edges, dtype=np.int64)
+        self.counts = np.asarray(counts, dtype=np.int64)
+
+        # Shift the boundaries of track i to [i * span, (i + 1) * span - 1).
+        # Then the boundaries of all tracks form one sorted array and a
+        # single searchsorted call finds the position in each track.
+        if len(self.boundaries):
+            self._low = int(self.boundaries.min())
+            span = int(self.boundaries.max()) - self._low + 2
+        else:
+            self._low, span = 0, 2
+        track = np.repeat(np.arange(len(self.names)), np.diff(self.offsets))
+        self._shift = np.arange(len(self.names), dtype=np.int64) * span
+        self._shifted = self.boundaries - self._low + self._shift[track]
+        self._span = span
+
+    @classmethod
+    def from_dict(cls, tracks: Dict[str, ArrayInterval]) -> 'TrackIndex':
+        """
+        Args:
+            tracks: dict from the track name (e.g. speaker) to the activity.
+                numpy arrays are converted to ArrayIntervals.
+        """
+        tracks = {
+            k: v if isinstance(v, ArrayInterval) else ArrayInterval(v)
+            for k, v in tracks.items()
+        }
+        shape = _common_shape(tracks.values()) if tracks else None
+        boundaries = [
+            _active_intervals(ai).reshape(-1) for ai in tracks.values()]
+        offsets = np.cumsum([0] + [len(b) for b in boundaries])
+        return cls(
+            names=tuple(tracks.keys()),
+            boundaries=np.concatenate(
+                [np.zeros(0, dtype=np.int64), *boundaries]),
+            offsets=offsets,
+            shape=shape,
+        )
+
+    def _positions(self, index, side):
+        """Number of boundaries left of index (see np.searchsorted) in
+        each track."""
+        # Clip the index to the range, where it cannot reach the segment of
+        # the neighbouring track.
+        index = min(max(index - self._low, -1), self._span - 1)
+        return np.searchsorted(
+            self._shifted, index + self._shift, side=side
+        ) - self.offsets[:-1]
+
+    def active(self, start, stop=None) -> list:
+        """
+        The names of the tracks that are active at index `start` (when
+        `stop` is None) or somewhere in [start, stop).
+        """
+        if stop is None:
+            mask = self._positions(start, 'right') % 2 == 1
+        elif stop <= start:
+            return []
+        else:
+            before = self._positions(start, 'right')
+            # Active at start or an interval starts in (start, stop).
+            mask = (before % 2 == 1) | (
+                self._positions(stop, 'left') > before)
+        return [self.names[i] for i in np.flatnonzero(mask)]
+
+    def count(self, index) -> int:
+        """The number of active tracks at `index`."""
+        position = np.searchsorted(self.edges, index, side='right') - 1
+        if position < 0:
+            return 0
+        return int(self.counts[position])
+
+    def count_active(self):
+        """
+        The number of active tracks as step function, see
+        `paderbox.array.interval.count_active`.
+        """
+        return _sections(self.edges, self.counts)
+
+    def at_least_k_active(self, k) -> ArrayInterval:
+        """
+        The positions, where at least `k` tracks are active (e.g. `k=2`
+        for overlapping speech).
+        """
+        if k < 1:
+            raise ValueError(f'k has to be positive, got {k}')
+        ai = zeros(self.shape)
+        ai._set_array(
+            _at_least_k_boundaries(self.edges, self.counts, k),
+            normalized=True,
+        )
+        return ai
+
+    def __getitem__(self, name) -> ArrayInterval:
+        i = self.names.index(name)
+        ai = zeros(self.shape)
+        ai._set_array(
+            self.boundaries[self.offsets[i]:self.offsets[i + 1]],
+            normalized=True,
+        )
+        return ai
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}(names={self.names!r}, '
+            f'num_intervals={len(self.boundaries) // 2}, shape={self.shape})'
+        )
+
+    def to_serializable(self):
+        """
+        Exports the index to a dict of builtin types and numpy arrays, e.g.
+        for `pb.io.dump` with json or pkl.
+        """
+        return {
+            'names': list(self.names),
+            'shape': self.shape,
+            'boundaries': self.boundaries,
+            'offsets': self.offsets,
+            'edges': self.edges,
+            'counts': self.counts,
+        }
+
+    @classmethod
+    def from_serializable(cls, obj):
+        """
+        Reverts `to_serializable`.
+        """
+        return cls(**obj)
+
+
+class ActivityIndex(collections.abc.Mapping):
+    """
+    `TrackIndex` for each session of a nested dict of activities, as it is
+    returned by e.g. `from_rttm` (file-id -> speaker -> ArrayInterval).
+
+    >>> import tempfile, paderbox as pb
+    >>> from pathlib import Path
+    >>> from paderbox.array.interval import from_rttm_str
+    >>> activity = from_rttm_str(
+    ...     'SPEAKER S02 1 0 1 <NA> <NA> P1 <NA>\\n'
+    ...     'SPEAKER S02 1 2 1 <NA> <NA> P1 <NA>\\n'
+    ...     'SPEAKER S02 1 0.5 2 <NA> <NA> P2 <NA>\\n'
+    ...     'SPEAKER S03 1 0 4 <NA> <NA> P3 <NA>\\n',
+    ...     sample_rate=10,
+    ... )
+    >>> index = ActivityIndex.from_dict(activity)
+    >>> index
+    ActivityIndex(S02: TrackIndex(names=('P1', 'P2'), num_intervals=3, shape=None), S03: TrackIndex(names=('P3',), num_intervals=1, shape=None))
+    >>> index['S02'].active(22)
+    ['P1', 'P2']
+    >>> index['S02'].at_least_k_active(2)
+    ArrayInterval("5:10, 20:25", shape=None)
+    >>> with tempfile.TemporaryDirectory() as tmpdir:
+    ...     pb.io.dump(index.to_serializable(), Path(tmpdir) / 'index.json')
+    ...     index = ActivityIndex.from_serializable(
+    ...         pb.io.load(Path(tmpdir) / 'index.json'))
+    >>> index['S02'].active(0, 6)
+    ['P1', 'P2']
+    """
+    def __init__(self, sessions: Dict[str, TrackIndex]):
+        self.sessions = dict(sessions)
+
+    @classmethod
+    def from_dict(cls, activity: dict) -> 'ActivityIndex':
+        """
+        Args:
+            activity: Nested dict (file-id -> track name -> ArrayInterval).
+        """
+        return cls({
+            session: TrackIndex.from_dict(tracks)
+            for session, tracks in activity.items()
+        })
+
+    def __getitem__(self, session) -> TrackIndex:
+        return self.sessions[session]
+
+    def __iter__(self):
+        return iter(self.sessions)
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __repr__(self):
+        sessions = ', '.join(f'{k}: {v!r}' for k, v in self.sessions.items())
+        return f'{self.__class__.__name__}({sessions})'
+
+    def to_serializable(self):
+        """
+        Exports the index to a dict of builtin types and numpy arrays, e.g.
+        for `pb.io.dump` with json or pkl.
+        """
+        return {
+            session: index.to_serializable()
+            for session, index in self.sessions.items()
+        }
+
+    @classmethod
+    def from_serializable(cls, obj):
+        """
+        Reverts `to_serializable`.
+        """
+        return cls({
+            session: TrackIndex.from_serializable(index)
+            for session, index in obj.items()
+        })
@@ -4,7 +4,7 @@ import decimal
 
 import numpy as np
 
-from paderbox.array.interval.core import zeros
+from paderbox.array.interval.core import ArrayInterval
 from paderbox.array.interval.rttm import _merge_dicts
 
 
@@ -46,7 +46,9 @@ def from_kaldi_segments_str(segments_str, shape=None, sample_rate=16000, round_f
     # Utterance-ID File-ID Start End
     # S02_U06.ENH-0004121-0004187 S02_U06.ENH 41.21 41.87
 
-    data = collections.defaultdict(lambda: zeros(shape))
+    # Collect the pairs first and create each ArrayInterval in one bulk
+    # operation.
+    data = collections.defaultdict(list)
 
     for line in lines:
         parts = line.split()
@@ -69,6 +71,9 @@ def from_kaldi_segments_str(segments_str, shape=None, sample_rate=16000, round_f
         assert begin_time == int(begin_time), begin_time
         assert end_time == int(end_time), end_time
 
-        data[file_id][int(begin_time):int(end_time)] = 1
+        data[file_id].append((int(begin_time), int(end_time)))
 
-    return dict(data)
+    return {
+        file_id: ArrayInterval.from_pairs(pairs, shape=shape)
+        for file_id, pairs in data.items()
+    }
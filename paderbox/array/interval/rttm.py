@@ -104,7 +104,9 @@ def from_rttm_str(rttm_str, shape=None, sample_rate=16000):
 
     # SPEAKER S02_U06.ENH 1   40.60    3.22 <NA> <NA> P05 <NA>
 
-    data = collections.defaultdict(lambda: zeros(shape))
+    # Collect the pairs first and create each ArrayInterval in one bulk
+    # operation.
+    data = collections.defaultdict(list)
 
     for line in lines:
         parts = line.split()
@@ -121,9 +123,12 @@ def from_rttm_str(rttm_str, shape=None, sample_rate=16000):
         assert begin_time == int(begin_time), begin_time
         assert end_time == int(end_time), end_time
 
-        data[(file_id, name)][int(begin_time):int(end_time)] = 1
+        data[(file_id, name)].append((int(begin_time), int(end_time)))
 
-    return deflatten(data, sep=None)
+    return deflatten({
+        k: ArrayInterval.from_pairs(v, shape=shape)
+        for k, v in data.items()
+    }, sep=None)
 
 
 def to_rttm_str(data, sample_rate=16000):
@@ -6,60 +6,6 @@
 # ToDO: better place for testcode
 #       http://ntsvr1:1619/notebooks/chime5/2018_05_17_tf_blstm.ipynb
 
-def cy_non_intersection(interval: tuple, intervals: tuple) -> tuple:
-    """
-    "Removes" one `interval` from `intervals` by removing or shortening any
-    intervals in `intervals` that overlap with `interval`.
-
-    Similar to `cy_intersection(inverted_interval, intervals)`.
-    """
-    cdef:
-        long long start
-        long long end
-        long long i_start
-        long long i_end
-        list new_interval
-    start, end = interval
-    new_interval = []
-
-    for i_start, i_end in intervals:
-
-        if start < i_start < end:
-            i_start = end
-        elif start < i_end < end:
-            i_end = start
-        elif i_start < start and end < i_end:
-            new_interval.append((i_start, start))
-            i_start = end
-
-        if i_start < i_end:
-            new_interval.append((i_start, i_end))
-
-    return tuple(new_interval)
-
-
-def cy_intersection(interval, intervals):
-    """
-    "Cuts" out intervals from `intervals` that lie within `interval`.
-    """
-    cdef:
-        long long start
-        long long end
-        long long i_start
-        long long i_end
-        list new_interval
-
-    start, end = interval
-    new_interval = []
-
-    for i_start, i_end in intervals:
-        i_start = max(start, i_start)
-        i_end = min(end, i_end)
-        if i_start < i_end:
-            new_interval.append((i_start, i_end))
-
-    return tuple(new_interval)
-
 def cy_intersection_double(interval, intervals):
     cdef:
         double start
@@ -147,39 +93,6 @@ def cy_parse_item(item, shape):
     return start, stop
 
 
-def cy_str_to_intervals(string):
-
-    cdef:
-        str intervals_string
-        str interval_string
-        str start_str
-        str end_str
-        long long start
-        long long end
-        list intervals
-
-    intervals_string = string
-
-#     start, end = interval
-    intervals = []
-
-#     for i_start, i_end in intervals:
-
-    for interval_string in intervals_string.replace(' ', '').strip(',').split(','):
-
-        try:
-            start_str, end_str = interval_string.split(':')
-        except Exception as e:
-            print('interval_string in cy_str_to_intervals', repr(interval_string))
-            raise Exception(interval_string) from e
-        start = int(start_str)
-        end = int(end_str)
-
-        intervals.append((start, end))
-
-    return tuple(intervals)
-
-
 def cy_invert_intervals(normalized_intervals, size):
     """
     Inverts intervals.
@@ -280,3 +280,80 @@ def segment_axis(x, length: int, shift: int, axis: int=-1,
         return xp.flip(x, axis=axis)
     else:
         return x
+
+
+def overlap_add(x, shift: int, axis: int=-2, out=None):
+    """Overlap-add of frames, i.e. the inverse operation of `segment_axis`
+    for overlapping frames, where overlapping values are summed.
+
+    Instead of an unbuffered `np.add.at` with one index per value, the frames
+    are split into `ceil(length / shift)` pieces of length `shift`. Each piece
+    is added with one buffered inplace add to a strided view of the output.
+    The frames are accumulated in ascending order, hence the result is equal
+    to `np.add.at` on `segment_axis(out, length, shift, end=None)`.
+
+    Args:
+        x: The frames with the frame axis `axis` and the frame length at
+            `axis + 1`, e.g. (..., frames, length) for `axis=-2`.
+        shift: The number of array elements between two frames.
+        axis: The frame axis.
+        out: Optional output array with the shape of `x` without the
+            frame length axis and the length `frames * shift + length - shift`
+            at `axis`. When given, the frames are added to its values.
+
+    Returns:
+        The overlap-added signal, `out` when given.
+
+    >>> overlap_add(np.ones((4, 4), dtype=int), 2)
+    array([1, 1, 2, 2, 2, 2, 2, 2, 1, 1])
+    >>> overlap_add(segment_axis(np.arange(10), 4, 2), 2)
+    array([ 0,  1,  4,  6,  8, 10, 12, 14,  8,  9])
+    >>> overlap_add(np.ones((3, 2)), 3)  # shift > length
+    array([1., 1., 0., 1., 1., 0., 1., 1.])
+    >>> overlap_add(np.ones((2, 3, 5, 6)), 2, axis=1).shape
+    (2, 9, 6)
+    >>> out = np.ones(6)
+    >>> overlap_add(np.ones((2, 4)), 2, out=out)
+    array([2., 2., 3., 3., 2., 2.])
+    >>> out
+    array([2., 2., 3., 3., 2., 2.])
+    """
+    x = np.asarray(x)
+    axis = axis % x.ndim
+    assert axis + 1 < x.ndim, (axis, x.shape)
+    frames, length = x.shape[axis], x.shape[axis + 1]
+    num_samples = frames * shift + length - shift
+
+    shape = list(x.shape)
+    del shape[axis + 1]
+    shape[axis] = num_samples
+    if out is None:
+        out = np.zeros(shape, dtype=x.dtype)
+    else:
+        assert out.shape == tuple(shape), (out.shape, shape, x.shape, shift)
+
+    x = np.moveaxis(x, [axis, axis + 1], [-2, -1])
+    out_view = np.moveaxis(out, axis, -1)
+
+    if frames == 0:
+        return out
+
+    # The k-th piece of frame t is added to the samples
+    # [(t + k) * shift, (t + k + 1) * shift).
+    # Iterate the pieces in reverse order, so that each sample accumulates the
+    # frames in ascending order.
+    for k in reversed(range(-(-length // shift))):
+        piece = x[..., k * shift:(k + 1) * shift]
+        start = k * shift
+        stop = start + frames * shift
+        if stop > num_samples:
+            # Only possible, when shift > length
+            out_seg = segment_axis(
+                out_view[..., start:], piece.shape[-1], shift, end=None)
+        else:
+            out_seg = segment_axis(
+                out_view[..., start:stop], shift, shift, end=None
+            )[..., :piece.shape[-1]]
+        out_seg += piece
+
+    return out
@@ -39,6 +39,7 @@ def dump(
        - npy: Numpy
        - npz: Numpy compressed
        - pth: Pickle with Pytorch support
+       - intervals: ArrayInterval or nested dict of ArrayIntervals
      - Compressed:
        - json.gz
        - pkl.gz
@@ -139,6 +140,10 @@ def dump(
             np.savez(str(path), **obj)
         else:
             np.savez(str(path), obj)
+    elif str(path).endswith('.intervals'):
+        from paderbox.array.interval import dump_binary
+        assert len(kwargs) == 0, kwargs
+        dump_binary(obj, path)
     elif str(path).endswith('.pth'):
         assert unsafe, (unsafe, path)
         import torch
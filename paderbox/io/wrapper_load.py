@@ -119,6 +119,9 @@ class Loader:
             from paderbox.io.audioread import read_nist_wsj
             date, sampling_rate = read_nist_wsj(file)
             return date
+        elif ext in ['.intervals']:
+            from paderbox.array.interval import load_binary
+            return load_binary(file, **self.kwargs)
         elif ext in ['.pth']:
             return self.pth(file, map_location='cpu', weights_only=not self.unsafe)
         elif ext in ['.mat']:
@@ -318,6 +321,7 @@ def load(
                     - .wav: Audio file
                     - .wv1, .wv2: Nist file
                     - .json.gz Compressed json
+                    - .intervals: ArrayIntervals (memory mapped)
                 - Optional safe/unsafe extensions:
                     - .yaml
                     - .npz, .npy: Numpy file
@@ -0,0 +1,479 @@
+"""
+Benchmark suite for the signal processing functions in paderbox.
+
+The benchmarks need no network access and no third party reference
+implementations. Each benchmark is evaluated on a grid of parameters (e.g.
+channels, batch size and dtype) and the results are stored as JSON, so that
+the results of two versions (or machines) can be compared automatically.
+
+Usage:
+    # Run all benchmarks and write the results
+    python -m paderbox.testing.benchmark run --out=new.json
+    # Run only some benchmarks
+    python -m paderbox.testing.benchmark run --out=new.json --names="[stft,istft]"
+    # Compare against a baseline, exits with 1 when a benchmark got slower
+    python -m paderbox.testing.benchmark compare baseline.json new.json --tolerance=0.2
+
+From python:
+
+>>> results = run(['segment_axis'], repeat=1, number=1,
+...               overrides={'channels': [1], 'seconds': [0.1]})
+>>> len(results['results'])
+4
+>>> list(results['results'].keys())[0]
+'segment_axis[channels=1,dtype=float64,end=cut,seconds=0.1]'
+>>> compare(results, results)
+[]
+"""
+import dataclasses
+import datetime
+import itertools
+import os
+import platform
+import shutil
+import sys
+import timeit
+import typing
+from pathlib import Path
+
+import numpy as np
+import scipy.signal
+
+__all__ = [
+    'SkipBenchmark',
+    'register',
+    'names',
+    'run',
+    'compare',
+]
+
+SAMPLE_RATE = 16000
+
+
+class SkipBenchmark(Exception):
+    """Raised by the setup of a benchmark, that cannot run in this
+    environment (e.g. a missing binary)."""
+
+
+@dataclasses.dataclass
+class _Benchmark:
+    name: str
+    setup: typing.Callable
+    grid: dict
+
+    def configurations(self, overrides=None):
+        grid = dict(self.grid)
+        for key, values in (overrides or {}).items():
+            if key in grid:
+                grid[key] = list(values)
+        keys = sorted(grid.keys())
+        for values in itertools.product(*[grid[k] for k in keys]):
+            yield dict(zip(keys, values))
+
+
+_benchmarks: typing.Dict[str, _Benchmark] = {}
+
+
+def register(name, **grid):
+    """Registers a benchmark.
+
+    The decorated function is called with one configuration of the grid as
+    keyword arguments and returns a function without arguments, that is timed.
+    The setup time is not measured.
+
+    >>> @register('example', size=[10, 100])
+    ... def _example(size):
+    ...     x = np.ones(size)
+    ...     return lambda: x.sum()
+    >>> 'example' in names()
+    True
+    >>> del _benchmarks['example']
+    """
+    def decorator(setup):
+        assert name not in _benchmarks, f'Benchmark {name!r} already exists.'
+        _benchmarks[name] = _Benchmark(name, setup, grid)
+        return setup
+    return decorator
+
+
+def names():
+    """Returns the names of all registered benchmarks."""
+    return list(_benchmarks.keys())
+
+
+def _signal(shape, dtype, seed=0):
+    return np.random.RandomState(seed).normal(size=shape).astype(dtype)
+
+
+def _num_samples(seconds):
+    return int(seconds * SAMPLE_RATE)
+
+
+@register('stft', channels=[1, 8], dtype=['float64', 'float32'], seconds=[10])
+def _stft(channels, dtype, seconds):
+    from paderbox.transform.module_stft import STFT
+    stft = STFT(shift=160, size=512, window_length=400, dtype=dtype)
+    x = _signal((channels, _num_samples(seconds)), dtype)
+    return lambda: stft(x)
+
+
+@register('istft', channels=[1, 8], dtype=['float64', 'float32'], seconds=[10])
+def _istft(channels, dtype, seconds):
+    from paderbox.transform.module_stft import STFT
+    stft = STFT(shift=160, size=512, window_length=400, dtype=dtype)
+    num_samples = _num_samples(seconds)
+    X = stft(_signal((channels, num_samples), dtype))
+    return lambda: stft.inverse(X, num_samples=num_samples)
+
+
+@register('fbank', channels=[1, 8], dtype=['float64', 'float32'], seconds=[10])
+def _fbank(channels, dtype, seconds):
+    from paderbox.transform.module_fbank import fbank
+    x = _signal((channels, _num_samples(seconds)), dtype)
+    return lambda: fbank(x)
+
+
+@register('logfbank', channels=[1, 8], dtype=['float64', 'float32'],
+          seconds=[10])
+def _logfbank(channels, dtype, seconds):
+    from paderbox.transform.module_fbank import logfbank
+    x = _signal((channels, _num_samples(seconds)), dtype)
+    return lambda: logfbank(x)
+
+
+@register('mfcc', channels=[1, 8], dtype=['float64', 'float32'], seconds=[10])
+def _mfcc(channels, dtype, seconds):
+    from paderbox.transform.module_mfcc import mfcc
+    x = _signal((channels, _num_samples(seconds)), dtype)
+    return lambda: mfcc(x)
+
+
+@register('deltas', frames=[1000, 100000], features=[40],
+          engine=['delta', 'deltas'])
+def _deltas(frames, features, engine):
+    """First and second order deltas along the frame axis."""
+    from paderbox.transform.module_mfcc import delta, deltas
+    x = _signal((frames, features), np.float64)
+    if engine == 'delta':
+        return lambda: [delta(x, order=order, axis=0) for order in [1, 2]]
+    return lambda: deltas(x, orders=(1, 2), axis=0)
+
+
+@register('feature_pipeline', channels=[1, 8], seconds=[10],
+          fused=[True, False])
+def _feature_pipeline(channels, seconds, fused):
+    """Spectrogram, logfbank, mfcc and mfcc delta of the same signal, with
+    the FeaturePipeline (fused) or with the standalone functions."""
+    from paderbox.transform.module_feature_pipeline import FeaturePipeline
+    from paderbox.transform.module_fbank import logfbank
+    from paderbox.transform.module_filter import \
+        preemphasis_with_offset_compensation
+    from paderbox.transform.module_mfcc import mfcc, delta
+    from paderbox.transform.module_stft import spectrogram
+    x = _signal((channels, _num_samples(seconds)), np.float64)
+    if fused:
+        pipeline = FeaturePipeline(
+            outputs=['spectrogram', 'logfbank', 'mfcc', 'mfcc_delta'],
+            number_of_filters=26,
+        )
+        return lambda: pipeline(x)
+    else:
+        def standalone():
+            mfcc_signal = mfcc(x)
+            return {
+                'spectrogram': spectrogram(
+                    preemphasis_with_offset_compensation(x, 0.97),
+                    size=512, shift=160, window_length=400,
+                    window=scipy.signal.windows.hamming, fading=None,
+                ),
+                'logfbank': logfbank(x, number_of_filters=26),
+                'mfcc': mfcc_signal,
+                'mfcc_delta': delta(mfcc_signal),
+            }
+        return standalone
+
+
+@register('MelTransform', batch_size=[1, 16], dtype=['float64', 'float32'],
+          seconds=[10], log=[True, False], stft_size=[512, 4096],
+          banded=[None, False])
+def _mel_transform(batch_size, dtype, seconds, log, stft_size, banded):
+    from paderbox.transform.module_fbank import MelTransform
+    mel_transform = MelTransform(
+        SAMPLE_RATE, stft_size, 80, log=log, banded=banded)
+    frames = _num_samples(seconds) // 160
+    x = np.abs(_signal((batch_size, frames, stft_size // 2 + 1), dtype))
+    return lambda: mel_transform(x)
+
+
+@register('MelTransform_vtlp', batch_size=[16, 256], frames=[10, 100],
+          warping_resolution=[None, 0.02])
+def _mel_transform_vtlp(batch_size, frames, warping_resolution):
+    from paderbox.transform.module_fbank import MelTransform, HzWarping
+    from paderbox.utils.random_utils import Uniform
+    warping_fn = HzWarping(
+        warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+        boundary_frequency_ratio_sampling_fn=Uniform(low=.6, high=.7),
+        highest_frequency=SAMPLE_RATE / 2,
+        seed=0,
+    )
+    mel_transform = MelTransform(
+        SAMPLE_RATE, 512, 80, warping_fn=warping_fn,
+        warping_resolution=warping_resolution,
+    )
+    x = np.abs(_signal((batch_size, frames, 257), np.float64))
+    return lambda: mel_transform(x)
+
+
+@register('griffin_lim', channels=[1, 4], seconds=[2], iterations=[10])
+def _griffin_lim(channels, seconds, iterations):
+    from paderbox.transform.module_stft import STFT
+    from paderbox.transform.module_phase_reconstruction import griffin_lim
+    stft = STFT(shift=128, size=512, fading=False)
+    x = np.abs(stft(_signal((channels, _num_samples(seconds)), np.float64)))
+    return lambda: griffin_lim(x, stft, iterations=iterations)
+
+
+@register('GriffinLim', batch_size=[1, 16], dtype=['float64', 'float32'],
+          seconds=[2], iterations=[10], engine=['loop', 'batch'])
+def _griffin_lim_engine(batch_size, dtype, seconds, iterations, engine):
+    from paderbox.transform.module_stft import STFT
+    from paderbox.transform.module_phase_reconstruction import (
+        GriffinLim, fast_griffin_lim
+    )
+    stft = STFT(shift=128, size=512, fading=False)
+    x = np.abs(stft(_signal((batch_size, _num_samples(seconds)), np.float64)))
+    if engine == 'loop':
+        if dtype != 'float64':
+            raise SkipBenchmark('fast_griffin_lim calculates in float64')
+        return lambda: [
+            fast_griffin_lim(x_, stft, iterations=iterations) for x_ in x
+        ]
+    gla = GriffinLim(stft, iterations, alpha=0.99, dtype=dtype)
+    return lambda: gla(x)
+
+
+@register('phase_features', channels=[6], seconds=[600],
+          function=['transform_to_baseband', 'inplace', 'get_phase_features'])
+def _phase_features(channels, seconds, function):
+    """STFT with size 1024 and shift 256 in single precision (about 1 GB
+    for 10 minutes and 6 channels), layout (frames, channels, frequencies).
+    """
+    from paderbox.transform import module_phase_features
+    frames = max(_num_samples(seconds) // 256, 1)
+    shape = (frames, channels, 513)
+    X = _signal(shape, np.float32) + 1j * _signal(shape, np.float32)
+    if function == 'inplace':
+        return lambda: module_phase_features.transform_to_baseband(
+            X, 1024, 256, inplace=True)
+    function = getattr(module_phase_features, function)
+    return lambda: function(X, 1024, 256)
+
+
+@register('segment_axis', channels=[1, 8], dtype=['float64', 'float32'],
+          seconds=[10], end=['cut', 'pad'])
+def _segment_axis(channels, dtype, seconds, end):
+    from paderbox.array import segment_axis
+    x = _signal((channels, _num_samples(seconds)), dtype)
+    # The result is a view for end='cut', hence copy to measure the memory
+    # access.
+    return lambda: np.ascontiguousarray(
+        segment_axis(x, 400, 160, end=end))
+
+
+@register('resample_sox', channels=[1, 8], dtype=['float64', 'float32'],
+          seconds=[10], out_rate=[8000, 44100])
+def _resample_sox(channels, dtype, seconds, out_rate):
+    from paderbox.transform.module_resample import resample_sox
+    if shutil.which('sox') is None:
+        raise SkipBenchmark('sox is not installed')
+    x = _signal((channels, _num_samples(seconds)), dtype)
+    return lambda: resample_sox(x, in_rate=SAMPLE_RATE, out_rate=out_rate)
+
+
+@register('resample_polyphase', channels=[1, 8], dtype=['float64', 'float32'],
+          seconds=[10], out_rate=[8000, 44100])
+def _resample_polyphase(channels, dtype, seconds, out_rate):
+    from paderbox.transform.module_resample import PolyphaseResampler
+    x = _signal((channels, _num_samples(seconds)), dtype)
+    resampler = PolyphaseResampler(in_rate=SAMPLE_RATE, out_rate=out_rate)
+    return lambda: resampler(x)
+
+
+def _key(name, params):
+    return name + '[' + ','.join(f'{k}={v}' for k, v in params.items()) + ']'
+
+
+def _environment():
+    import scipy
+    try:
+        from importlib.metadata import version
+        paderbox_version = version('paderbox')
+    except Exception:
+        paderbox_version = None
+    return {
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'scipy': scipy.__version__,
+        'paderbox': paderbox_version,
+        'platform': platform.platform(),
+        'processor': platform.processor(),
+        'hostname': platform.node(),
+        'cpu_count': os.cpu_count(),
+        **{
+            k: os.environ[k]
+            for k in ['OMP_NUM_THREADS', 'MKL_NUM_THREADS']
+            if k in os.environ
+        },
+    }
+
+
+def run(
+        names: typing.Optional[typing.Iterable[str]] = None,
+        *,
+        repeat: int = 5,
+        number: typing.Optional[int] = None,
+        overrides: typing.Optional[dict] = None,
+        verbose: bool = False,
+):
+    """Runs the benchmarks and returns the results as JSON serializable dict.
+
+    Args:
+        names: Names of the benchmarks to run, default all. See `names()`.
+        repeat: Number of measurements. The statistics (best, median) are
+            calculated over the measurements.
+        number: Number of calls per measurement. Default is determined with
+            `timeit.Timer.autorange`, i.e. such that a measurement takes at
+            least 0.2 seconds.
+        overrides: Replace the values of a parameter of the grid, e.g.
+            `{'channels': [1]}`, for all benchmarks that have this parameter.
+        verbose: Print each result.
+
+    Returns:
+        {'environment': {...}, 'results': {key: {...}}, 'skipped': {key: reason}}
+        The times are in seconds per call.
+    """
+    if names is None:
+        names = list(_benchmarks.keys())
+    elif isinstance(names, str):
+        names = [names]
+    for name in names:
+        if name not in _benchmarks:
+            raise KeyError(
+                f'Unknown benchmark {name!r}. Available: {list(_benchmarks)}')
+
+    results = {}
+    skipped = {}
+    for name in names:
+        benchmark = _benchmarks[name]
+        for params in benchmark.configurations(overrides):
+            key = _key(name, params)
+            try:
+                fn = benchmark.setup(**params)
+            except SkipBenchmark as e:
+                skipped[key] = str(e)
+                if verbose:
+                    print(f'{key}: skipped ({e})')
+                continue
+            timer = timeit.Timer(fn)
+            number_ = number
+            if number_ is None:
+                number_, _ = timer.autorange()
+            times = [t / number_ for t in timer.repeat(repeat, number_)]
+            results[key] = {
+                'name': name,
+                'params': params,
+                'number': number_,
+                'times': times,
+                'best': min(times),
+                'median': float(np.median(times)),
+            }
+            if verbose:
+                print(f'{key}: {min(times) * 1000:.3f} ms')
+    return {
+        'environment': _environment(),
+        'results': results,
+        'skipped': skipped,
+    }
+
+
+def compare(baseline, current, tolerance=0.2, metric='best'):
+    """Returns the benchmarks, that are slower than the baseline.
+
+    Args:
+        baseline: Results of `run` or the path to a JSON file with results.
+        current: Results of `run` or the path to a JSON file with results.
+        tolerance: Relative tolerance, e.g. 0.2 means a benchmark is a
+            regression, when it is more than 20 % slower than the baseline.
+        metric: 'best' or 'median'. The minimum is more robust against other
+            processes on the machine.
+
+    Returns:
+        List of dicts with the key, both times and the ratio current/baseline
+        of each regression. Benchmarks, that are missing in one of the
+        results, are ignored.
+
+    >>> baseline = {'results': {'a': {'best': 1.}, 'b': {'best': 1.}}}
+    >>> current = {'results': {'a': {'best': 1.1}, 'b': {'best': 1.5}}}
+    >>> compare(baseline, current, tolerance=0.2)
+    [{'key': 'b', 'baseline': 1.0, 'current': 1.5, 'ratio': 1.5}]
+    """
+    from paderbox.io.json_module import load_json
+    if isinstance(baseline, (str, Path)):
+        baseline = load_json(baseline)
+    if isinstance(current, (str, Path)):
+        current = load_json(current)
+
+    regressions = []
+    for key, result in current['results'].items():
+        if key not in baseline['results']:
+            continue
+        reference = baseline['results'][key][metric]
+        ratio = result[metric] / reference
+        if ratio > 1 + tolerance:
+            regressions.append({
+                'key': key,
+                'baseline': reference,
+                'current': result[metric],
+                'ratio': ratio,
+            })
+    return regressions
+
+
+def cli_run(out, names=None, repeat=5, number=None, **overrides):
+    """Runs the benchmarks and writes the results to `out` (JSON).
+
+    Additional keyword arguments replace the values of the parameter grid,
+    e.g. `--channels=[1]`.
+    """
+    from paderbox.io.json_module import dump_json
+    overrides = {
+        k: v if isinstance(v, (list, tuple)) else [v]
+        for k, v in overrides.items()
+    }
+    results = run(
+        names, repeat=repeat, number=number, overrides=overrides, verbose=True)
+    dump_json(results, out)
+
+
+def cli_compare(baseline, current, tolerance=0.2, metric='best'):
+    """Compares two result files and exits with 1 when there are
+    regressions."""
+    regressions = compare(baseline, current, tolerance, metric)
+    for r in regressions:
+        print(
+            f'{r["key"]}: {r["baseline"] * 1000:.3f} ms -> '
+            f'{r["current"] * 1000:.3f} ms ({r["ratio"]:.2f}x)'
+        )
+    if regressions:
+        sys.exit(1)
+    print('No regressions.')
+
+
+if __name__ == '__main__':
+    import fire
+    fire.Fire({
+        'run': cli_run,
+        'compare': cli_compare,
+        'names': names,
+    })
@@ -4,21 +4,32 @@ This module deals with all sorts of acoustic features and transforms.
 from .module_stft import (
     stft,
     istft,
+    ragged_stft,
     STFT,
     spectrogram,
     stft_to_spectrogram,
     spectrogram_to_energy_per_frame,
     get_stft_center_frequencies,
 )
+from .module_fft import use_fft_backend
 
 from .module_filter import (
     preemphasis,
     inverse_preemphasis,
     offset_compensation,
     preemphasis_with_offset_compensation,
+    PreemphasisStream,
+    InversePreemphasisStream,
+    OffsetCompensationStream,
+    PreemphasisWithOffsetCompensationStream,
 )
 
 from .module_fbank import fbank, logfbank
-from .module_mfcc import mfcc, mfcc_velocity_acceleration
-from .module_normalize import normalize_mean_variance
-from .module_resample import resample_sox
+from .module_mfcc import mfcc, mfcc_velocity_acceleration, deltas
+from .module_feature_pipeline import FeaturePipeline
+from .module_normalize import (
+    normalize_mean_variance,
+    MeanVarianceStatistics,
+    GroupedMeanVarianceStatistics,
+)
+from .module_resample import resample_sox, resample_polyphase
@@ -2,6 +2,7 @@
 Provides fbank features and the fbank filterbank.
 """
 
+import functools
 from typing import Optional, Union, Callable
 
 from cached_property import cached_property
@@ -30,6 +31,9 @@ class MelTransform:
             *,
             warping_fn: Optional[Callable] = None,
             independent_axis: tuple = (0,),
+            banded: Optional[bool] = None,
+            warping_resolution: Optional[float] = None,
+            warping_cache_size: int = 128,
     ):
         """Transforms linear spectrogram to (log) mel spectrogram.
 
@@ -46,6 +50,23 @@ class MelTransform:
             warping_fn: function to (randomly) remap fbank center frequencies
             independent_axis: independent axis for which independently warped
                 filter banks are used.
+            banded: Whether to apply the filterbank as BandedFilterbank,
+                that skips most of the zeros in the filterbank matrix. None
+                selects the faster option depending on the input size, see
+                BandedFilterbank.is_faster. The banded product sums in a
+                different order, hence it matches the dense product only up
+                to floating point rounding (relative differences of about
+                1e-15 for float64). Use False for bit exact results with
+                the dense product. Has no effect with warping_fn.
+            warping_resolution: If not None, the sampled warp factors and
+                boundary frequency ratios of the warping_fn (HzWarping or
+                MelWarping) are rounded to multiples of this value. The
+                normalized filterbanks of the quantized parameters are cached
+                and examples with the same parameters share one matmul.
+                None keeps the continuous parameters and calculates new
+                filterbanks for each call.
+            warping_cache_size: Maximum number of cached filterbanks for the
+                quantized warping (least recently used are dropped).
 
         >>> sample_rate = 16000
         >>> highest_frequency = sample_rate/2
@@ -69,6 +90,13 @@ class MelTransform:
         >>> mel_transform = MelTransform(16000, 512, 40, warping_fn=warping_fn, independent_axis=(0,1,2))
         >>> mel_transform(spec).shape
         (3, 1, 100, 40)
+
+        Quantized warp factors with cached filterbanks:
+        >>> mel_transform = MelTransform(16000, 512, 40, warping_fn=warping_fn, warping_resolution=0.01)
+        >>> mel_transform(spec).shape
+        (3, 1, 100, 40)
+        >>> mel_transform.warping_cache_info().currsize <= 3
+        True
         """
         self.sample_rate = sample_rate
         self.stft_size = stft_size
@@ -83,29 +111,131 @@ class MelTransform:
             [independent_axis] if np.isscalar(independent_axis)
             else independent_axis
         )
+        self.banded = banded
+        self.warping_resolution = warping_resolution
+        if warping_resolution is not None:
+            assert isinstance(warping_fn, HzWarping), (
+                'warping_resolution requires a HzWarping or MelWarping '
+                'warping_fn', warping_fn)
+            assert warping_resolution > 0, warping_resolution
+        self.warping_cache_size = warping_cache_size
+        # Created lazily by `_get_warped_fbanks_cache`, see `__getstate__`.
+        self._warped_fbanks_cache = None
 
     @cached_property
     def fbanks(self):
-        """Create filterbank matrix according to member variables."""
-        fbanks = get_fbanks(
-            sample_rate=self.sample_rate,
-            stft_size=self.stft_size,
-            number_of_filters=self.number_of_filters,
-            lowest_frequency=self.lowest_frequency,
-            highest_frequency=self.highest_frequency,
-            htk_mel=self.htk_mel,
+        """Create filterbank matrix according to member variables.
+
+        The read-only matrix is cached and shared between all MelTransforms
+        with the same configuration.
+        """
+        return _get_fbanks_cached(*self._fbanks_config)[0]
+
+    @cached_property
+    def banded_fbanks(self):
+        """Block banded representation of the filterbank matrix."""
+        return _get_fbanks_cached(*self._fbanks_config)[1]
+
+    @property
+    def _fbanks_config(self):
+        return (
+            self.sample_rate, self.stft_size, self.number_of_filters,
+            self.lowest_frequency, self.highest_frequency, self.htk_mel,
+            self.eps,
         )
-        fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + self.eps)
-        return fbanks.T
 
     @cached_property
     def ifbanks(self):
         """Create (pseudo)-inverse of filterbank matrix."""
         return np.linalg.pinv(self.fbanks.T).T
 
+    def _get_warped_fbanks_cache(self):
+        """The lru_cache of `_warped_fbanks` with the configuration of this
+        instance, i.e. `f(warp_factor, boundary_frequency_ratio)` returns
+        the normalized filterbank matrix."""
+        if self._warped_fbanks_cache is None:
+            # The cache wraps a module level function and not a bound method,
+            # hence it does not reference the instance.
+            self._warped_fbanks_cache = functools.lru_cache(
+                maxsize=self.warping_cache_size
+            )(functools.partial(
+                _warped_fbanks,
+                sample_rate=self.sample_rate,
+                stft_size=self.stft_size,
+                number_of_filters=self.number_of_filters,
+                lowest_frequency=self.lowest_frequency,
+                highest_frequency=self.highest_frequency,
+                htk_mel=self.htk_mel,
+                eps=self.eps,
+                warping_fn=self.warping_fn,
+            ))
+        return self._warped_fbanks_cache
+
+    def warping_cache_info(self):
+        """Statistics of the filterbank cache for the quantized warping."""
+        return self._get_warped_fbanks_cache().cache_info()
+
+    def __getstate__(self):
+        # The lru_cache cannot be pickled. Drop it, it is rebuilt on demand.
+        state = self.__dict__.copy()
+        state['_warped_fbanks_cache'] = None
+        return state
+
+    def __setstate__(self, state):
+        # Instances that were pickled with an older version of this class
+        # do not have the newer attributes.
+        self.__dict__.update({
+            'banded': None,
+            'warping_resolution': None,
+            'warping_cache_size': 128,
+            '_warped_fbanks_cache': None,
+            **state,
+        })
+
+    def _quantized_warping(self, x, size):
+        """Applies the cached filterbanks of the quantized warping
+        parameters. Examples with the same parameters are transformed with
+        a single matmul."""
+        resolution = self.warping_resolution
+        parameters = np.stack(np.broadcast_arrays(
+            *self.warping_fn.sample(tuple(size))), axis=-1)
+        parameters = np.round(parameters / resolution).astype(np.int64)
+        unique, index = np.unique(
+            parameters.reshape(-1, 2), axis=0, return_inverse=True)
+        fbanks = [
+            self._get_warped_fbanks_cache()(
+                float(warp_factor * resolution),
+                float(boundary_frequency_ratio * resolution),
+            )
+            for warp_factor, boundary_frequency_ratio in unique
+        ]
+        if len(fbanks) == 1:
+            return x @ fbanks[0]
+
+        index = np.broadcast_to(
+            np.reshape(index, size), x.shape[:-1]).reshape(-1)
+        x_flat = x.reshape(-1, x.shape[-1])
+        out = np.empty(
+            (x_flat.shape[0], self.number_of_filters),
+            dtype=np.result_type(x.dtype, np.float32),
+        )
+        order = np.argsort(index, kind='stable')
+        bounds = np.searchsorted(index[order], np.arange(len(fbanks) + 1))
+        for i, fbank_ in enumerate(fbanks):
+            rows = order[bounds[i]:bounds[i + 1]]
+            out[rows] = x_flat[rows] @ fbank_
+        return out.reshape(*x.shape[:-1], self.number_of_filters)
+
     def __call__(self, x: np.ndarray):
         if self.warping_fn is None:
-            x = x @ self.fbanks
+            if self.banded or (
+                    self.banded is None
+                    and isinstance(x, np.ndarray)
+                    and self.banded_fbanks.is_faster(x)
+            ):
+                x = self.banded_fbanks(x)
+            else:
+                x = x @ self.fbanks
         else:
             independent_axis = [ax if ax >= 0 else x.ndim+ax for ax in self.independent_axis]
             assert all([0 <= ax < x.ndim-1 for ax in independent_axis]), self.independent_axis
@@ -113,27 +243,35 @@ class MelTransform:
                 x.shape[i] if i in independent_axis else 1
                 for i in range(x.ndim-1)
             ]
-            fbanks = get_fbanks(
-                sample_rate=self.sample_rate,
-                stft_size=self.stft_size,
-                number_of_filters=self.number_of_filters,
-                lowest_frequency=self.lowest_frequency,
-                highest_frequency=self.highest_frequency,
-                htk_mel=self.htk_mel,
-                warping_fn=self.warping_fn,
-                size=tuple(size),
-            ).astype(np.float32)
-            fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + self.eps)
-            fbanks = fbanks.swapaxes(-2, -1)
-            # The following is the same as `np.einsum('...F,...FN->...N', x, fbanks)`, but much faster (see https://github.com/fgnt/paderbox/pull/35).
-            if fbanks.shape[-3] == 1:
-                x = x @ fbanks.squeeze(-3)
+            if self.warping_resolution is not None:
+                x = self._quantized_warping(x, size)
             else:
-                x = (x[..., None, :] @ fbanks).squeeze(-2)
+                x = self._warped(x, size)
         if self.log:
             x = np.log(x + self.eps)
         return x
 
+    def _warped(self, x, size):
+        """Applies independently warped filterbanks, that are calculated for
+        each call."""
+        fbanks = get_fbanks(
+            sample_rate=self.sample_rate,
+            stft_size=self.stft_size,
+            number_of_filters=self.number_of_filters,
+            lowest_frequency=self.lowest_frequency,
+            highest_frequency=self.highest_frequency,
+            htk_mel=self.htk_mel,
+            warping_fn=self.warping_fn,
+            size=tuple(size),
+        ).astype(np.float32)
+        fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + self.eps)
+        fbanks = fbanks.swapaxes(-2, -1)
+        # The following is the same as `np.einsum('...F,...FN->...N', x, fbanks)`, but much faster (see https://github.com/fgnt/paderbox/pull/35).
+        if fbanks.shape[-3] == 1:
+            return x @ fbanks.squeeze(-3)
+        else:
+            return (x[..., None, :] @ fbanks).squeeze(-2)
+
     def inverse(self, x: np.ndarray):
         """Invert the mel-filterbank transform."""
         if self.log:
@@ -141,6 +279,136 @@ class MelTransform:
         return np.maximum(np.dot(x, self.ifbanks), 0.)
 
 
+class BandedFilterbank:
+    """Block banded representation of a filterbank matrix for `x @ fbanks`.
+
+    Each triangular mel filter covers only a few frequency bins, so most
+    entries of the (frequency_bins, number_of_filters) matrix are zero. The
+    filters are grouped into blocks of `block_size` neighbouring filters and
+    each block is applied with a dense matmul to the frequency bins that are
+    covered by the block. Hence, the cost is proportional to the number of
+    covered bins and not to the size of the matrix.
+
+    For small inputs (e.g. single frames), the overhead of one matmul per
+    block is larger than the saving. Hence, `is_faster` selects the dense
+    product for small inputs and for matrices with many nonzeros.
+
+    >>> fbanks = MelTransform(16000, 4096, 80, log=False).fbanks
+    >>> fbanks.shape
+    (2049, 80)
+    >>> banded = BandedFilterbank(fbanks)
+    >>> len(banded.blocks), round(banded.coverage, 3)
+    (10, 0.11)
+    >>> x = np.random.uniform(size=(2, 100, 2049))
+    >>> np.allclose(banded(x), x @ fbanks)
+    True
+    >>> banded.is_faster(x), banded.is_faster(x[0, :1])
+    (True, False)
+    """
+    # Empirically determined crossover: Below this number of input elements,
+    # the dense matmul is faster.
+    min_size = 2 ** 14
+    # The banded product only pays off, when the blocks cover at most this
+    # fraction of the matrix.
+    max_coverage = 0.5
+
+    def __init__(self, fbanks: np.ndarray, block_size: int = 8):
+        """
+        Args:
+            fbanks: Filterbank matrix with shape
+                (frequency_bins, number_of_filters).
+            block_size: Number of neighbouring filters, that are applied with
+                one matmul.
+        """
+        assert fbanks.ndim == 2, fbanks.shape
+        self.shape = fbanks.shape
+        self.dtype = fbanks.dtype
+        frequency_bins, number_of_filters = fbanks.shape
+
+        nonzero = fbanks != 0
+        # Filters without nonzero entries get an empty band.
+        start = np.where(nonzero.any(axis=0), nonzero.argmax(axis=0), 0)
+        stop = np.where(
+            nonzero.any(axis=0), frequency_bins - nonzero[::-1].argmax(axis=0),
+            0,
+        )
+
+        self.blocks = []
+        covered = 0
+        for first in range(0, number_of_filters, block_size):
+            last = min(first + block_size, number_of_filters)
+            block_start = np.min(start[first:last])
+            block_stop = max(np.max(stop[first:last]), block_start)
+            self.blocks.append((
+                first, last, block_start, block_stop,
+                np.ascontiguousarray(fbanks[block_start:block_stop, first:last]),
+            ))
+            covered += (block_stop - block_start) * (last - first)
+        self.coverage = float(covered / max(fbanks.size, 1))
+
+    def is_faster(self, x):
+        """Whether the banded product is expected to be faster than the dense
+        product for x."""
+        return x.size >= self.min_size and self.coverage <= self.max_coverage
+
+    def __call__(self, x: np.ndarray):
+        """Returns `x @ fbanks` for x with shape (..., frequency_bins)."""
+        assert x.shape[-1] == self.shape[0], (x.shape, self.shape)
+        out = np.zeros(
+            (*x.shape[:-1], self.shape[1]),
+            dtype=np.result_type(x.dtype, self.dtype),
+        )
+        for first, last, start, stop, weights in self.blocks:
+            if stop > start:
+                np.matmul(x[..., start:stop], weights, out=out[..., first:last])
+        return out
+
+
+def _warped_fbanks(
+        warp_factor, boundary_frequency_ratio, *, sample_rate, stft_size,
+        number_of_filters, lowest_frequency, highest_frequency, htk_mel, eps,
+        warping_fn,
+):
+    """Normalized filterbank matrix of MelTransform for fixed warping
+    parameters."""
+    fbanks = get_fbanks(
+        sample_rate=sample_rate,
+        stft_size=stft_size,
+        number_of_filters=number_of_filters,
+        lowest_frequency=lowest_frequency,
+        highest_frequency=highest_frequency,
+        htk_mel=htk_mel,
+        warping_fn=lambda f, size: warping_fn.warp(
+            f, warp_factor, boundary_frequency_ratio),
+    ).astype(np.float32)
+    fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + eps)
+    fbanks = np.ascontiguousarray(fbanks.T)
+    fbanks.flags.writeable = False
+    return fbanks
+
+
+@functools.lru_cache(maxsize=32)
+def _get_fbanks_cached(
+        sample_rate, stft_size, number_of_filters, lowest_frequency,
+        highest_frequency, htk_mel, eps,
+):
+    """Normalized filterbank matrix of MelTransform and its banded
+    representation, so that they are calculated only once per
+    configuration. The matrix is read-only, because it is shared."""
+    fbanks = get_fbanks(
+        sample_rate=sample_rate,
+        stft_size=stft_size,
+        number_of_filters=number_of_filters,
+        lowest_frequency=lowest_frequency,
+        highest_frequency=highest_frequency,
+        htk_mel=htk_mel,
+    )
+    fbanks = fbanks / (fbanks.sum(axis=-1, keepdims=True) + eps)
+    fbanks = fbanks.T
+    fbanks.flags.writeable = False
+    return fbanks, BandedFilterbank(fbanks)
+
+
 def get_fbanks(
         sample_rate: int, stft_size: int, number_of_filters: int,
         lowest_frequency: float = 0.,
@@ -509,26 +777,89 @@ class HzWarping:
     array([       nan, 0.9834044 , 0.9834044 , 0.9834044 , 0.9834044 ,
            0.9834044 , 0.9834044 , 0.9834044 , 0.9834044 , 0.9834044 ,
            0.99025952, 1.        ])
+
+    With a seed, the sampling functions draw from an own random state,
+    i.e. the warping is reproducible and independent of the global numpy
+    random state. The samples are the same as after `np.random.seed(seed)`:
+    >>> warping_fn = HzWarping(\
+            warp_factor_sampling_fn=Uniform(low=.9, high=1.1),\
+            boundary_frequency_ratio_sampling_fn=Uniform(low=.6,high=.7),\
+            highest_frequency=highest_frequency,\
+            seed=0,\
+        )
+    >>> warping_fn(f)/f
+    array([      nan, 1.0097627, 1.0097627, 1.0097627, 1.0097627, 1.0097627,
+           1.0097627, 1.0097627, 1.0097627, 1.0097627, 1.0055517, 1.       ])
+    >>> warping_fn.sample(size=(2,))
+    (array([1.02055268, 1.00897664]), array([0.64236548, 0.66458941]))
     """
     warp_factor_sampling_fn: Callable
     boundary_frequency_ratio_sampling_fn: Callable
     highest_frequency: float
+    seed: Optional[int] = None
+    _random_state: Optional[tuple] = dataclasses.field(
+        default=None, init=False, repr=False, compare=False)
 
-    def __call__(self, frequency: Union[float, np.ndarray], size: tuple = ()):
+    def sample(self, size: tuple = ()):
+        """Samples the warp factors and boundary frequency ratios.
+
+        Args:
+            size: shape of the samples
+
+        Returns:
+            warp_factor, boundary_frequency_ratio
+        """
+        if self.seed is None:
+            return (
+                self.warp_factor_sampling_fn(size),
+                self.boundary_frequency_ratio_sampling_fn(size),
+            )
+
+        # The sampling functions (e.g. paderbox.utils.random_utils.Uniform)
+        # use the global numpy random state. Swap in the own state for the
+        # sampling and restore the global state afterwards.
+        if self._random_state is None:
+            self._random_state = np.random.RandomState(self.seed).get_state()
+        global_state = np.random.get_state()
+        np.random.set_state(self._random_state)
+        try:
+            return (
+                self.warp_factor_sampling_fn(size),
+                self.boundary_frequency_ratio_sampling_fn(size),
+            )
+        finally:
+            self._random_state = np.random.get_state()
+            np.random.set_state(global_state)
+
+    def warp(
+            self,
+            frequency: Union[float, np.ndarray],
+            warp_factor: Union[float, np.ndarray],
+            boundary_frequency_ratio: Union[float, np.ndarray],
+    ):
+        """Warps frequency with the given (not sampled) parameters."""
         return hz_warping(
             frequency,
-            warp_factor=self.warp_factor_sampling_fn(size),
-            boundary_frequency_ratio=self.boundary_frequency_ratio_sampling_fn(size),
+            warp_factor=warp_factor,
+            boundary_frequency_ratio=boundary_frequency_ratio,
             highest_frequency=self.highest_frequency,
         )
 
+    def __call__(self, frequency: Union[float, np.ndarray], size: tuple = ()):
+        return self.warp(frequency, *self.sample(size))
+
 
 class MelWarping(HzWarping):
-    def __call__(self, frequency: Union[float, np.ndarray], size: tuple = ()):
+    def warp(
+            self,
+            frequency: Union[float, np.ndarray],
+            warp_factor: Union[float, np.ndarray],
+            boundary_frequency_ratio: Union[float, np.ndarray],
+    ):
         return mel_warping(
             frequency,
-            warp_factor=self.warp_factor_sampling_fn(size),
-            boundary_frequency_ratio=self.boundary_frequency_ratio_sampling_fn(size),
+            warp_factor=warp_factor,
+            boundary_frequency_ratio=boundary_frequency_ratio,
             highest_frequency=self.highest_frequency,
         )
 
@@ -589,15 +920,14 @@ def fbank(
 
     spectrogram = stft_to_spectrogram(stft_signal) / stft_size
 
-    mel_transform = MelTransform(
+    feature = MelTransform(
         sample_rate=sample_rate,
         stft_size=stft_size,
         number_of_filters=number_of_filters,
         lowest_frequency=lowest_frequency,
         highest_frequency=highest_frequency,
         log=False
-    )
-    feature = mel_transform(spectrogram)
+    )(spectrogram)
 
     if denoise:
         feature -= np.min(feature, axis=0)
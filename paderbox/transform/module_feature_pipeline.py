@@ -0,0 +1,148 @@
+"""
+Computes several features of the same signal with shared intermediates.
+
+`fbank`, `logfbank`, `mfcc` and `mfcc_velocity_acceleration` each calculate
+the preemphasis, the stft and the power spectrum. When several of these
+features are needed for the same signal, the `FeaturePipeline` calculates the
+intermediates only once and derives all requested outputs from them.
+"""
+import dataclasses
+from typing import Callable, Optional, Sequence
+
+import numpy as np
+import scipy.signal
+from scipy.fftpack import dct
+
+from paderbox.transform.module_fbank import MelTransform
+from paderbox.transform.module_filter import preemphasis_with_offset_compensation
+from paderbox.transform.module_mfcc import _lifter, deltas
+from paderbox.transform.module_stft import stft, stft_to_spectrogram
+
+__all__ = [
+    'FeaturePipeline',
+]
+
+
+@dataclasses.dataclass
+class FeaturePipeline:
+    """
+    Calculates the requested features of a time signal and shares the
+    preemphasis, stft and power spectrum between them.
+
+    Each output is identical to the standalone function with the same
+    parameters:
+     - 'stft': `stft(preemphasis_with_offset_compensation(x, p), ...,
+       fading=None)`, i.e. the stft that is used inside of fbank.
+     - 'spectrogram': `stft_to_spectrogram` of 'stft' (power spectrum).
+     - 'fbank': `fbank(x, ...)`
+     - 'logfbank': `logfbank(x, ...)`
+     - 'mfcc': `mfcc(x, ...)`
+     - 'mfcc_delta', 'mfcc_delta_delta': `deltas(mfcc(x, ...), orders=(1, 2))`,
+       i.e. the parts of `mfcc_velocity_acceleration`.
+
+    Note: fbank and mfcc have different defaults for number_of_filters (23
+    and 26). The pipeline uses a single value for all outputs.
+
+    >>> from paderbox.transform import logfbank, mfcc
+    >>> pipeline = FeaturePipeline(
+    ...     outputs=['spectrogram', 'logfbank', 'mfcc', 'mfcc_delta'],
+    ...     number_of_filters=26,
+    ... )
+    >>> x = np.random.normal(size=16000)
+    >>> features = pipeline(x)
+    >>> {k: v.shape for k, v in features.items()}
+    {'spectrogram': (99, 257), 'logfbank': (99, 26), 'mfcc': (99, 13), 'mfcc_delta': (99, 13)}
+    >>> np.array_equal(features['logfbank'], logfbank(x, number_of_filters=26))
+    True
+    >>> np.array_equal(features['mfcc'], mfcc(x))
+    True
+    """
+    outputs: Sequence[str] = ('logfbank',)
+    sample_rate: int = 16000
+    window_length: int = 400
+    stft_shift: int = 160
+    stft_size: int = 512
+    number_of_filters: int = 23
+    lowest_frequency: float = 0.
+    highest_frequency: Optional[float] = None
+    preemphasis_factor: float = 0.97
+    window: Callable = scipy.signal.windows.hamming
+    eps: float = 1e-18
+    numcep: int = 13
+    ceplifter: int = 22
+    delta_width: int = 9
+
+    _features = (
+        'stft', 'spectrogram', 'fbank', 'logfbank', 'mfcc',
+        'mfcc_delta', 'mfcc_delta_delta',
+    )
+
+    def __post_init__(self):
+        if isinstance(self.outputs, str):
+            self.outputs = [self.outputs]
+        self.outputs = tuple(self.outputs)
+        for output in self.outputs:
+            if output not in self._features:
+                raise ValueError(
+                    f'Unknown output {output!r}. '
+                    f'Available outputs: {self._features}'
+                )
+
+        # The filterbank is calculated once and reused for every signal.
+        self._mel_transform = MelTransform(
+            sample_rate=self.sample_rate,
+            stft_size=self.stft_size,
+            number_of_filters=self.number_of_filters,
+            lowest_frequency=self.lowest_frequency,
+            highest_frequency=self.highest_frequency or self.sample_rate / 2,
+            log=False,
+        )
+
+    def __call__(self, time_signal):
+        """
+        Args:
+            time_signal: Time signal with shape (..., samples).
+
+        Returns:
+            dict with the requested outputs, in the order of `outputs`.
+        """
+        cache = {}
+
+        def get(name):
+            if name not in cache:
+                cache[name] = getattr(self, f'_{name}')(time_signal, get)
+            return cache[name]
+
+        return {output: get(output) for output in self.outputs}
+
+    def _stft(self, time_signal, get):
+        time_signal = preemphasis_with_offset_compensation(
+            time_signal, self.preemphasis_factor)
+        return stft(
+            time_signal,
+            size=self.stft_size, shift=self.stft_shift,
+            window=self.window, window_length=self.window_length,
+            fading=None,
+        )
+
+    def _spectrogram(self, time_signal, get):
+        return stft_to_spectrogram(get('stft'))
+
+    def _fbank(self, time_signal, get):
+        return self._mel_transform(get('spectrogram') / self.stft_size)
+
+    def _logfbank(self, time_signal, get):
+        return np.log(get('fbank') + self.eps)
+
+    def _mfcc(self, time_signal, get):
+        feature = dct(get('logfbank'), type=2, axis=-1, norm='ortho')
+        return _lifter(feature[..., :self.numcep], self.ceplifter)
+
+    def _mfcc_deltas(self, time_signal, get):
+        return deltas(get('mfcc'), width=self.delta_width, orders=(1, 2))
+
+    def _mfcc_delta(self, time_signal, get):
+        return get('mfcc_deltas')[0]
+
+    def _mfcc_delta_delta(self, time_signal, get):
+        return get('mfcc_deltas')[1]
@@ -0,0 +1,193 @@
+"""
+Pluggable FFT backends for the stft and istft.
+
+The backend can be selected per call (`stft(..., fft_backend=...)`), per
+`STFT` instance (`STFT(..., fft_backend=...)`) or for a block of code with
+the `use_fft_backend` context manager:
+
+>>> from paderbox.transform.module_stft import stft
+>>> x = np.random.normal(size=(4, 1000))
+>>> X = stft(x, 64, 16, fft_backend=ScipyFFT(workers=2))
+>>> with use_fft_backend('scipy'):
+...     np.allclose(X, stft(x, 64, 16))
+True
+
+Available backends:
+ - 'numpy': numpy.fft, single threaded. Always calculates in double
+   precision on numpy < 2.
+ - 'scipy': scipy.fft, multithreaded over the independent transforms with
+   `workers`. Supports single precision.
+ - 'pyfftw': pyFFTW with cached plans, multithreaded with `threads`.
+   Requires `pip install pyfftw`.
+"""
+import contextlib
+import contextvars
+import dataclasses
+import typing
+
+import numpy as np
+
+from paderbox.utils.mapping import Dispatcher
+
+__all__ = [
+    'FFTBackend',
+    'NumpyFFT',
+    'ScipyFFT',
+    'PyFFTW',
+    'get_fft_backend',
+    'use_fft_backend',
+]
+
+
+class FFTBackend:
+    """Interface of an FFT backend for real valued signals."""
+    def rfft(self, x, n, axis=-1):
+        raise NotImplementedError(type(self))
+
+    def irfft(self, x, n, axis=-1):
+        raise NotImplementedError(type(self))
+
+
+@dataclasses.dataclass(frozen=True)
+class NumpyFFT(FFTBackend):
+    """numpy.fft, the reference implementation.
+
+    >>> NumpyFFT().rfft(np.ones(4), n=4)
+    array([4.+0.j, 0.+0.j, 0.+0.j])
+    """
+    def rfft(self, x, n, axis=-1):
+        return np.fft.rfft(x, n=n, axis=axis)
+
+    def irfft(self, x, n, axis=-1):
+        return np.fft.irfft(x, n=n, axis=axis)
+
+
+@dataclasses.dataclass(frozen=True)
+class ScipyFFT(FFTBackend):
+    """scipy.fft, keeps single precision inputs in single precision.
+
+    Args:
+        workers: Maximum number of threads to use for the independent
+            transforms, e.g. channels and frames. Negative values wrap around
+            os.cpu_count(), i.e. -1 uses all cores. None means one thread.
+
+    >>> ScipyFFT(workers=-1).rfft(np.ones(4, dtype=np.float32), n=4)
+    array([4.+0.j, 0.+0.j, 0.+0.j], dtype=complex64)
+    """
+    workers: typing.Optional[int] = None
+
+    def rfft(self, x, n, axis=-1):
+        import scipy.fft
+        return scipy.fft.rfft(x, n=n, axis=axis, workers=self.workers)
+
+    def irfft(self, x, n, axis=-1):
+        import scipy.fft
+        return scipy.fft.irfft(x, n=n, axis=axis, workers=self.workers)
+
+
+@dataclasses.dataclass(frozen=True)
+class PyFFTW(FFTBackend):
+    """pyFFTW with a cache for the FFTW plans.
+
+    The plans depend on the shape, dtype and alignment of the input. Hence,
+    the first call for a new shape is slow and the following calls are
+    fast.
+
+    Args:
+        threads: Number of threads for FFTW.
+        planner_effort: See pyfftw, e.g. 'FFTW_ESTIMATE' or 'FFTW_MEASURE'.
+        cache_keepalive_time: Seconds to keep unused plans in the cache.
+    """
+    threads: int = 1
+    planner_effort: str = 'FFTW_ESTIMATE'
+    cache_keepalive_time: float = 60.
+
+    def _interface(self):
+        try:
+            import pyfftw
+            import pyfftw.interfaces.numpy_fft
+        except ImportError as e:
+            raise ImportError(
+                'The pyfftw FFT backend requires pyfftw: pip install pyfftw'
+            ) from e
+        if not pyfftw.interfaces.cache.is_enabled():
+            pyfftw.interfaces.cache.enable()
+        pyfftw.interfaces.cache.set_keepalive_time(self.cache_keepalive_time)
+        return pyfftw.interfaces.numpy_fft
+
+    def rfft(self, x, n, axis=-1):
+        return self._interface().rfft(
+            x, n=n, axis=axis,
+            threads=self.threads, planner_effort=self.planner_effort,
+        )
+
+    def irfft(self, x, n, axis=-1):
+        return self._interface().irfft(
+            x, n=n, axis=axis,
+            threads=self.threads, planner_effort=self.planner_effort,
+        )
+
+
+_fft_backend_dispatcher = Dispatcher({
+    'numpy': NumpyFFT,
+    'scipy': ScipyFFT,
+    'pyfftw': PyFFTW,
+})
+
+_default_fft_backend = contextvars.ContextVar(
+    'paderbox_fft_backend', default=None)
+
+
+def get_fft_backend(fft_backend=None, dtype=None) -> FFTBackend:
+    """Resolves the FFT backend.
+
+    Args:
+        fft_backend: None, a name ('numpy', 'scipy', 'pyfftw') or an
+            FFTBackend instance. None uses the backend of `use_fft_backend`,
+            when active, or the default.
+        dtype: The dtype argument of the stft. The default backend is numpy
+            for double precision (dtype None) and scipy otherwise, because
+            numpy < 2 does not support single precision.
+
+    >>> get_fft_backend()
+    NumpyFFT()
+    >>> get_fft_backend(dtype=np.float32)
+    ScipyFFT(workers=None)
+    >>> get_fft_backend('scipy')
+    ScipyFFT(workers=None)
+    >>> with use_fft_backend(ScipyFFT(workers=4)):
+    ...     get_fft_backend()
+    ScipyFFT(workers=4)
+    """
+    if fft_backend is None:
+        fft_backend = _default_fft_backend.get()
+    if fft_backend is None:
+        if dtype is None:
+            fft_backend = NumpyFFT()
+        else:
+            fft_backend = ScipyFFT()
+    elif isinstance(fft_backend, str):
+        fft_backend = _fft_backend_dispatcher[fft_backend]()
+
+    if not isinstance(fft_backend, FFTBackend):
+        raise TypeError(type(fft_backend), fft_backend)
+    return fft_backend
+
+
+@contextlib.contextmanager
+def use_fft_backend(fft_backend):
+    """Context manager to select the FFT backend of stft and istft calls,
+    that do not specify a backend. The selection is local to the current
+    thread (or asyncio task).
+
+    >>> with use_fft_backend('scipy'):
+    ...     get_fft_backend()
+    ScipyFFT(workers=None)
+    >>> get_fft_backend()
+    NumpyFFT()
+    """
+    token = _default_fft_backend.set(get_fft_backend(fft_backend))
+    try:
+        yield
+    finally:
+        _default_fft_backend.reset(token)
@@ -1,9 +1,29 @@
 """
 Provides general filters, for example preemphasis filter.
+
+The filters are also available as stateful objects (e.g. `PreemphasisStream`)
+for block-wise (online) processing.
 """
+import numpy as np
 from scipy.signal import lfilter, medfilt
 
 
+def _preemphasis_coefficients(p):
+    return [1., -p], [1]
+
+
+def _inverse_preemphasis_coefficients(p):
+    return [1], [1., -p]
+
+
+def _offset_compensation_coefficients():
+    return [1., -1], [1., -0.999]
+
+
+def _preemphasis_with_offset_compensation_coefficients(p):
+    return [1, -(1+p), p], [1, -0.999]
+
+
 def preemphasis(time_signal, p=0.95):
     """Default Pre-emphasis filter.
 
@@ -15,7 +35,7 @@ def preemphasis(time_signal, p=0.95):
     :param p: preemphasis coefficient
     :return: The filtered input signal
     """
-    return lfilter([1., -p], [1], time_signal)
+    return lfilter(*_preemphasis_coefficients(p), time_signal)
 
 
 def inverse_preemphasis(time_signal, p=0.95):
@@ -27,13 +47,13 @@ def inverse_preemphasis(time_signal, p=0.95):
     :param p: preemphasis coefficient
     :return: The filtered input signal
     """
-    return lfilter([1], [1., -p], time_signal)
+    return lfilter(*_inverse_preemphasis_coefficients(p), time_signal)
 
 
 def offset_compensation(time_signal):
     """ Offset compensation filter.
     """
-    return lfilter([1., -1], [1., -0.999], time_signal)
+    return lfilter(*_offset_compensation_coefficients(), time_signal)
 
 
 def preemphasis_with_offset_compensation(time_signal, p=0.95):
@@ -45,7 +65,127 @@ def preemphasis_with_offset_compensation(time_signal, p=0.95):
     :param p: preemphasis coefficient
     :return: The filtered input signal
     """
-    return lfilter([1, -(1+p), p], [1, -0.999], time_signal)
+    return lfilter(
+        *_preemphasis_with_offset_compensation_coefficients(p), time_signal)
+
+
+class LFilterStream:
+    """
+    Stateful `scipy.signal.lfilter` along the last axis for block-wise
+    (online) processing.
+
+    The filter state is carried from one chunk to the next, hence
+    concatenating the filtered chunks yields exactly the result of the
+    filter applied to the whole signal.
+
+    >>> x = np.random.normal(size=(2, 1000))
+    >>> stream = LFilterStream([1], [1, -0.95])
+    >>> y = np.concatenate(
+    ...     [stream(c) for c in np.split(x, [100, 101, 500], axis=-1)],
+    ...     axis=-1,
+    ... )
+    >>> np.array_equal(y, lfilter([1], [1, -0.95], x))
+    True
+
+    With `out` the result is written block-wise into a caller provided
+    buffer, which may also be the chunk itself. Hence, only a block of
+    `block_size` samples is allocated, independent of the chunk length:
+    >>> stream.reset()
+    >>> chunk = x[:, :100].copy()
+    >>> _ = stream(chunk, out=chunk)
+    >>> np.array_equal(chunk, y[:, :100])
+    True
+    """
+    # Number of samples, that are filtered at once, when `out` is given.
+    block_size = 4096
+
+    def __init__(self, b, a):
+        self.b = np.asarray(b, dtype=np.float64)
+        self.a = np.asarray(a, dtype=np.float64)
+        self.reset()
+
+    def reset(self):
+        """Drops the filter state to start with a new signal."""
+        self._zi = None
+
+    def __call__(self, chunk, out=None):
+        """
+        Args:
+            chunk: Signal with shape (..., samples).
+            out: Optional array with the shape of chunk to write the
+                result into. May be chunk itself. The chunk is filtered in
+                blocks of `block_size` samples, so that the result is not
+                allocated a second time.
+
+        Returns:
+            The filtered chunk (`out`, if it is given).
+        """
+        chunk = np.asarray(chunk)
+        if self._zi is None:
+            order = max(len(self.a), len(self.b)) - 1
+            self._zi = np.zeros(
+                (*chunk.shape[:-1], order),
+                dtype=np.result_type(chunk, self.b, self.a),
+            )
+        if out is None:
+            if chunk.shape[-1] == 0:
+                # lfilter returns an invalid state for empty signals.
+                return np.zeros(chunk.shape, dtype=self._zi.dtype)
+            y, self._zi = lfilter(self.b, self.a, chunk, zi=self._zi)
+            return y
+
+        assert out.shape == chunk.shape, (out.shape, chunk.shape)
+        for start in range(0, chunk.shape[-1], self.block_size):
+            block = chunk[..., start:start + self.block_size]
+            # The block is filtered, before it is overwritten (out=chunk).
+            out[..., start:start + self.block_size], self._zi = lfilter(
+                self.b, self.a, block, zi=self._zi)
+        return out
+
+
+class PreemphasisStream(LFilterStream):
+    """
+    Stateful `preemphasis` for block-wise processing, see `LFilterStream`.
+    """
+    def __init__(self, p=0.95):
+        self.p = p
+        super().__init__(*_preemphasis_coefficients(p))
+
+
+class InversePreemphasisStream(LFilterStream):
+    """
+    Stateful `inverse_preemphasis` for block-wise processing, see
+    `LFilterStream`.
+
+    >>> x = np.random.normal(size=1000)
+    >>> stream = InversePreemphasisStream(0.97)
+    >>> y = np.concatenate([stream(c) for c in np.split(x, 10)])
+    >>> np.array_equal(y, inverse_preemphasis(x, 0.97))
+    True
+    """
+    def __init__(self, p=0.95):
+        self.p = p
+        super().__init__(*_inverse_preemphasis_coefficients(p))
+
+
+class OffsetCompensationStream(LFilterStream):
+    """
+    Stateful `offset_compensation` for block-wise processing, see
+    `LFilterStream`.
+    """
+    def __init__(self):
+        super().__init__(*_offset_compensation_coefficients())
+
+
+class PreemphasisWithOffsetCompensationStream(LFilterStream):
+    """
+    Stateful `preemphasis_with_offset_compensation` for block-wise
+    processing, see `LFilterStream`.
+    """
+    def __init__(self, p=0.95):
+        self.p = p
+        super().__init__(
+            *_preemphasis_with_offset_compensation_coefficients(p))
 
 
 def median(input_signal, window_size=3):
@@ -1,3 +1,5 @@
+import functools
+
 import numpy as np
 from paderbox.transform.module_stft import stft
 from paderbox.transform.module_fbank import logfbank
@@ -94,8 +96,8 @@ def mfcc_velocity_acceleration(time_signal, *args, **kwargs):
     :return: Stacked features
     """
     mfcc_signal = mfcc(time_signal, *args, **kwargs)
-    delta_mfcc_signal = delta(mfcc_signal, order=1)
-    delta_delta_mfcc_signal = delta(mfcc_signal, order=2)
+    delta_mfcc_signal, delta_delta_mfcc_signal = deltas(
+        mfcc_signal, orders=(1, 2))
     return np.concatenate(
         (mfcc_signal, delta_mfcc_signal, delta_delta_mfcc_signal),
         axis=1
@@ -160,11 +162,237 @@ def delta(data, width=9, order=1, axis=-1, trim=True):
     if trim:
         idx = [slice(None)] * delta_x.ndim
         idx[axis] = slice(- half_length - data.shape[axis], - half_length)
-        delta_x = delta_x[idx]
+        delta_x = delta_x[tuple(idx)]
 
     return delta_x
 
 
+def _check_delta_arguments(width, orders):
+    if width < 3 or np.mod(width, 2) != 1:
+        raise ValueError('width must be an odd integer >= 3')
+    orders = tuple(orders)
+    if len(orders) == 0:
+        raise ValueError('orders must not be empty')
+    for order in orders:
+        if not isinstance(order, (int, np.integer)) or order < 0:
+            raise ValueError('orders must be non-negative integers')
+    return int(width), tuple(int(order) for order in orders)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_delta_kernels(width, orders):
+    """
+    Returns the FIR kernels of `delta` for all orders, such that
+    `delta(x, width, order)[t]` is `kernels[i] @ x_ext[t:t + kernel_length]`,
+    where x_ext is x with `zeros` zeros and `width` times the first value in
+    front and `width` times the last value at the end.
+
+    `delta` filters the edge padded data `order` times with the causal
+    `window` and the zero initial state of lfilter. That is a single filter
+    with the `order` times convolved window. The zeros are the initial state.
+
+    >>> kernels, zeros = _get_delta_kernels(5, (0, 1, 2))
+    >>> zeros
+    1
+    >>> kernels * 100
+    array([[  0.,   0.,   0.,   0.,   0.,   0., 100.,   0.,   0.],
+           [  0.,   0.,   0.,   0., -20., -10.,   0.,  10.,  20.],
+           [  4.,   4.,   1.,  -4., -10.,  -4.,   1.,   4.,   4.]])
+    """
+    half_length = 1 + width // 2
+    window = np.arange(half_length - 1., -half_length, -1.)
+    window /= np.sum(np.abs(window) ** 2)
+
+    # The last kernel value is x_ext[zeros + 2 * width - half_length + t].
+    # Enough zeros that the longest kernel fits.
+    zeros = max(0, max(orders) * (width - 1) - 2 * width + half_length)
+    last = zeros + 2 * width - half_length
+
+    kernels = np.zeros((len(orders), last + 1))
+    for i, order in enumerate(orders):
+        if order == 0:
+            kernels[i, zeros + width] = 1
+        else:
+            kernel = window
+            for _ in range(order - 1):
+                kernel = np.convolve(kernel, window)
+            kernels[i, last - len(kernel) + 1:] = kernel[::-1]
+    kernels.flags.writeable = False
+    return kernels, zeros
+
+
+def _apply_delta_kernels(x_ext, kernels, frames, axis):
+    """
+    Correlates x_ext along axis with each kernel and returns the first
+    `frames` values with shape (len(kernels), ...).
+    Only the non-zero part of each kernel is used and the data keeps its
+    memory layout, which is a lot faster than moving the axis to the end.
+    """
+    shape = list(x_ext.shape)
+    shape[axis] = frames
+    out = np.empty((len(kernels), *shape),
+                   dtype=np.result_type(x_ext.dtype, kernels.dtype))
+    if frames == 0:
+        return out
+    for kernel, o in zip(kernels, out):
+        start, stop = np.flatnonzero(kernel)[[0, -1]] + [0, 1]
+        index = [slice(None)] * x_ext.ndim
+        index[axis] = slice(start, start + frames + stop - start - 1)
+        segments = segment_axis(
+            x_ext[tuple(index)], stop - start, 1, axis=axis, end='cut')
+        # The segment axis is axis + 1
+        letters = 'abcdefghijklmnopqrstuvwxyz'[:segments.ndim]
+        np.einsum(
+            f'{letters},{letters[axis + 1]}->'
+            f'{letters[:axis + 1] + letters[axis + 2:]}',
+            segments, kernel[start:stop], out=o,
+        )
+    return out
+
+
+def deltas(data, width=9, orders=(1, 2), axis=-1):
+    """
+    Computes the delta features of several orders in a single pass.
+
+    Each order is equal to `delta(data, width, order, axis)` (order 0 is the
+    data). Instead of padding and filtering the data once per order and
+    again for each order, all orders are computed with precomputed FIR
+    kernels from one padded copy of the data.
+
+    Args:
+        data: The input data, e.g. features with shape (frames, features).
+        width: Odd integer >= 3. Number of frames over which to compute the
+            delta feature.
+        orders: Sequence of non-negative integers, the orders of the
+            difference operator.
+        axis: The axis along which to compute deltas. Default is -1, as in
+            `delta`.
+
+    Returns:
+        Array with shape (len(orders), *data.shape).
+
+    >>> x = np.random.normal(size=(100, 13))
+    >>> d = deltas(x, orders=(0, 1, 2), axis=0)
+    >>> d.shape
+    (3, 100, 13)
+    >>> np.array_equal(d[0], x)
+    True
+    >>> np.allclose(d[2], delta(x, order=2, axis=0))
+    True
+    """
+    data = np.atleast_1d(data)
+    width, orders = _check_delta_arguments(width, orders)
+    kernels, zeros = _get_delta_kernels(width, orders)
+    axis = axis % data.ndim
+
+    padding = [(0, 0)] * data.ndim
+    padding[axis] = (width, width)
+    x = np.pad(data, padding, mode='edge')
+    padding[axis] = (zeros, 0)
+    x = np.pad(x, padding)
+    return _apply_delta_kernels(x, kernels, data.shape[axis], axis)
+
+
+class DeltaStream:
+    """
+    Stateful `deltas` for online feature streams.
+
+    The delta of a frame needs the `width // 2` following frames, hence the
+    stream keeps this context (and the past frames of the kernels) and
+    returns the deltas of the frames, that have the complete context.
+    Concatenating the returned frames along the axis yields the deltas of
+    the whole data (up to floating point errors).
+
+    Args:
+        width: See deltas.
+        orders: See deltas.
+        axis: The frame axis of the chunks. Default is -1, as in `delta`.
+
+    >>> x = np.random.normal(size=(100, 13))
+    >>> stream = DeltaStream(orders=(0, 1, 2), axis=0)
+    >>> stream(x[:10]).shape
+    (3, 6, 13)
+    >>> stream(x[10:]).shape
+    (3, 90, 13)
+    >>> stream.flush().shape
+    (3, 4, 13)
+    """
+    def __init__(self, width=9, orders=(1, 2), axis=-1):
+        self.width, self.orders = _check_delta_arguments(width, orders)
+        self.axis = axis
+        self._kernels, self._zeros = _get_delta_kernels(
+            self.width, self.orders)
+        self.reset()
+
+    def reset(self):
+        """Drops the internal state to start with new data."""
+        # The not yet consumed part of the padded data, see
+        # _get_delta_kernels.
+        self._buffer = None
+        self._empty = None
+        self._num_frames = 0
+        self._num_outputs = 0
+
+    def _emit(self, frames):
+        axis = self.axis % self._buffer.ndim
+        out = _apply_delta_kernels(self._buffer, self._kernels, frames, axis)
+        index = [slice(None)] * self._buffer.ndim
+        index[axis] = slice(frames, None)
+        self._buffer = self._buffer[tuple(index)]
+        self._num_outputs += frames
+        return out
+
+    def __call__(self, chunk):
+        """
+        Args:
+            chunk: New frames, e.g. with shape (frames, features).
+
+        Returns:
+            The deltas of the frames with complete context with shape
+            (len(orders), ...), where the frame axis is `axis + 1`.
+        """
+        chunk = np.atleast_1d(chunk)
+        axis = self.axis % chunk.ndim
+        if self._buffer is None:
+            if chunk.shape[axis] == 0:
+                self._empty = _apply_delta_kernels(
+                    chunk, self._kernels, 0, axis)
+                return self._empty
+            first = np.take(chunk, [0], axis=axis)
+            zeros = list(chunk.shape)
+            zeros[axis] = self._zeros
+            self._buffer = np.concatenate([
+                np.zeros(zeros, chunk.dtype),
+                np.repeat(first, self.width, axis=axis),
+            ], axis=axis)
+
+        self._buffer = np.concatenate([self._buffer, chunk], axis=axis)
+        self._num_frames += chunk.shape[axis]
+        length = self._kernels.shape[-1]
+        return self._emit(max(self._buffer.shape[axis] - length + 1, 0))
+
+    def flush(self):
+        """
+        Finishes the data, i.e. repeats the last frame like `delta`, and
+        returns the deltas of the remaining frames. Afterwards, the stream
+        is reset and can be used for new data.
+        """
+        if self._buffer is None:
+            if self._empty is None:
+                raise ValueError('flush was called without any frames.')
+            out = self._empty
+        else:
+            axis = self.axis % self._buffer.ndim
+            last = np.take(self._buffer, [-1], axis=axis)
+            self._buffer = np.concatenate(
+                [self._buffer, np.repeat(last, self.width, axis=axis)],
+                axis=axis,
+            )
+            out = self._emit(self._num_frames - self._num_outputs)
+        self.reset()
+        return out
+
+
 def modmfcc(
         time_signal, sample_rate=16000,
         stft_win_len=400, stft_shift=160, numcep=30,
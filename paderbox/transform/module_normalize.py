@@ -1,3 +1,6 @@
+import dataclasses
+import typing
+
 import numpy as np
 
 
@@ -10,3 +13,296 @@ def normalize_mean_variance(data, axis=0, eps=1e-6):
     """
     return ((data - np.mean(data, axis=axis, keepdims=True)) /
             (np.std(data, axis=axis, keepdims=True) + eps))
+
+
+def _normalize_axis(axis):
+    if isinstance(axis, (list, tuple)):
+        return tuple(int(a) for a in axis)
+    return int(axis)
+
+
+@dataclasses.dataclass
+class MeanVarianceStatistics:
+    """
+    Mergeable mean and variance statistics for cepstral mean and variance
+    normalization (CMVN) over a corpus.
+
+    The statistics (count, mean and the sum of squared deviations `m2`) are
+    updated per utterance with the parallel algorithm of Chan et al.
+    (a batched version of Welford's algorithm), hence no utterance has to be
+    kept in memory and statistics from several workers can be merged.
+    `normalize` matches `normalize_mean_variance` on the
+    concatenation of all utterances along `axis`.
+
+    Args:
+        axis: Axis (or axes) of the utterances that is reduced, usually the
+            time axis. The remaining axes have to have the same size for all
+            utterances.
+        dtype: Accumulation dtype, e.g. 'float32' or 'float64'.
+
+    >>> stats = MeanVarianceStatistics()
+    >>> a = np.random.normal(size=(100, 13))
+    >>> b = np.random.normal(size=(50, 13))
+    >>> _ = stats.update(a).update(b)
+    >>> stats.count, stats.mean.shape
+    (150, (1, 13))
+    >>> np.allclose(
+    ...     stats.normalize(a),
+    ...     normalize_mean_variance(np.concatenate([a, b]))[:100],
+    ... )
+    True
+
+    Statistics from different workers are merged with `merge` or `+`:
+    >>> stats_a = MeanVarianceStatistics().update(a)
+    >>> stats_b = MeanVarianceStatistics().update(b)
+    >>> np.allclose((stats_a + stats_b).variance, stats.variance)
+    True
+
+    The serializable representation can be written with `pb.io.dump`:
+    >>> stats = MeanVarianceStatistics().update([[1., 2.], [3., 6.]])
+    >>> stats.to_serializable()
+    {'count': 2, 'mean': [[2.0, 4.0]], 'm2': [[2.0, 8.0]], 'axis': 0, 'dtype': 'float64'}
+    >>> MeanVarianceStatistics.from_serializable(stats.to_serializable())
+    MeanVarianceStatistics(axis=0, dtype='float64', count=2, mean=array([[2., 4.]]), m2=array([[2., 8.]]))
+    """
+    axis: typing.Union[int, tuple] = 0
+    dtype: str = 'float64'
+    count: int = 0
+    mean: typing.Optional[np.ndarray] = None
+    m2: typing.Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        self.axis = _normalize_axis(self.axis)
+        self.dtype = np.dtype(self.dtype).name
+        self.count = int(self.count)
+        if self.mean is not None:
+            self.mean = np.asarray(self.mean, dtype=self.dtype)
+            self.m2 = np.asarray(self.m2, dtype=self.dtype)
+
+    def _merge(self, count, mean, m2):
+        if count == 0:
+            return self
+        if self.count == 0:
+            self.count, self.mean, self.m2 = count, mean, m2
+            return self
+        if mean.shape != self.mean.shape:
+            raise ValueError(
+                f'Shape mismatch of the statistics: {mean.shape} (new) and '
+                f'{self.mean.shape} (accumulated). Only the reduced axis '
+                f'{self.axis} may differ.'
+            )
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean = self.mean + delta * (count / total)
+        self.m2 = self.m2 + m2 + np.square(delta) * (self.count * count / total)
+        self.count = total
+        return self
+
+    def update(self, data):
+        """
+        Adds the frames of `data` to the statistics.
+
+        Args:
+            data: Array, e.g. features with shape (frames, features).
+
+        Returns:
+            self
+        """
+        data = np.asarray(data, dtype=self.dtype)
+        axis = self.axis if isinstance(self.axis, tuple) else (self.axis,)
+        count = int(np.prod([data.shape[a] for a in axis]))
+        if count == 0:
+            return self
+        mean = np.mean(data, axis=self.axis, keepdims=True)
+        m2 = np.sum(np.square(data - mean), axis=self.axis, keepdims=True)
+        return self._merge(count, mean, m2)
+
+    def merge(self, other: 'MeanVarianceStatistics'):
+        """
+        Adds the statistics of `other` (e.g. from another worker) to self.
+
+        Returns:
+            self
+        """
+        if other.axis != self.axis:
+            raise ValueError(
+                f'Cannot merge statistics with axis {other.axis} into '
+                f'statistics with axis {self.axis}.'
+            )
+        if other.count == 0:
+            return self
+        return self._merge(
+            other.count,
+            other.mean.astype(self.dtype),
+            other.m2.astype(self.dtype),
+        )
+
+    def copy(self):
+        return dataclasses.replace(
+            self,
+            mean=None if self.mean is None else self.mean.copy(),
+            m2=None if self.m2 is None else self.m2.copy(),
+        )
+
+    def __add__(self, other):
+        if not isinstance(other, MeanVarianceStatistics):
+            return NotImplemented
+        return self.copy().merge(other)
+
+    @property
+    def variance(self):
+        if self.count == 0:
+            raise ValueError('The statistics are empty.')
+        return self.m2 / self.count
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    def normalize(self, data, eps=1e-6):
+        """
+        Normalizes `data` with the accumulated mean and standard deviation.
+        Matches `normalize_mean_variance(data, axis, eps)`, when the
+        statistics are calculated on `data`.
+        """
+        if self.count == 0:
+            raise ValueError('The statistics are empty.')
+        return (data - self.mean) / (self.std + eps)
+
+    def to_serializable(self):
+        """
+        Exports the statistics to builtin types, e.g. for `pb.io.dump`.
+        """
+        return {
+            'count': self.count,
+            'mean': None if self.mean is None else self.mean.tolist(),
+            'm2': None if self.m2 is None else self.m2.tolist(),
+            'axis': list(self.axis) if isinstance(self.axis, tuple) else self.axis,
+            'dtype': self.dtype,
+        }
+
+    @classmethod
+    def from_serializable(cls, obj):
+        """
+        Reverts `to_serializable`.
+        """
+        return cls(**obj)
+
+
+@dataclasses.dataclass
+class GroupedMeanVarianceStatistics:
+    """
+    `MeanVarianceStatistics` for each group (e.g. speaker) of utterances.
+
+    Use `normalize(data, group)` for per-speaker normalization and
+    `normalize(data)` for global normalization with the merged statistics
+    of all groups.
+
+    >>> stats = GroupedMeanVarianceStatistics()
+    >>> a = np.random.normal(size=(100, 13))
+    >>> b = np.random.normal(1, 2, size=(50, 13))
+    >>> _ = stats.update('spk_a', a).update('spk_b', b)
+    >>> sorted(stats.statistics), stats.global_statistics().count
+    (['spk_a', 'spk_b'], 150)
+    >>> np.allclose(stats.normalize(b, 'spk_b'), normalize_mean_variance(b))
+    True
+    >>> np.allclose(
+    ...     stats.normalize(b),
+    ...     normalize_mean_variance(np.concatenate([a, b]))[100:],
+    ... )
+    True
+    """
+    axis: typing.Union[int, tuple] = 0
+    dtype: str = 'float64'
+    statistics: typing.Dict[str, MeanVarianceStatistics] = dataclasses.field(
+        default_factory=dict)
+
+    def __post_init__(self):
+        self.axis = _normalize_axis(self.axis)
+        self.dtype = np.dtype(self.dtype).name
+
+    def _get(self, group):
+        if group not in self.statistics:
+            self.statistics[group] = MeanVarianceStatistics(
+                axis=self.axis, dtype=self.dtype)
+        return self.statistics[group]
+
+    def update(self, group, data):
+        """
+        Adds the frames of `data` to the statistics of `group`.
+
+        Returns:
+            self
+        """
+        self._get(group).update(data)
+        return self
+
+    def merge(self, other: 'GroupedMeanVarianceStatistics'):
+        """
+        Adds the statistics of all groups of `other` to self.
+
+        Returns:
+            self
+        """
+        for group, statistics in other.statistics.items():
+            self._get(group).merge(statistics)
+        return self
+
+    def __add__(self, other):
+        if not isinstance(other, GroupedMeanVarianceStatistics):
+            return NotImplemented
+        new = dataclasses.replace(self, statistics={
+            group: statistics.copy()
+            for group, statistics in self.statistics.items()
+        })
+        return new.merge(other)
+
+    def __getitem__(self, group):
+        return self.statistics[group]
+
+    def global_statistics(self):
+        """
+        Returns the merged `MeanVarianceStatistics` of all groups.
+        """
+        statistics = MeanVarianceStatistics(axis=self.axis, dtype=self.dtype)
+        for group_statistics in self.statistics.values():
+            statistics.merge(group_statistics)
+        return statistics
+
+    def normalize(self, data, group=None, eps=1e-6):
+        """
+        Normalizes `data` with the statistics of `group`. When `group` is
+        None, the global statistics are used.
+        """
+        if group is None:
+            statistics = self.global_statistics()
+        else:
+            statistics = self.statistics[group]
+        return statistics.normalize(data, eps=eps)
+
+    def to_serializable(self):
+        """
+        Exports the statistics to builtin types, e.g. for `pb.io.dump`.
+        """
+        return {
+            'axis': list(self.axis) if isinstance(self.axis, tuple) else self.axis,
+            'dtype': self.dtype,
+            'statistics': {
+                group: statistics.to_serializable()
+                for group, statistics in self.statistics.items()
+            },
+        }
+
+    @classmethod
+    def from_serializable(cls, obj):
+        """
+        Reverts `to_serializable`.
+        """
+        return cls(
+            axis=obj['axis'],
+            dtype=obj['dtype'],
+            statistics={
+                group: MeanVarianceStatistics.from_serializable(statistics)
+                for group, statistics in obj['statistics'].items()
+            },
+        )
@@ -1,27 +1,64 @@
-from copy import deepcopy
+import functools
+import math
 
 import numpy as np
-import paderbox.math.directional as directional
 
 
-def transform_to_baseband(X, size, shift):
+@functools.lru_cache(maxsize=32)
+def _get_baseband_ramp(size, shift, frequencies):
+    """
+    Returns the phase ramp `exp(-2j pi t f shift / size)` for one period of
+    the frame index t. The ramp is periodic in t with the period
+    `size / gcd(shift, size)`, because t * f * shift is an integer.
+
+    >>> _get_baseband_ramp(4, 2, 3).round(3)
+    array([[ 1.+0.j,  1.+0.j,  1.+0.j],
+           [ 1.+0.j, -1.-0.j,  1.+0.j]])
+    """
+    period = size // math.gcd(shift, size)
+    t = np.arange(period)[:, None]
+    f = np.arange(frequencies)
+    # The modulo keeps the argument of exp small and, hence, accurate.
+    ramp = np.exp(-2j * np.pi * ((t * f * shift) % size) / size)
+    ramp.flags.writeable = False
+    return ramp
+
+
+def transform_to_baseband(X, size, shift, inplace=False):
     """Assumes linear frequency dependency.
 
     Then phase is more consistent over frequencies.
 
+    Multiplies X[t, ..., f] with exp(-2j pi t f shift / size). The phase
+    ramp is precomputed for one period of t and applied with one
+    broadcasted multiplication per frame in the period.
+
     Args:
-        X:
-        size:
-        shift:
+        X: STFT signal with shape (T, ..., F), e.g. (T, D, F).
+        size: FFT size of the STFT.
+        shift: Shift of the STFT.
+        inplace: If True, X is modified inplace (X has to be a complex
+            array), otherwise a copy is transformed.
 
     Returns:
+        The baseband STFT signal with the shape of X.
 
+    >>> X = np.ones((4, 2, 3), dtype=np.complex64)
+    >>> transform_to_baseband(X, size=4, shift=1)[:, 0, :].round(3)
+    array([[ 1.+0.j,  1.+0.j,  1.+0.j],
+           [ 1.+0.j,  0.-1.j, -1.-0.j],
+           [ 1.+0.j, -1.-0.j,  1.+0.j],
+           [ 1.+0.j, -0.+1.j, -1.-0.j]], dtype=complex64)
+    >>> transform_to_baseband(X, size=4, shift=1, inplace=True) is X
+    True
     """
-    X = deepcopy(X)
-    T, _, F = X.shape
-    for t in range(T):
-        for f in range(F):
-            X[t, :, f] *= np.exp(-2j * np.pi * t * f * shift / size)
+    if not inplace:
+        X = np.array(X, dtype=np.result_type(X, np.complex64))
+    ramp = _get_baseband_ramp(size, shift, X.shape[-1]).astype(
+        X.dtype, copy=False)
+    period = ramp.shape[0]
+    for t in range(min(period, X.shape[0])):
+        X[t::period] *= ramp[t]
     return X
 
 
@@ -33,17 +70,30 @@ def get_phase_features(X, size, shift):
     to SPP than the phase itself.
 
     Args:
-        X:
-        size:
-        shift:
+        X: STFT signal with shape (T, ..., F), e.g. (T, D, F).
+        size: FFT size of the STFT.
+        shift: Shift of the STFT.
 
     Returns:
+        phase: Phase of the baseband STFT.
+        delta: Phase difference of neighbouring frames, wrapped to
+            [-pi, pi]. The first frame is zero.
+        delta_delta: Difference of neighbouring deltas. The first frame is
+            zero.
 
+    >>> X = np.random.normal(size=(10, 2, 5)) + 1j
+    >>> [f.shape for f in get_phase_features(X, size=8, shift=2)]
+    [(10, 2, 5), (10, 2, 5), (10, 2, 5)]
     """
-    X_base = transform_to_baseband(X, size, shift)
-    phase = np.angle(X_base)
+    phase = np.angle(transform_to_baseband(X, size, shift))
+
     delta = np.zeros_like(phase)
-    delta[1:, ...] = directional.minus(phase[1:, ...], phase[:-1, ...])
+    d = delta[1:, ...]
+    np.subtract(phase[1:, ...], phase[:-1, ...], out=d)
+    # Wrap the difference from ]-2 pi, 2 pi[ to [-pi, pi]. Values with an
+    # absolute value of pi are kept, like in paderbox.math.directional.wrap.
+    d -= 2 * np.pi * np.round(d / (2 * np.pi))
+
     delta_delta = np.zeros_like(phase)
-    delta_delta[1:, ...] = delta[1:, ...] - delta[:-1, ...]
+    np.subtract(delta[1:, ...], delta[:-1, ...], out=delta_delta[1:, ...])
     return phase, delta, delta_delta
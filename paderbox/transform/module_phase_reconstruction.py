@@ -1,5 +1,11 @@
 import numpy as np
+from paderbox.array import overlap_add, segment_axis
+from paderbox.transform.module_fft import get_fft_backend
 from paderbox.transform.module_stft import STFT
+from paderbox.transform.module_stft import _complex_dtype, _real_dtype
+from paderbox.transform.module_stft import _fading_pad_width
+from paderbox.transform.module_stft import _get_analysis_window
+from paderbox.transform.module_stft import _get_synthesis_window
 
 
 def _griffin_lim_step(
@@ -130,3 +136,211 @@ def fast_griffin_lim(
             )
 
     return audio
+
+
+class GriffinLim:
+    """Batched (fast) Griffin-Lim phase reconstruction.
+
+    Reconstructs a batch of magnitude spectrograms at once. Contrary to
+    `griffin_lim` and `fast_griffin_lim`, the engine
+     - reuses preallocated time and frequency buffers in all iterations,
+     - calculates in the precision of `dtype` (e.g. np.float32),
+     - stops each item, when its spectral convergence
+       `||x - |X|||_F / (||x||_F + 1e-5)` drops below `tolerance` and
+       continues only with the remaining items.
+
+    With `alpha=0` each iteration is that of `griffin_lim`, with `alpha > 0`
+    that of `fast_griffin_lim`.
+
+    Args:
+        stft: paderbox.transform.module_stft.STFT instance
+        iterations: Maximum number of iterations for each item.
+        alpha: Momentum for GLA acceleration, where 0 <= alpha <= 1.
+        tolerance: If not None, an item stops, when its spectral convergence
+            is below this value.
+        dtype: The floating point precision of the calculation.
+            Defaults to `stft.dtype`, i.e. double precision for None.
+
+    >>> stft = STFT(128, 512, fading=False)
+    >>> x = np.abs(stft(np.random.normal(size=(3, 2, 4000))))
+    >>> x.shape
+    (3, 2, 29, 257)
+    >>> gla = GriffinLim(stft, iterations=10, alpha=0.99, dtype=np.float32)
+    >>> audio, info = gla(x, return_info=True)
+    >>> audio.shape, audio.dtype
+    ((3, 2, 4096), dtype('float32'))
+    >>> info['iterations']
+    array([[10, 10],
+           [10, 10]...])
+    >>> info['spectral_convergence'].shape
+    (3, 2)
+    """
+    def __init__(
+            self,
+            stft: STFT,
+            iterations=100,
+            *,
+            alpha=0.,
+            tolerance=None,
+            dtype=None,
+    ):
+        if not 0. <= alpha <= 1.:
+            raise ValueError(f'alpha must be in [0, 1], but is {alpha}.')
+        self.stft = stft
+        self.iterations = iterations
+        self.alpha = alpha
+        self.tolerance = tolerance
+
+        if dtype is None:
+            dtype = stft.dtype
+        self._fft = get_fft_backend(stft.fft_backend, dtype)
+        self.dtype = np.dtype(np.float64) if dtype is None else _real_dtype(dtype)
+        self.complex_dtype = _complex_dtype(self.dtype)
+
+        self._analysis_window = _get_analysis_window(
+            stft.window, stft.symmetric_window, stft.window_length,
+        ).astype(self.dtype)
+        self._synthesis_window = _get_synthesis_window(
+            stft.window, stft.symmetric_window, stft.window_length, stft.shift,
+        ).astype(self.dtype)
+        self._pad_width = _fading_pad_width(
+            stft.window_length, stft.shift, stft.fading)
+
+    def __repr__(self):
+        return (
+            f'{self.__class__.__name__}(iterations={self.iterations}, '
+            f'alpha={self.alpha}, tolerance={self.tolerance}, '
+            f'dtype={self.dtype})'
+        )
+
+    def __call__(self, x, *, init_phase=None, return_info=False):
+        """
+        Args:
+            x: Magnitude spectrograms with shape (..., frames, size//2+1).
+            init_phase: Optional initial phase with the shape of x.
+                Default: Uniform random phase, as in `fast_griffin_lim`.
+            return_info: If True, additionally return a dict with the
+                number of iterations and the final spectral convergence of
+                each item.
+
+        Returns:
+            The time signals with shape (..., samples), where samples is
+            `stft.frames_to_samples(frames)`.
+        """
+        stft = self.stft
+        window_length, shift, size = stft.window_length, stft.shift, stft.size
+
+        # Copy, because the active items are compacted inplace.
+        x = np.array(x, dtype=self.dtype)
+        *independent, frames, bins = x.shape
+        assert bins == size // 2 + 1, (x.shape, size)
+        x = x.reshape(-1, frames, bins)
+        batch_size = x.shape[0]
+
+        if init_phase is None:
+            init_phase = np.random.uniform(
+                low=-np.pi, high=np.pi, size=x.shape)
+        else:
+            init_phase = np.reshape(init_phase, x.shape)
+
+        front, end = self._pad_width
+        padded_length = frames * shift + window_length - shift
+        num_samples = padded_length - front - end
+        assert num_samples == stft.frames_to_samples(frames), (
+            num_samples, stft.frames_to_samples(frames))
+
+        # Buffers for all iterations. Only the first `active` items are used.
+        reconstruction = (x * np.exp(1j * init_phase)).astype(
+            self.complex_dtype)
+        y = reconstruction.copy() if self.alpha else reconstruction
+        proposal = np.empty_like(reconstruction)
+        magnitude = np.empty_like(x)
+        time_signal = np.empty((batch_size, padded_length), dtype=self.dtype)
+        time_frames = np.empty(
+            (batch_size, frames, window_length), dtype=self.dtype)
+
+        audio = np.zeros((batch_size, num_samples), dtype=self.dtype)
+        iterations = np.zeros(batch_size, dtype=int)
+        spectral_convergence = np.full(batch_size, np.nan)
+        norm = np.sqrt(np.einsum('btf,btf->b', x, x)) + 1e-5
+        index = np.arange(batch_size)
+
+        active = batch_size
+        for iteration in range(1, self.iterations + 1):
+            if active == 0:
+                break
+            y_, m, p = y[:active], magnitude[:active], proposal[:active]
+            t, f = time_signal[:active], time_frames[:active]
+
+            # Use the phase of the reconstruction and the supplied magnitude,
+            # i.e. y * (x / |y|). A real ratio is cheaper than a complex
+            # division. The angle of zero is zero, i.e. the proposal is x.
+            np.abs(y_, out=m)
+            zero = m == 0
+            m[zero] = 1
+            np.divide(x[:active], m, out=m)
+            np.multiply(y_, m, out=p)
+            p[zero] = x[:active][zero]
+
+            # istft
+            np.multiply(
+                self._fft.irfft(p, n=size)[..., :window_length],
+                self._synthesis_window, out=f,
+            )
+            t[...] = 0
+            overlap_add(f, shift, out=t)
+
+            # stft of the cut signal
+            t[:, :front] = 0
+            t[:, padded_length - end:] = 0
+            np.multiply(
+                segment_axis(t, window_length, shift, end=None),
+                self._analysis_window, out=f,
+            )
+            new = self._fft.rfft(f, n=size)
+
+            np.abs(new, out=m)
+            np.subtract(x[:active], m, out=m)
+            sc = np.sqrt(np.einsum('btf,btf->b', m, m)) / norm[:active]
+
+            if iteration == self.iterations:
+                done = np.ones(active, dtype=bool)
+            elif self.tolerance is None:
+                done = np.zeros(active, dtype=bool)
+            else:
+                done = sc < self.tolerance
+
+            if np.any(done):
+                finished = index[:active][done]
+                audio[finished] = t[done, front:front + num_samples]
+                iterations[finished] = iteration
+                spectral_convergence[finished] = sc[done]
+
+            if self.alpha:
+                # Momentum
+                r = reconstruction[:active]
+                np.subtract(new, r, out=y_)
+                y_ *= self.alpha
+                y_ += new
+                r[...] = new
+            else:
+                y_[...] = new
+
+            if np.any(done):
+                keep = ~done
+                active_ = int(np.sum(keep))
+                buffers = [x, norm, index, y]
+                if self.alpha:
+                    buffers.append(reconstruction)
+                for buffer in buffers:
+                    buffer[:active_] = buffer[:active][keep]
+                active = active_
+
+        audio = audio.reshape(*independent, num_samples)
+        if return_info:
+            return audio, {
+                'iterations': iterations.reshape(independent),
+                'spectral_convergence':
+                    spectral_convergence.reshape(independent),
+            }
+        return audio
@@ -1,8 +1,20 @@
 """
 This module contains resampling methods.
 """
+import collections
+import concurrent.futures
+import dataclasses
+import functools
+import itertools
+import math
+import os
 import subprocess
+from pathlib import Path
+
 import numpy as np
+import scipy.signal
+
+from paderbox.array import segment_axis
 
 
 def resample_sox(signal: np.ndarray, *, in_rate, out_rate, normalize=True):
@@ -148,3 +160,522 @@ def resample_sox(signal: np.ndarray, *, in_rate, out_rate, normalize=True):
     return signal_resampled
 
 resample = resample_sox
+
+
+# (passband, rejection): The passband edge relative to the Nyquist frequency
+# of the lower sample rate and the stopband attenuation in dB. The stopband
+# starts at the Nyquist frequency of the lower sample rate.
+# 'sox' is fitted to the default quality of `sox` v14.4.2 (`rate -h`, i.e.
+# -3 dB at 95 % of the band and more than 125 dB rejection).
+_resample_quality = {
+    'sox': (0.9135, 130.),
+    'low': (0.8, 80.),
+}
+
+
+@functools.lru_cache(maxsize=32)
+def _get_polyphase_filters(in_rate, out_rate, quality):
+    """
+    Designs the Kaiser windowed sinc lowpass for the resampling from in_rate
+    to out_rate and splits it into the polyphase components.
+
+    Returns:
+        up: Upsampling factor.
+        down: Downsampling factor.
+        delay: The delay of the filter in the upsampled domain.
+        filters: Read-only array with shape (up, taps). filters[p] are the
+            time reversed coefficients of phase p, i.e. h[p::up][::-1].
+
+    >>> up, down, delay, filters = _get_polyphase_filters(16000, 8000, 'sox')
+    >>> up, down, delay, filters.shape
+    (1, 2, 197, (1, 395))
+    """
+    passband, rejection = _resample_quality[quality]
+    gcd = math.gcd(in_rate, out_rate)
+    up, down = out_rate // gcd, in_rate // gcd
+
+    # Relative to the Nyquist frequency of the upsampled signal
+    width = (1 - passband) / max(up, down)
+    cutoff = (1 + passband) / 2 / max(up, down)
+    numtaps, beta = scipy.signal.kaiserord(rejection, width)
+    numtaps |= 1  # odd, i.e. an integer delay
+    h = scipy.signal.firwin(
+        numtaps, cutoff, window=('kaiser', beta), scale=False) * up
+
+    taps = -(-numtaps // up)
+    filters = np.zeros(up * taps)
+    filters[:numtaps] = h
+    filters = np.ascontiguousarray(filters.reshape(taps, up).T[:, ::-1])
+    filters.flags.writeable = False
+    return up, down, (numtaps - 1) // 2, filters
+
+
+@dataclasses.dataclass
+class PolyphaseResampler:
+    """
+    In-process resampling with a polyphase FIR filter along the last axis.
+
+    Contrary to `resample_sox`, no subprocess is started and no normalization
+    is necessary. The filter design is cached for each combination of
+    in_rate, out_rate and quality.
+
+    The default quality 'sox' uses a linear phase lowpass that is fitted to
+    the default of `sox` v14.4.2 and the output has the same number of
+    samples and the same delay compensation, i.e. the result is close to
+    `resample_sox` (SNR above 55 dB for white noise, a lot higher for
+    signals without energy close to the new Nyquist frequency).
+    The quality 'low' uses a shorter filter with 80 dB rejection and a
+    passband up to 80 % of the Nyquist frequency.
+
+    Args:
+        in_rate: Sample rate of the input as an integer.
+        out_rate: Sample rate of the output as an integer.
+        quality: 'sox' or 'low'.
+
+    >>> signal = np.array([1., -1., 1., -1.])
+    >>> PolyphaseResampler(2, 1)(signal)  # resample_sox: [0.28615332, -0.13513082]
+    array([ 0.28614865, -0.13512676])
+    >>> resampler = PolyphaseResampler(in_rate=8000, out_rate=16000)
+    >>> resampler(np.random.normal(size=(2, 8000))).shape
+    (2, 16000)
+    >>> resampler.num_samples(101)
+    202
+    """
+    in_rate: int
+    out_rate: int
+    quality: str = 'sox'
+
+    def __post_init__(self):
+        if self.quality not in _resample_quality:
+            raise ValueError(
+                f'Unknown quality {self.quality!r}. '
+                f'Available: {list(_resample_quality)}'
+            )
+        if self.in_rate != self.out_rate:
+            self.up, self.down, self.delay, self.filters = \
+                _get_polyphase_filters(
+                    int(self.in_rate), int(self.out_rate), self.quality)
+        else:
+            self.up, self.down, self.delay, self.filters = 1, 1, 0, None
+
+    def num_samples(self, samples):
+        """The number of output samples for a signal with `samples` samples.
+        Rounds like sox, i.e. half up.
+        """
+        return (2 * samples * self.up + self.down) // (2 * self.down)
+
+    def _first_input(self, output_index):
+        """The index of the first input sample that contributes to the
+        output sample output_index, i.e. the start of its filter support.
+        """
+        return (output_index * self.down + self.delay) // self.up \
+            - self.filters.shape[-1] + 1
+
+    def _filter(self, buffer, offset, first, stop):
+        """
+        Calculates the output samples first to stop-1.
+
+        Args:
+            buffer: The input samples starting with the input index `offset`.
+                Indices before 0 are the zeros in front of the signal.
+            offset: Input index of buffer[..., 0].
+            first: Index of the first output sample.
+            stop: Index of the last output sample plus one.
+        """
+        up, down = self.up, self.down
+        taps = self.filters.shape[-1]
+        filters = self.filters.astype(buffer.dtype, copy=False)
+
+        out = np.empty((*buffer.shape[:-1], stop - first), dtype=buffer.dtype)
+        # The outputs first + j, first + j + up, ... use the same phase and
+        # their inputs are `down` samples apart, i.e. they are the frames of
+        # segment_axis multiplied with the filter of that phase.
+        # For long filters and a small downsampling factor an FFT based
+        # correlation of all inputs is faster than the direct calculation of
+        # the outputs, although it calculates `down - 1` needless values
+        # between two outputs.
+        use_fft = taps > 4 * down
+        for j in range(min(up, stop - first)):
+            phase = ((first + j) * down + self.delay) % up
+            start = self._first_input(first + j) - offset
+            frames = len(range(j, stop - first, up))
+            inputs = buffer[..., start:start + (frames - 1) * down + taps]
+            if use_fft:
+                out[..., j::up] = scipy.signal.oaconvolve(
+                    inputs,
+                    filters[phase][::-1].reshape(
+                        (1,) * (inputs.ndim - 1) + (taps,)),
+                    mode='valid', axes=-1,
+                )[..., ::down]
+            else:
+                np.matmul(
+                    segment_axis(inputs, taps, down, end=None),
+                    filters[phase], out=out[..., j::up],
+                )
+        return out
+
+    def __call__(self, signal):
+        """
+        Args:
+            signal: Signal with shape (..., samples).
+
+        Returns:
+            Resampled signal with shape (..., self.num_samples(samples)) and
+            the floating point dtype of the signal.
+        """
+        signal = np.asarray(signal)
+        if not np.issubdtype(signal.dtype, np.floating):
+            signal = signal.astype(np.float64)
+        if self.filters is None:
+            return signal.copy()
+
+        samples = signal.shape[-1]
+        stop = self.num_samples(samples)
+        if stop == 0:
+            return np.zeros((*signal.shape[:-1], 0), dtype=signal.dtype)
+        front = -self._first_input(0)
+        end = max(self._first_input(stop - 1) + self.filters.shape[-1]
+                  - samples, 0)
+        signal = np.pad(
+            signal, [(0, 0)] * (signal.ndim - 1) + [(front, end)])
+        return self._filter(signal, -front, 0, stop)
+
+    def stream(self):
+        """
+        Returns a stateful object for block-wise (online) resampling.
+
+        >>> resampler = PolyphaseResampler(in_rate=16000, out_rate=8000)
+        >>> x = np.random.normal(size=1000)
+        >>> stream = resampler.stream()
+        >>> y = [stream(x[:300]), stream(x[300:]), stream.flush()]
+        >>> [len(c) for c in y]
+        [52, 350, 98]
+        >>> np.allclose(np.concatenate(y), resampler(x))
+        True
+        """
+        return ResampleStream(self)
+
+
+def resample_polyphase(
+        signal: np.ndarray, *, in_rate, out_rate, quality='sox'):
+    """
+    In-process alternative to `resample_sox`, see `PolyphaseResampler`.
+
+    >>> signal = np.random.normal(size=(2, 16000))
+    >>> resample_polyphase(signal, in_rate=16000, out_rate=8000).shape
+    (2, 8000)
+    """
+    return PolyphaseResampler(in_rate, out_rate, quality)(signal)
+
+
+class ResampleStream:
+    """
+    Stateful polyphase resampling for block-wise (online) processing along
+    the last axis.
+
+    Keeps the input samples that are still in the filter support of the
+    future output samples. Concatenating the returned samples along the last
+    axis yields the result of the resampler for the whole signal (up to
+    floating point errors).
+
+    >>> resampler = PolyphaseResampler(in_rate=8000, out_rate=16000)
+    >>> x = np.random.normal(size=(2, 8000))
+    >>> stream = ResampleStream(resampler)
+    >>> y = np.concatenate(
+    ...     [stream(c) for c in np.split(x, [100, 1234, 5000], axis=-1)]
+    ...     + [stream.flush()],
+    ...     axis=-1,
+    ... )
+    >>> y.shape
+    (2, 16000)
+    >>> np.allclose(y, resampler(x))
+    True
+    """
+    def __init__(self, resampler: PolyphaseResampler):
+        self.resampler = resampler
+        self.reset()
+
+    def reset(self):
+        """Drops the internal state to start with a new signal."""
+        self._buffer = None
+        self._offset = 0  # input index of self._buffer[..., 0]
+        self._num_samples = 0
+        self._num_outputs = 0
+
+    def _init_buffer(self, shape, dtype):
+        if not np.issubdtype(dtype, np.floating):
+            dtype = np.float64
+        if self.resampler.filters is None:
+            self._offset = 0
+        else:
+            self._offset = self.resampler._first_input(0)
+        self._buffer = np.zeros((*shape, -self._offset), dtype=dtype)
+
+    def _emit(self, stop):
+        resampler = self.resampler
+        out = resampler._filter(
+            self._buffer, self._offset, self._num_outputs, stop)
+        self._num_outputs = stop
+        drop = resampler._first_input(stop) - self._offset
+        self._buffer = self._buffer[..., max(drop, 0):]
+        self._offset += max(drop, 0)
+        return out
+
+    def __call__(self, chunk):
+        """
+        Args:
+            chunk: Signal with shape (..., samples).
+
+        Returns:
+            The new output samples with shape (..., samples').
+        """
+        chunk = np.asarray(chunk)
+        resampler = self.resampler
+        if self._buffer is None:
+            self._init_buffer(chunk.shape[:-1], chunk.dtype)
+        if resampler.filters is None:
+            return resampler(chunk)
+
+        self._buffer = np.concatenate(
+            [self._buffer, chunk.astype(self._buffer.dtype, copy=False)],
+            axis=-1,
+        )
+        self._num_samples += chunk.shape[-1]
+
+        # The output k is complete, when the last input of its support,
+        # i.e. (k * down + delay) // up, is available.
+        stop = (
+            self._num_samples * resampler.up - 1 - resampler.delay
+        ) // resampler.down + 1
+        stop = max(stop, self._num_outputs)
+        return self._emit(stop)
+
+    def flush(self):
+        """
+        Finishes the signal, i.e. pads zeros at the end, and returns the
+        remaining output samples. Afterwards, the stream is reset and can be
+        used for a new signal.
+        """
+        resampler = self.resampler
+        if self._buffer is None:
+            self._init_buffer((), np.float64)
+        if resampler.filters is None:
+            out = self._buffer
+            self.reset()
+            return out
+
+        stop = resampler.num_samples(self._num_samples)
+        assert stop >= self._num_outputs, (stop, self._num_outputs)
+        missing = (
+            resampler._first_input(stop - 1) + resampler.filters.shape[-1]
+            - self._offset - self._buffer.shape[-1]
+        )
+        if stop > self._num_outputs and missing > 0:
+            self._buffer = np.pad(
+                self._buffer,
+                [(0, 0)] * (self._buffer.ndim - 1) + [(0, missing)],
+            )
+        out = self._emit(stop)
+        self.reset()
+        return out
+
+
+def _map_chunk(function, chunk):
+    return [function(item) for item in chunk]
+
+
+def _ordered_pool_map(function, items, *, max_workers=None, chunksize=1,
+                      prefetch=2):
+    """
+    Like `ProcessPoolExecutor.map`, but consumes `items` lazily: At most
+    `prefetch` chunks per worker are submitted and not yet yielded. Hence,
+    the memory consumption does not depend on the number of items.
+    The results are yielded in the order of the items.
+
+    max_workers=0 calculates everything in the calling process.
+
+    >>> list(_ordered_pool_map(abs, range(-5, 0), max_workers=2, chunksize=2))
+    [5, 4, 3, 2, 1]
+    """
+    if max_workers == 0:
+        yield from map(function, items)
+        return
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    items = iter(items)
+    chunks = iter(lambda: list(itertools.islice(items, chunksize)), [])
+    with concurrent.futures.ProcessPoolExecutor(max_workers) as executor:
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append(executor.submit(_map_chunk, function, chunk))
+            if len(pending) >= max_workers * prefetch:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _resample_signal(
+        signal, *, in_rate, out_rate, backend, quality, normalize):
+    if isinstance(signal, (str, os.PathLike)):
+        from paderbox.io import load_audio
+        signal, sample_rate = load_audio(signal, return_sample_rate=True)
+        if in_rate is None:
+            in_rate = sample_rate
+        elif in_rate != sample_rate:
+            raise ValueError(
+                f'Expected the sample rate {in_rate}, but the file has '
+                f'{sample_rate}.'
+            )
+    if backend == 'polyphase':
+        return PolyphaseResampler(in_rate, out_rate, quality)(signal)
+    elif backend == 'sox':
+        return resample_sox(
+            signal, in_rate=in_rate, out_rate=out_rate, normalize=normalize)
+    else:
+        raise ValueError(backend)
+
+
+def resample_batch(
+        signals,
+        *,
+        in_rate=None,
+        out_rate,
+        backend='polyphase',
+        quality='sox',
+        normalize=True,
+        max_workers=None,
+        chunksize=1,
+):
+    """
+    Resamples many signals concurrently with a bounded process pool.
+
+    The signals are consumed lazily and the results are yielded in the order
+    of the input, so an iterator over a large corpus never has more than a
+    few chunks per worker in memory.
+
+    Args:
+        signals: Iterable of signals with shape (..., samples) or of audio
+            file paths.
+        in_rate: Sample rate of the signals. Optional for files, where it is
+            read from the file (and checked, when given).
+        out_rate: Sample rate of the output.
+        backend: 'polyphase' (`PolyphaseResampler`, in-process in each
+            worker) or 'sox' (`resample_sox`, one sox process per signal).
+        quality: Quality of the 'polyphase' backend.
+        normalize: The normalize argument of `resample_sox`.
+        max_workers: Number of worker processes. Default: Number of CPUs.
+            0 calculates everything in the calling process.
+        chunksize: Number of signals that are sent to a worker at once.
+            Larger values reduce the communication overhead for many short
+            signals.
+
+    Returns:
+        Iterator over the resampled signals.
+
+    >>> signals = [np.random.normal(size=16000 * i) for i in range(1, 4)]
+    >>> [s.shape for s in resample_batch(
+    ...     signals, in_rate=16000, out_rate=8000, max_workers=2)]
+    [(8000,), (16000,), (24000,)]
+    """
+    if backend not in ['polyphase', 'sox']:
+        raise ValueError(
+            f'Unknown backend {backend!r}. Available: polyphase, sox')
+    return _ordered_pool_map(
+        functools.partial(
+            _resample_signal, in_rate=in_rate, out_rate=out_rate,
+            backend=backend, quality=quality, normalize=normalize,
+        ),
+        signals,
+        max_workers=max_workers,
+        chunksize=chunksize,
+    )
+
+
+def _resample_file(paths, *, out_rate, backend, quality, block_size):
+    import soundfile
+    src, dst = map(os.fspath, paths)
+    Path(dst).parent.mkdir(parents=True, exist_ok=True)
+
+    if backend == 'sox':
+        from paderbox.utils.process_caller import run_process
+        # sox reads and writes the files, i.e. no pipes are necessary.
+        # -D: No dither for a reproducible output.
+        run_process(['sox', '-V1', '-D', src, '-r', str(out_rate), dst])
+        return dst
+    elif backend != 'polyphase':
+        raise ValueError(backend)
+
+    # Block-wise, hence the memory does not depend on the file length.
+    with soundfile.SoundFile(src) as f_in:
+        stream = PolyphaseResampler(
+            f_in.samplerate, out_rate, quality).stream()
+        with soundfile.SoundFile(
+                dst, 'w', samplerate=out_rate, channels=f_in.channels,
+                subtype=f_in.subtype, format=f_in.format,
+        ) as f_out:
+            for block in f_in.blocks(block_size, always_2d=True):
+                f_out.write(stream(block.T).T)
+            f_out.write(stream.flush().T)
+    return dst
+
+
+def resample_files(
+        files,
+        *,
+        out_rate,
+        backend='polyphase',
+        quality='sox',
+        max_workers=None,
+        chunksize=1,
+        block_size=2 ** 16,
+):
+    """
+    Resamples audio files to new audio files with a bounded process pool.
+
+    The input sample rate is read from each file and the output file has
+    the same format, subtype (e.g. PCM_16) and number of channels.
+    Neither the parent process nor the workers hold the signals in memory:
+    The 'polyphase' backend reads, resamples and writes `block_size` samples
+    at a time with `ResampleStream`, the 'sox' backend lets sox read and
+    write the files directly.
+
+    Args:
+        files: dict or iterable of (source, destination) path pairs.
+            Missing destination directories are created.
+        out_rate: Sample rate of the output files.
+        backend: 'polyphase' or 'sox', see `resample_batch`.
+        quality: Quality of the 'polyphase' backend.
+        max_workers: Number of worker processes. Default: Number of CPUs.
+            0 calculates everything in the calling process.
+        chunksize: Number of files that are sent to a worker at once.
+        block_size: Number of samples per block of the 'polyphase' backend.
+
+    Returns:
+        List of the destination paths, in the order of `files`.
+
+    >>> import tempfile, soundfile
+    >>> from paderbox.io import dump_audio
+    >>> with tempfile.TemporaryDirectory() as tmp_dir:
+    ...     tmp_dir = Path(tmp_dir)
+    ...     dump_audio(np.random.normal(size=16000), tmp_dir / 'a.wav')
+    ...     files = resample_files(
+    ...         {tmp_dir / 'a.wav': tmp_dir / '8k' / 'a.wav'}, out_rate=8000)
+    ...     info = soundfile.info(files[0])
+    >>> info.samplerate, info.frames, info.subtype
+    (8000, 8000, 'PCM_16')
+    """
+    if backend not in ['polyphase', 'sox']:
+        raise ValueError(
+            f'Unknown backend {backend!r}. Available: polyphase, sox')
+    if isinstance(files, dict):
+        files = files.items()
+    return list(_ordered_pool_map(
+        functools.partial(
+            _resample_file, out_rate=out_rate, backend=backend,
+            quality=quality, block_size=block_size,
+        ),
+        files,
+        max_workers=max_workers,
+        chunksize=chunksize,
+    ))
@@ -1,18 +1,22 @@
 """
 This file contains the STFT function and related helper functions.
 """
+import os
 import string
 import typing
+import functools
 from math import ceil
 import dataclasses
 
 import numpy as np
-from numpy.fft import rfft, irfft
 from scipy import signal
 
 from paderbox.array import roll_zeropad
+from paderbox.array import pad_axis
 from paderbox.array import segment_axis
+from paderbox.array import overlap_add
 from paderbox.utils.mapping import Dispatcher
+from paderbox.transform.module_fft import get_fft_backend
 
 
 def stft(
@@ -26,6 +30,9 @@ def stft(
         fading: typing.Optional[typing.Union[bool, str]] = 'full',
         pad: bool = True,
         symmetric_window: bool = False,
+        max_frames_per_chunk: int = None,
+        dtype=None,
+        fft_backend=None,
 ) -> np.array:
     """
     ToDo: Open points:
@@ -55,10 +62,38 @@ def stft(
         periodic. Since the implementation of the windows in scipy.signal have a
         curious behaviour for odd window_length. Use window(len+1)[:-1]. Since
         is equal to the behaviour of MATLAB.
+    :param max_frames_per_chunk: If not None, window and transform at most
+        this number of frames at once and write them into a preallocated
+        output. The fading and end padding are applied per chunk, hence the
+        peak memory is roughly the size of the output, instead of several
+        copies of the (padded) signal and the windowed frames. The result is
+        the same as without chunking.
+    :param dtype: If not None, the floating point precision of the
+        calculation, e.g. np.float32 or np.complex64 for single precision.
+        The signal and the window are cast to this precision and the output
+        has the corresponding complex dtype. The default (None) uses
+        numpy.fft, which calculates in double precision.
+    :param fft_backend: None, 'numpy', 'scipy', 'pyfftw' or an instance of
+        paderbox.transform.module_fft.FFTBackend, e.g. ScipyFFT(workers=8)
+        for a multithreaded FFT. None uses the backend selected with
+        use_fft_backend or the default, see get_fft_backend.
     :return: Single channel complex STFT signal with dimensions
         AA x ... x AZ x T' times size/2+1 times BA x ... x BZ.
+
+    >>> x = np.random.normal(size=(2, 1000))
+    >>> X = stft(x, 64, 16)
+    >>> X.shape
+    (2, 66, 33)
+    >>> np.array_equal(X, stft(x, 64, 16, max_frames_per_chunk=10))
+    True
+    >>> stft(x, 64, 16, dtype=np.float32).dtype
+    dtype('complex64')
     """
     time_signal = np.asarray(time_signal)
+    fft = get_fft_backend(fft_backend, dtype).rfft
+    if dtype is not None:
+        dtype = _real_dtype(dtype)
+        time_signal = time_signal.astype(dtype, copy=False)
 
     axis = axis % time_signal.ndim
 
@@ -67,20 +102,32 @@ def stft(
 
     # Pad with zeros to have enough samples for the window function to fade.
     assert fading in [None, True, False, 'full', 'half'], (fading, type(fading))
-    if fading not in [False, None]:
-        pad_width = np.zeros((time_signal.ndim, 2), dtype=int)
-        if fading == 'half':
-            pad_width[axis, 0] = (window_length - shift) // 2
-            pad_width[axis, 1] = ceil((window_length - shift) / 2)
-        else:
-            pad_width[axis, :] = window_length - shift
-        time_signal = np.pad(time_signal, pad_width, mode='constant')
+    pad_width = _fading_pad_width(window_length, shift, fading)
 
-    window = _get_window(
+    window = _get_analysis_window(
         window=window,
         symmetric_window=symmetric_window,
         window_length=window_length,
     )
+    if dtype is not None:
+        window = window.astype(dtype)
+
+    letters = string.ascii_lowercase[:time_signal.ndim + 1]
+    mapping = letters + ',' + letters[axis + 1] + '->' + letters
+
+    if max_frames_per_chunk is not None:
+        # The fading and the end padding are applied per chunk, hence the
+        # padded signal is never materialized.
+        return _chunked_stft(
+            time_signal, window, mapping,
+            size=size, shift=shift, axis=axis, pad_width=pad_width, pad=pad,
+            max_frames_per_chunk=max_frames_per_chunk, fft=fft, dtype=dtype,
+        )
+
+    if fading not in [False, None]:
+        pad_width_ = np.zeros((time_signal.ndim, 2), dtype=int)
+        pad_width_[axis, :] = pad_width
+        time_signal = np.pad(time_signal, pad_width_, mode='constant')
 
     time_signal_seg = segment_axis(
         time_signal,
@@ -90,12 +137,8 @@ def stft(
         end='pad' if pad else 'cut'
     )
 
-    letters = string.ascii_lowercase[:time_signal_seg.ndim]
-    mapping = letters + ',' + letters[axis + 1] + '->' + letters
-
     try:
-        # ToDo: Implement this more memory efficient
-        return rfft(
+        stft_signal = fft(
             np.einsum(mapping, time_signal_seg, window),
             n=size,
             axis=axis + 1,
@@ -110,6 +153,218 @@ def stft(
             f'axis+1: {axis+1}'
         ) from e
 
+    if dtype is not None:
+        # Some backends (e.g. numpy < 2) always calculate in double precision
+        stft_signal = stft_signal.astype(_complex_dtype(dtype), copy=False)
+    return stft_signal
+
+
+def _chunked_stft(
+        time_signal, window, mapping, *, size, shift, axis, pad_width, pad,
+        max_frames_per_chunk, fft, dtype,
+):
+    """
+    Windows and transforms blocks of `max_frames_per_chunk` frames and writes
+    them into a preallocated output. The frames of each block are sliced
+    from the unpadded signal and only the blocks at the edges are zero
+    padded (fading and end padding), hence neither the padded signal nor the
+    windowed frames exist for the whole signal.
+    """
+    assert max_frames_per_chunk > 0, max_frames_per_chunk
+    window_length = len(window)
+    samples = time_signal.shape[axis]
+    front, back = pad_width
+    if front < 0 or back < 0:
+        # Same error as np.pad in the unchunked stft
+        raise ValueError(
+            f'Negative fading pad width {pad_width}: The window_length '
+            f'({window_length}) is smaller than the shift ({shift}).'
+        )
+    padded = samples + front + back
+    if pad:
+        # Same padding as segment_axis(..., end='pad')
+        if padded < window_length:
+            padded = window_length
+        else:
+            padded += -(padded + shift - window_length) % shift
+    frames = (padded + shift - window_length) // shift
+    if frames < 0:
+        # Same error as segment_axis(..., end='cut') in the unchunked stft
+        raise ValueError(
+            f'The signal ({samples} samples and fading pad width '
+            f'{pad_width}) is too short for the window_length '
+            f'{window_length} with pad=False.'
+        )
+
+    out = None
+    selector = [slice(None)] * (time_signal.ndim + 1)
+    for start in range(0, max(frames, 1), max_frames_per_chunk):
+        stop = min(start + max_frames_per_chunk, frames)
+        # Position of the block in the padded signal.
+        begin = start * shift - front
+        end = begin + max(stop - start - 1, 0) * shift + window_length
+        block = time_signal[
+            (slice(None),) * axis + (slice(max(begin, 0), max(end, 0)),)]
+        if begin < 0 or end > samples:
+            block_pad_width = np.zeros((time_signal.ndim, 2), dtype=int)
+            block_pad_width[axis] = max(-begin, 0), max(end - samples, 0)
+            block = np.pad(block, block_pad_width, mode='constant')
+        block = fft(
+            np.einsum(
+                mapping,
+                segment_axis(
+                    block, window_length, shift=shift, axis=axis, end='cut'),
+                window,
+            ),
+            n=size,
+            axis=axis + 1,
+        )
+        if out is None:
+            # The dtype of rfft depends on the numpy version.
+            shape = list(block.shape)
+            shape[axis] = frames
+            out = np.empty(
+                shape,
+                dtype=block.dtype if dtype is None else _complex_dtype(dtype),
+            )
+        if stop > start:
+            selector[axis] = slice(start, stop)
+            out[tuple(selector)] = block
+    return out
+
+
+def ragged_stft(
+        time_signals: typing.Sequence[np.ndarray],
+        size: int = 1024,
+        shift: int = 256,
+        *,
+        window: [str, typing.Callable] = signal.windows.blackman,
+        window_length: int = None,
+        fading: typing.Optional[typing.Union[bool, str]] = 'full',
+        pad: bool = True,
+        symmetric_window: bool = False,
+        dtype=None,
+        fft_backend=None,
+        packed: bool = False,
+):
+    """
+    Calculates the stft of a list of signals with different lengths, e.g.
+    the utterances of a minibatch, with a single FFT call.
+
+    The frames of all signals are packed into one array, windowed and
+    transformed at once. This avoids the per call overhead of `stft` for many
+    short signals. The result for each signal is equal to
+    `stft(time_signal, ...)` with the time axis as last axis.
+
+    Args:
+        time_signals: List of signals with shape (..., samples). The number
+            of samples may differ.
+        size, shift, window, window_length, fading, pad, symmetric_window,
+        dtype, fft_backend: See stft.
+        packed: If False, return a list of stfts. If True, return the packed
+            frames with shape (frames, size // 2 + 1) and the frame offsets,
+            where `packed[offsets[i]:offsets[i + 1]]` are the frames of the
+            i-th signal, i.e. the flattened stft of shape (..., frames, F).
+
+    Returns:
+        List of stft signals or the tuple (packed, offsets).
+
+    >>> xs = [np.random.normal(size=1000), np.random.normal(size=(2, 300))]
+    >>> [X.shape for X in ragged_stft(xs, 64, 16)]
+    [(66, 33), (2, 22, 33)]
+    >>> all(np.array_equal(X, stft(x, 64, 16))
+    ...     for X, x in zip(ragged_stft(xs, 64, 16), xs))
+    True
+    >>> packed, offsets = ragged_stft(xs, 64, 16, packed=True)
+    >>> packed.shape, offsets
+    ((110, 33), array([  0,  66, 110]))
+    """
+    fft = get_fft_backend(fft_backend, dtype).rfft
+
+    if window_length is None:
+        window_length = size
+
+    window = _get_analysis_window(
+        window=window,
+        symmetric_window=symmetric_window,
+        window_length=window_length,
+    )
+    if dtype is not None:
+        dtype = _real_dtype(dtype)
+        window = window.astype(dtype)
+
+    time_signals = [np.asarray(time_signal) for time_signal in time_signals]
+    if dtype is not None:
+        time_signals = [
+            time_signal.astype(dtype, copy=False)
+            for time_signal in time_signals
+        ]
+
+    assert fading in [None, True, False, 'full', 'half'], (fading, type(fading))
+    front, end = _fading_pad_width(window_length, shift, fading)
+
+    # Calculate the number of frames like segment_axis in stft.
+    num_samples = np.array(
+        [time_signal.shape[-1] for time_signal in time_signals], dtype=int)
+    num_rows = np.array(
+        [int(np.prod(time_signal.shape[:-1])) for time_signal in time_signals],
+        dtype=int,
+    )
+    padded = num_samples + front + end
+    if pad:
+        num_frames = np.where(
+            padded < window_length,
+            1,
+            -(-(padded - window_length) // shift) + 1,
+        )
+    else:
+        num_frames = np.maximum((padded - window_length) // shift + 1, 0)
+    region = np.maximum(padded, (num_frames - 1) * shift + window_length)
+
+    # Write each signal with its fading and padding zeros into one buffer.
+    # Each row (e.g. channel) of each signal has its own region.
+    region_offsets = np.cumsum(np.concatenate([[0], num_rows * region]))
+    buffer = np.zeros(
+        region_offsets[-1],
+        dtype=np.result_type(
+            window, *[time_signal.dtype for time_signal in time_signals]),
+    )
+    for time_signal, start, rows, length in zip(
+            time_signals, region_offsets, num_rows, region
+    ):
+        buffer[start:start + rows * length].reshape(rows, length)[
+            :, front:front + time_signal.shape[-1]
+        ] = time_signal.reshape(rows, time_signal.shape[-1])
+
+    # Gather and window the frames of all rows.
+    row_frames = np.repeat(num_frames, num_rows)
+    row_starts = np.cumsum(np.repeat(region, num_rows)) \
+        - np.repeat(region, num_rows)
+    frame_index = np.arange(row_frames.sum()) \
+        - np.repeat(np.cumsum(row_frames) - row_frames, row_frames)
+    frame_starts = np.repeat(row_starts, row_frames) + shift * frame_index
+    if len(frame_starts) > 0:
+        frames = np.lib.stride_tricks.sliding_window_view(
+            buffer, window_length)[frame_starts]
+        frames *= window
+    else:
+        frames = np.zeros((0, window_length), dtype=buffer.dtype)
+
+    stft_signal = fft(frames, n=size, axis=-1)
+    if dtype is not None:
+        stft_signal = stft_signal.astype(_complex_dtype(dtype), copy=False)
+
+    offsets = np.cumsum(np.concatenate([[0], num_rows * num_frames]))
+    if packed:
+        return stft_signal, offsets
+    else:
+        return [
+            stft_signal[start:stop].reshape(
+                *time_signal.shape[:-1], frames, stft_signal.shape[-1])
+            for time_signal, start, stop, frames in zip(
+                time_signals, offsets[:-1], offsets[1:], num_frames)
+        ]
+
 
 def stft_with_kaldi_dimensions(
         time_signal,
@@ -172,6 +427,31 @@ _window_dispatcher = Dispatcher({
 })
 
 
+def _real_dtype(dtype):
+    """Returns the real floating point dtype with the precision of dtype.
+
+    >>> _real_dtype(np.complex64)
+    dtype('float32')
+    >>> _real_dtype('float64')
+    dtype('float64')
+    """
+    return np.finfo(dtype).dtype
+
+
+def _complex_dtype(dtype):
+    """Returns the complex floating point dtype with the precision of dtype.
+
+    >>> _complex_dtype(np.float32)
+    dtype('complex64')
+    >>> _complex_dtype(None)
+    dtype('complex128')
+    """
+    if dtype is None:
+        # numpy.fft calculates in double precision
+        return np.dtype(np.complex128)
+    return np.result_type(_real_dtype(dtype), np.complex64)
+
+
 def _get_window(window, symmetric_window, window_length):
     """Returns the window.
 
@@ -205,6 +485,115 @@ def _get_window(window, symmetric_window, window_length):
     return window
 
 
+def _fading_pad_width(window_length, shift, fading):
+    """
+    Returns the number of zeros that the stft adds at the start and the end
+    of the signal for the fading.
+
+    >>> _fading_pad_width(16, 4, 'full')
+    (12, 12)
+    >>> _fading_pad_width(15, 4, 'half')
+    (5, 6)
+    >>> _fading_pad_width(16, 4, None)
+    (0, 0)
+    """
+    assert fading in [None, True, False, 'full', 'half'], fading
+    if fading in [None, False]:
+        return 0, 0
+    pad_width = window_length - shift
+    if fading == 'half':
+        return pad_width // 2, ceil(pad_width / 2)
+    else:
+        return pad_width, pad_width
+
+
+@functools.lru_cache(maxsize=128)
+def _get_window_cached(window, symmetric_window, window_length):
+    window = _get_window(
+        window=window,
+        symmetric_window=symmetric_window,
+        window_length=window_length,
+    )
+    # The cached array is shared between all callers
+    window.flags.writeable = False
+    return window
+
+
+@functools.lru_cache(maxsize=128)
+def _get_synthesis_window_cached(
+        window, symmetric_window, window_length, shift
+):
+    window = _biorthogonal_window_fastest(
+        _get_analysis_window(window, symmetric_window, window_length), shift
+    )
+    window.flags.writeable = False
+    return window
+
+
+def _is_hashable(obj):
+    try:
+        hash(obj)
+    except TypeError:
+        return False
+    return True
+
+
+def _get_analysis_window(window, symmetric_window, window_length):
+    """Returns a read-only window, see _get_window.
+
+    The windows are cached with a bounded, thread-safe LRU cache, because
+    the stft is often called with the same parameters for each example.
+    Windows that are unhashable callables are not cached.
+
+    >>> _get_analysis_window('hann', False, 4)
+    array([0. , 0.5, 1. , 0.5])
+    """
+    if _is_hashable(window):
+        return _get_window_cached(window, symmetric_window, window_length)
+    else:
+        return _get_window(window, symmetric_window, window_length)
+
+
+def _get_synthesis_window(window, symmetric_window, window_length, shift):
+    """Returns the read-only biorthogonal synthesis window for the istft.
+
+    Cached like _get_analysis_window.
+
+    >>> _get_synthesis_window('hann', False, 4, 1)
+    array([0.        , 0.33333333, 0.66666667, 0.33333333])
+    """
+    if _is_hashable(window):
+        return _get_synthesis_window_cached(
+            window, symmetric_window, window_length, shift)
+    else:
+        return _biorthogonal_window_fastest(
+            _get_window(window, symmetric_window, window_length), shift)
+
+
+def window_cache_info():
+    """Returns the statistics of the analysis and synthesis window caches.
+
+    >>> window_cache_clear()
+    >>> _ = stft(np.zeros(100), 16, 4)
+    >>> _ = stft(np.zeros(100), 16, 4)
+    >>> _ = istft(stft(np.zeros(100), 16, 4), 16, 4)
+    >>> window_cache_info()['analysis']
+    CacheInfo(hits=3, misses=1, maxsize=128, currsize=1)
+    >>> window_cache_info()['synthesis']
+    CacheInfo(hits=0, misses=1, maxsize=128, currsize=1)
+    """
+    return {
+        'analysis': _get_window_cached.cache_info(),
+        'synthesis': _get_synthesis_window_cached.cache_info(),
+    }
+
+
+def window_cache_clear():
+    """Clears the analysis and synthesis window caches."""
+    _get_window_cached.cache_clear()
+    _get_synthesis_window_cached.cache_clear()
+
+
 def _samples_to_stft_frames(
         samples,
         size,
@@ -576,6 +965,8 @@ def istft(
         symmetric_window: bool=False,
         num_samples: int=None,
         pad: bool=True,
+        dtype=None,
+        fft_backend=None,
 ):
     """
     Calculated the inverse short time Fourier transform to exactly reconstruct
@@ -606,50 +997,55 @@ def istft(
     :param pad: Necessary when num_samples is not None. This arguments is only
         for the forward transform nessesary and not for the inverse.
         Here it is used, to check that num_samples is valid.
+    :param dtype: If not None, the floating point precision of the
+        calculation, e.g. np.float32 or np.complex64 for single precision.
+        See stft.
+    :param fft_backend: The FFT backend, see stft.
 
     :return: Single channel complex STFT signal
     :return: Single channel time signal.
+
+    >>> X = stft(np.random.normal(size=1000), 64, 16, dtype=np.float32)
+    >>> istft(X, 64, 16, dtype=np.float32).dtype
+    dtype('float32')
     """
     # Note: frame_axis and frequency_axis would make this function much more
     #       complicated
-    stft_signal = np.array(stft_signal)
+    ifft = get_fft_backend(fft_backend, dtype).irfft
+    if dtype is None:
+        stft_signal = np.array(stft_signal)
+    else:
+        stft_signal = np.array(stft_signal, dtype=_complex_dtype(dtype))
 
     assert stft_signal.shape[-1] == size // 2 + 1, str(stft_signal.shape)
 
     if window_length is None:
         window_length = size
 
-    window = _get_window(
+    window = _get_synthesis_window(
         window=window,
         symmetric_window=symmetric_window,
         window_length=window_length,
+        shift=shift,
     )
-
-    window = _biorthogonal_window_fastest(window, shift)
+    if dtype is not None:
+        dtype = _real_dtype(dtype)
+        window = window.astype(dtype)
 
     # window = _biorthogonal_window_fastest(
     #     window, shift, use_amplitude_for_biorthogonal_window)
     # if disable_sythesis_window:
     #     window = np.ones_like(window)
 
-    time_signal = np.zeros(
-        (*stft_signal.shape[:-2],
-         stft_signal.shape[-2] * shift + window_length - shift))
-
-    # Get the correct view to time_signal
-    time_signal_seg = segment_axis(
-        time_signal, window_length, shift, end=None
-    )
-
-    # Unbuffered inplace add
-    np.add.at(
-        time_signal_seg,
-        ...,
-        window * np.real(
-            irfft(stft_signal, n=size)
-        )[..., :window_length]
-    )
+    frames = window * np.real(
+        ifft(stft_signal, n=size)
+    )[..., :window_length]
     # The [..., :window_length] is the inverse of the window padding in rfft.
+    if dtype is not None:
+        # Some backends (e.g. numpy < 2) always calculate in double precision
+        frames = frames.astype(dtype, copy=False)
+
+    time_signal = overlap_add(frames, shift)
 
     # Compensate fade-in and fade-out
 
@@ -752,11 +1148,20 @@ class STFT:
     symmetric_window: bool = False
     pad: bool = True
     fading: typing.Optional[typing.Union[bool, str]] = 'full'
-    
+    max_frames_per_chunk: int = None
+    dtype: typing.Any = None
+    fft_backend: typing.Any = None
+
     def __post_init__(self):
         if self.window_length is None:
             self.window_length = self.size
 
+        # Fill the analysis window cache, so that the first call is not
+        # slower than the following calls. The synthesis window is only
+        # calculated on the first call of `inverse`.
+        _get_analysis_window(
+            self.window, self.symmetric_window, self.window_length)
+
     def __call__(self, x):
         """
         Performs stft
@@ -776,11 +1181,41 @@ class STFT:
             symmetric_window=self.symmetric_window,
             axis=-1,
             fading=self.fading,
-            pad=self.pad
+            pad=self.pad,
+            max_frames_per_chunk=self.max_frames_per_chunk,
+            dtype=self.dtype,
+            fft_backend=self.fft_backend,
         )  # (..., T, F)
 
         return x
 
+    def ragged(self, xs, packed=False):
+        """
+        Performs stft for a list of signals with different lengths with a
+        single FFT call, see ragged_stft.
+
+        Args:
+            xs: list of time signals
+            packed: If True, return the packed frames and the frame offsets
+                instead of a list.
+
+        Returns:
+
+        """
+        return ragged_stft(
+            xs,
+            size=self.size,
+            shift=self.shift,
+            window_length=self.window_length,
+            window=self.window,
+            symmetric_window=self.symmetric_window,
+            fading=self.fading,
+            pad=self.pad,
+            dtype=self.dtype,
+            fft_backend=self.fft_backend,
+            packed=packed,
+        )
+
     def inverse(self, x, num_samples=None):
         """
         Computes inverse stft
@@ -801,6 +1236,8 @@ class STFT:
             symmetric_window=self.symmetric_window,
             fading=self.fading,
             num_samples=num_samples,
+            dtype=self.dtype,
+            fft_backend=self.fft_backend,
         )
 
     def samples_to_frames(self, samples):
@@ -864,3 +1301,480 @@ class STFT:
         return _stft_frames_to_samples(
             frames, self.window_length, self.shift, fading=self.fading
         )
+
+    def stream(self):
+        """
+        Returns a stateful object for block-wise (online) stft.
+
+        Each call with a chunk of audio returns only the new frames, call
+        `flush` at the end of the signal to get the remaining frames.
+        The concatenated frames are equal to `self(x)`.
+
+        >>> stft = STFT(shift=4, size=16)
+        >>> x = np.random.normal(size=50)
+        >>> stream = stft.stream()
+        >>> stream(x[:10]).shape
+        (2, 9)
+        >>> stream(x[10:11]).shape
+        (0, 9)
+        >>> stream(x[11:]).shape
+        (10, 9)
+        >>> stream.flush().shape
+        (4, 9)
+        >>> stft(x).shape
+        (16, 9)
+
+        """
+        return STFTStream(self)
+
+    def inverse_stream(self, num_samples=None):
+        """
+        Returns a stateful object for block-wise (online) istft.
+
+        Each call with a block of frames returns the samples that are
+        finished, i.e. no later frame overlaps with them. Call `flush` after
+        the last frame to get the remaining samples. The concatenated samples
+        are equal to `self.inverse(X, num_samples)`.
+
+        >>> stft = STFT(shift=4, size=16)
+        >>> x = np.random.normal(size=50)
+        >>> X = stft(x)
+        >>> X.shape
+        (16, 9)
+        >>> stream = stft.inverse_stream(num_samples=50)
+        >>> stream(X[:4]).shape
+        (4,)
+        >>> stream(X[4:]).shape
+        (46,)
+        >>> stream.flush().shape
+        (0,)
+
+        """
+        return ISTFTStream(self, num_samples=num_samples)
+
+    def lazy(self, x, **load_kwargs):
+        """
+        Returns a lazy view on the stft of x, that calculates only the frames
+        that are requested by indexing. x can be an array or the path of an
+        audio file, see LazySTFT.
+
+        >>> stft = STFT(shift=160, size=512)
+        >>> x = np.random.normal(size=160000)
+        >>> view = stft.lazy(x)
+        >>> view.shape
+        (1003, 257)
+        >>> np.array_equal(view[500:510], stft(x)[500:510])
+        True
+        """
+        return LazySTFT(self, x, **load_kwargs)
+
+
+class STFTStream:
+    """
+    Stateful stft for block-wise (online) processing along the last axis.
+
+    Keeps the samples that are not yet covered by a complete frame and
+    returns only the new frames. Hence, the cost of a call depends only on
+    the chunk size and not on the number of already processed samples.
+    Concatenating the returned frames along the frame axis (i.e. axis -2)
+    yields the same values as the stft of the whole signal.
+
+    >>> stft = STFT(shift=160, size=512, window_length=400, fading='half')
+    >>> x = np.random.normal(size=(2, 8000))
+    >>> stream = STFTStream(stft)
+    >>> X = np.concatenate(
+    ...     [stream(c) for c in np.split(x, [100, 1234, 5000], axis=-1)]
+    ...     + [stream.flush()],
+    ...     axis=-2,
+    ... )
+    >>> X.shape
+    (2, 50, 257)
+    >>> np.array_equal(X, stft(x))
+    True
+    """
+    def __init__(self, stft: STFT):
+        self.stft = stft
+        # Every frame of the stream is a complete frame without fading and
+        # padding. The fading and the padding at the end are handled by the
+        # stream.
+        self._frame_stft = dataclasses.replace(stft, fading=None, pad=False)
+        self.reset()
+
+    def reset(self):
+        """Drops the internal state to start with a new signal."""
+        self._buffer = None
+        self._num_samples = 0
+        self._num_frames = 0
+        # Only relevant for shift > window_length: Samples between two
+        # frames that are not covered by any frame.
+        self._skip = 0
+
+    def _init_buffer(self, shape, dtype):
+        front, _ = _fading_pad_width(
+            self.stft.window_length, self.stft.shift, self.stft.fading)
+        self._buffer = np.zeros((*shape, front), dtype=dtype)
+
+    def _frames(self, buffer, frames):
+        """Calculates the first `frames` frames of the buffer."""
+        window_length, shift = self.stft.window_length, self.stft.shift
+        if frames <= 0:
+            return np.zeros(
+                (*buffer.shape[:-1], 0, self.stft.size // 2 + 1),
+                dtype=_complex_dtype(self.stft.dtype),
+            )
+        return self._frame_stft(
+            buffer[..., :(frames - 1) * shift + window_length]
+        )
+
+    def __call__(self, chunk):
+        """
+        Args:
+            chunk: Time signal with shape (..., samples).
+
+        Returns:
+            The new complete stft frames with shape (..., frames, size//2+1).
+        """
+        chunk = np.asarray(chunk)
+        window_length, shift = self.stft.window_length, self.stft.shift
+
+        if self._buffer is None:
+            self._init_buffer(chunk.shape[:-1], chunk.dtype)
+
+        self._num_samples += chunk.shape[-1]
+        if self._skip > 0:
+            skip = min(self._skip, chunk.shape[-1])
+            chunk = chunk[..., skip:]
+            self._skip -= skip
+
+        buffer = np.concatenate([self._buffer, chunk], axis=-1)
+
+        if buffer.shape[-1] >= window_length:
+            frames = (buffer.shape[-1] - window_length) // shift + 1
+        else:
+            frames = 0
+
+        X = self._frames(buffer, frames)
+        self._buffer = buffer[..., frames * shift:]
+        self._skip += max(frames * shift - buffer.shape[-1], 0)
+        self._num_frames += frames
+        return X
+
+    def flush(self):
+        """
+        Finishes the signal, i.e. applies the fading and padding at the end,
+        and returns the remaining frames. Afterwards, the stream is reset and
+        can be used for a new signal.
+        """
+        window_length, shift = self.stft.window_length, self.stft.shift
+
+        if self._buffer is None:
+            self._init_buffer((), np.float64)
+
+        total_frames = _samples_to_stft_frames(
+            self._num_samples, window_length, shift,
+            pad=self.stft.pad, fading=self.stft.fading,
+        )
+        if self.stft.pad:
+            # stft pads signals that are shorter than the window to one frame.
+            total_frames = max(total_frames, 1)
+        frames = total_frames - self._num_frames
+
+        _, end = _fading_pad_width(
+            self.stft.window_length, self.stft.shift, self.stft.fading)
+        buffer = self._buffer
+        missing = max((frames - 1) * shift + window_length, 0) \
+            - buffer.shape[-1]
+        if missing > 0:
+            # Fading and padding are both zeros.
+            buffer = np.pad(buffer, [(0, 0)] * (buffer.ndim - 1) + [
+                (0, missing)], mode='constant')
+        assert missing <= end or self.stft.pad, (missing, end)
+
+        X = self._frames(buffer, frames)
+        self.reset()
+        return X
+
+
+class ISTFTStream:
+    """
+    Stateful istft for block-wise (online) processing of stft frames.
+
+    Only the last `window_length - shift` samples of the overlap-add are kept
+    as state, finished samples are returned immediately. Hence, the memory
+    consumption is independent of the signal length.
+    Concatenating the returned samples along the last axis yields the same
+    values as the istft of all frames.
+
+    >>> stft = STFT(shift=160, size=512, window_length=400, fading='full')
+    >>> x = np.random.normal(size=(2, 8000))
+    >>> X = stft(x)
+    >>> stream = ISTFTStream(stft, num_samples=8000)
+    >>> x_hat = np.concatenate(
+    ...     [stream(block) for block in np.split(X, [1, 7, 30], axis=-2)]
+    ...     + [stream.flush()],
+    ...     axis=-1,
+    ... )
+    >>> x_hat.shape
+    (2, 8000)
+    >>> np.allclose(x_hat, x)
+    True
+    """
+    def __init__(self, stft: STFT, num_samples=None):
+        self.stft = stft
+        self.num_samples = num_samples
+        assert stft.window_length >= stft.shift, (
+            'The streaming istft does not support shift > window_length',
+            stft.window_length, stft.shift
+        )
+
+        self._synthesis_window = _get_synthesis_window(
+            window=stft.window,
+            symmetric_window=stft.symmetric_window,
+            window_length=stft.window_length,
+            shift=stft.shift,
+        )
+        self._irfft = get_fft_backend(stft.fft_backend, stft.dtype).irfft
+        if stft.dtype is None:
+            self._dtype = np.dtype(np.float64)
+        else:
+            self._dtype = _real_dtype(stft.dtype)
+            self._synthesis_window = self._synthesis_window.astype(
+                self._dtype)
+        self.reset()
+
+    def reset(self):
+        """Drops the internal state to start with a new signal."""
+        self._overlap = None
+        self._skip, _ = _fading_pad_width(
+            self.stft.window_length, self.stft.shift, self.stft.fading)
+        self._num_samples = 0
+
+    def _emit(self, time_signal):
+        """Removes the fade-in and the samples after num_samples."""
+        if self._skip > 0:
+            skip = min(self._skip, time_signal.shape[-1])
+            time_signal = time_signal[..., skip:]
+            self._skip -= skip
+        if self.num_samples is not None:
+            time_signal = time_signal[
+                ..., :max(self.num_samples - self._num_samples, 0)]
+        self._num_samples += time_signal.shape[-1]
+        return time_signal
+
+    def __call__(self, stft_signal):
+        """
+        Args:
+            stft_signal: Block of stft frames with shape
+                (..., frames, size//2+1).
+
+        Returns:
+            The finished samples with shape (..., samples).
+        """
+        if self.stft.dtype is None:
+            stft_signal = np.asarray(stft_signal)
+        else:
+            stft_signal = np.asarray(
+                stft_signal, dtype=_complex_dtype(self._dtype))
+        size, shift = self.stft.size, self.stft.shift
+        window_length = self.stft.window_length
+        assert stft_signal.shape[-1] == size // 2 + 1, str(stft_signal.shape)
+
+        if self._overlap is None:
+            self._overlap = np.zeros(
+                (*stft_signal.shape[:-2], window_length - shift),
+                dtype=self._dtype,
+            )
+
+        frames = stft_signal.shape[-2]
+        time_signal = np.zeros(
+            (*stft_signal.shape[:-2], frames * shift + window_length - shift),
+            dtype=self._dtype,
+        )
+        time_signal[..., :window_length - shift] = self._overlap
+
+        overlap_add(
+            self._synthesis_window * np.real(
+                self._irfft(stft_signal, n=size)
+            )[..., :window_length],
+            shift,
+            out=time_signal,
+        )
+
+        self._overlap = time_signal[..., frames * shift:]
+        return self._emit(time_signal[..., :frames * shift])
+
+    def flush(self):
+        """
+        Finishes the signal, i.e. returns the remaining samples without the
+        fade-out. Afterwards, the stream is reset and can be used for a new
+        signal.
+        """
+        if self._overlap is None:
+            self._overlap = np.zeros(
+                self.stft.window_length - self.stft.shift, dtype=self._dtype)
+        _, end = _fading_pad_width(
+            self.stft.window_length, self.stft.shift, self.stft.fading)
+        overlap = self._overlap
+        time_signal = self._emit(overlap[..., :overlap.shape[-1] - end])
+
+        if self.num_samples is not None:
+            assert self._num_samples == self.num_samples, (
+                'The stft frames do not cover num_samples.',
+                self._num_samples, self.num_samples
+            )
+        self.reset()
+        return time_signal
+
+
+class LazySTFT:
+    """
+    Lazy view on the stft of a (long) signal. Only the requested frames are
+    calculated, when the view is indexed. Indexing selects frames, i.e. it
+    applies to the frame axis (axis -2) and not to the first axis.
+
+    The frame range is mapped back to the sample range with
+    `STFT.frame_index_to_sample_index` (including the `fading` offsets) and
+    only these samples are read from the signal. Hence, the signal can also
+    be an audio file, that is read partially with
+    `load_audio(path, start=..., stop=...)`, or a memory mapped array.
+
+    The frames are equal to the corresponding frames of the stft of the
+    whole signal.
+
+    >>> stft = STFT(shift=160, size=512, window_length=400, fading='full')
+    >>> x = np.random.normal(size=(2, 16000))
+    >>> view = stft.lazy(x)
+    >>> view
+    LazySTFT(shape=(2, 102, 257), dtype=complex128)
+    >>> view[10:20].shape
+    (2, 10, 257)
+    >>> np.array_equal(view[10:20], stft(x)[..., 10:20, :])
+    True
+    >>> np.array_equal(view[-1], stft(x)[..., -1, :])
+    True
+
+    Frames around an event, given in samples:
+    >>> view.excerpt(8000, 8800).shape
+    (2, 6, 257)
+    """
+    def __init__(self, stft: STFT, time_signal, **load_kwargs):
+        """
+        Args:
+            stft: The STFT object.
+            time_signal: Array-like with shape (..., samples), e.g. a
+                np.ndarray or np.memmap, or the path of an audio file.
+                Arrays are only sliced along the last axis.
+            **load_kwargs: Forwarded to `load_audio` (e.g. channel or dtype),
+                when time_signal is a path.
+        """
+        self.stft = stft
+        self._frame_stft = dataclasses.replace(stft, fading=None, pad=False)
+
+        if isinstance(time_signal, (str, os.PathLike)):
+            from paderbox.io.audioread import load_audio, audio_length
+            path = time_signal
+            self.num_samples = audio_length(path)
+
+            def read(start, stop):
+                return load_audio(path, start=start, stop=stop, **load_kwargs)
+        else:
+            assert not load_kwargs, (
+                'load_kwargs are only supported for audio files', load_kwargs)
+            if not hasattr(time_signal, 'shape'):
+                time_signal = np.asarray(time_signal)
+            self.num_samples = time_signal.shape[-1]
+
+            def read(start, stop):
+                return np.asarray(time_signal[..., start:stop])
+
+        self._read = read
+
+        # Calculate a single frame to get the leading shape and the dtype.
+        # This does not depend on the actual signal length.
+        head = read(0, 1)
+        probe = self._frame_stft(np.zeros(
+            (*head.shape[:-1], stft.window_length), dtype=head.dtype))
+        self.dtype = probe.dtype
+
+        self.num_frames = stft.samples_to_frames(self.num_samples)
+        if stft.pad:
+            # stft pads signals that are shorter than the window to one frame.
+            self.num_frames = max(self.num_frames, 1)
+        self.shape = (*probe.shape[:-2], self.num_frames, probe.shape[-1])
+
+    @property
+    def ndim(self):
+        return len(self.shape)
+
+    def __repr__(self):
+        return f'{type(self).__name__}(shape={self.shape}, dtype={self.dtype})'
+
+    def _frames(self, start_frame, stop_frame):
+        """Calculates the frames start_frame to stop_frame (exclusive)."""
+        window_length, shift = self.stft.window_length, self.stft.shift
+        frames = stop_frame - start_frame
+        if frames <= 0:
+            return np.zeros((*self.shape[:-2], 0, self.shape[-1]),
+                            dtype=self.dtype)
+
+        # frame_index_to_sample_index clips negative indices (i.e. frames
+        # that start in the fade-in) to zero. The missing samples are the
+        # fading zeros.
+        start = int(self.stft.frame_index_to_sample_index(
+            start_frame, mode='first'))
+        stop = int(self.stft.frame_index_to_sample_index(
+            stop_frame - 1, mode='last')) + 1
+        length = (frames - 1) * shift + window_length
+        front = length - (stop - start)
+
+        x = self._read(start, min(stop, self.num_samples))
+        end = length - front - x.shape[-1]
+        if front > 0 or end > 0:
+            # Fading and padding are both zeros.
+            x = pad_axis(x, (front, end), axis=-1)
+        return self._frame_stft(x)
+
+    def __getitem__(self, item):
+        """
+        Args:
+            item: int or slice of the frames.
+
+        Returns:
+            The stft frames with shape (..., frames, size//2+1), or
+            (..., size//2+1) for an int.
+        """
+        if isinstance(item, slice):
+            start, stop, step = item.indices(self.num_frames)
+            if step == 1:
+                return self._frames(start, max(start, stop))
+            frame_indices = np.arange(start, stop, step)
+            if len(frame_indices) == 0:
+                return self._frames(0, 0)
+            low, high = np.min(frame_indices), np.max(frame_indices) + 1
+            return self._frames(low, high)[..., frame_indices - low, :]
+        elif isinstance(item, (int, np.integer)):
+            index = item + self.num_frames if item < 0 else item
+            if not 0 <= index < self.num_frames:
+                raise IndexError(
+                    f'Frame index {item} is out of bounds for '
+                    f'{self.num_frames} frames.')
+            return self._frames(index, index + 1)[..., 0, :]
+        else:
+            raise TypeError(
+                f'{type(self).__name__} supports only int and slice indices, '
+                f'got {item!r}.')
+
+    def excerpt(self, start_sample, stop_sample):
+        """
+        Returns the frames, that best represent the samples start_sample to
+        stop_sample (exclusive), see `STFT.sample_index_to_frame_index`.
+        """
+        start = self.stft.sample_index_to_frame_index(start_sample)
+        stop = self.stft.sample_index_to_frame_index(stop_sample - 1) + 1
+        return self[start:min(stop, self.num_frames)]
+
+    def __array__(self, dtype=None, copy=None):
+        x = self[:]
+        if dtype is not None:
+            x = x.astype(dtype, copy=False)
+        return x
@@ -44,6 +44,14 @@ def setup_nt():
     return X, fn
 
 
+def setup_nt_scipy(workers):
+    fn = partial(
+        pb.transform.stft, size=SIZE, shift=SHIFT, fading=False, pad=False,
+        fft_backend=pb.transform.module_fft.ScipyFFT(workers=workers),
+    )
+    return X, fn
+
+
 def setup_librosa():
     # Librosa cache is off by default
     # https://librosa.github.io/librosa/cache.html#enabling-the-cache
@@ -81,15 +89,22 @@ if __name__ == '__main__':
     print()
     repeats = 100
 
-    for library in 'nt librosa scipy python_speech_features'.split():
+    setups = {
+        'nt': setup_nt,
+        **{
+            f'nt_scipy_workers_{workers}': partial(setup_nt_scipy, workers)
+            for workers in [1, 2, 4, 8, 16, 32]
+            if workers <= os.cpu_count()
+        },
+        'librosa': setup_librosa,
+        'scipy': setup_scipy,
+        'python_speech_features': setup_python_speech_features,
+    }
+
+    for library, setup in setups.items():
         print(library)
-        t = timeit.Timer(
-            'fn(x)',
-            setup=(
-                f'from __main__ import setup_{library}; '
-                f'x, fn = setup_{library}()'
-            )
-        )
+        x, fn = setup()
+        t = timeit.Timer(lambda: fn(x))
         print(t.timeit(number=repeats))
         print(t.repeat(number=repeats))
         print()
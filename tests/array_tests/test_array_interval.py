@@ -1,11 +1,9 @@
+import numpy as np
 import pytest
 from paderbox.array import interval
 
 from paderbox.array.interval.util import (
-    cy_non_intersection,
-    cy_intersection,
     cy_parse_item,
-    cy_str_to_intervals,
     cy_invert_intervals,
 )
 
@@ -18,19 +16,6 @@ def test_cy_invert_intervals():
     assert cy_invert_intervals((), 10) == ((0, 10),)
 
 
-def test_cy_non_intersection():
-    assert cy_non_intersection((0, 3), ((1, 2),)) == ()
-    assert cy_non_intersection((1, 4), ((0, 2), (3, 5))) == ((0, 1), (4, 5))
-    assert cy_non_intersection((1, 2), ((0, 3),)) == ((0, 1), (2, 3))
-
-
-def test_cy_intersection():
-    assert cy_intersection((0, 3), ((1, 2),)) == ((1, 2),)
-    assert cy_intersection((1, 4), ((0, 2), (3, 5))) == ((1, 2), (3, 4))
-    assert cy_intersection((1, 2), ((0, 3),)) == ((1, 2),)
-    assert cy_intersection((4, 5), ((0, 3),)) == ()
-
-
 def test_shape():
     ai = interval.zeros(1)
     assert isinstance(ai.shape, tuple)
@@ -49,3 +34,241 @@ def test_shape():
         interval.zeros(('asdf', ))
     with pytest.raises(ValueError):
         interval.zeros((1, 2))
+
+
+def test_random_updates_match_numpy():
+    rng = np.random.RandomState(0)
+    for inverse_mode in [False, True]:
+        size = 200
+        reference = np.zeros(size, dtype=bool) ^ inverse_mode
+        ai = interval.ones(size) if inverse_mode else interval.zeros(size)
+        for _ in range(500):
+            start, stop = sorted(rng.randint(-10, size + 10, size=2).tolist())
+            if rng.uniform() < 0.2 and len(reference[start:stop]) > 0:
+                value = rng.uniform(size=len(reference[start:stop])) < 0.5
+            else:
+                value = rng.randint(2)
+            reference[start:stop] = value
+            ai[start:stop] = value
+
+            np.testing.assert_equal(ai[:], reference)
+            index = rng.randint(size)
+            assert ai[index] == reference[index]
+            assert ai.sum() == reference.sum()
+            start, stop = sorted(rng.randint(0, size, size=2).tolist())
+            np.testing.assert_equal(ai[start:stop], reference[start:stop])
+            np.testing.assert_equal(
+                ai.slice[start:stop][:], reference[start:stop])
+        assert ai.intervals == ai.normalized_intervals
+        starts_ends = np.array(ai.normalized_intervals).ravel()
+        assert np.all(np.diff(starts_ends) > 0), starts_ends
+
+
+def test_large_number_of_intervals():
+    # Appending and point queries do not scale with the number of intervals.
+    ai = interval.zeros()
+    for i in range(20000):
+        ai[10 * i:10 * i + 5] = 1
+    assert len(ai.normalized_intervals) == 20000
+    assert ai[123455] is False
+    assert ai[123451] is True
+    ai[3:100003] = 0
+    assert ai.normalized_intervals[:2] == ((0, 3), (100003, 100005))
+    assert ai.to_serializable()[0].startswith('0:3, 100003:100005, 100010:')
+
+
+def test_from_array():
+    rng = np.random.RandomState(0)
+    for size in [0, 1, 2, 10, 1000]:
+        for p in [0.01, 0.5, 0.99]:
+            array = rng.uniform(size=size) < p
+            for inverse_mode in [False, True]:
+                ai = interval.ArrayInterval(array, inverse_mode=inverse_mode)
+                assert ai.shape == (size,)
+                np.testing.assert_equal(ai[:], array)
+                reference = interval.ones(size) if inverse_mode else interval.zeros(size)
+                for i in range(size):
+                    if array[i] != inverse_mode:
+                        reference[i:i + 1] = not inverse_mode
+                assert ai.normalized_intervals == reference.normalized_intervals
+
+
+def test_from_pairs():
+    ai = interval.ArrayInterval.from_pairs(
+        [(20, 30), (0, 5), (4, 10), (-3, -1), (40, 60)], shape=50)
+    assert ai.normalized_intervals == ((0, 10), (20, 30), (40, 50))
+    ai = interval.ArrayInterval.from_pairs(np.array([[3, 5], [1, 2]]))
+    assert ai.normalized_intervals == ((1, 2), (3, 5))
+    assert ai.shape is None
+    ai = interval.ArrayInterval.from_pairs([(None, 5)], shape=10)
+    assert ai.normalized_intervals == ((0, 5),)
+    with pytest.raises(ValueError):
+        interval.ArrayInterval.from_pairs([(-3, 5)])
+
+
+def test_from_str():
+    string = ', '.join(f'{i * 10}:{i * 10 + 5}' for i in range(1000))
+    ai = interval.from_str(string, shape=None)
+    assert ai.normalized_intervals == tuple(
+        (i * 10, i * 10 + 5) for i in range(1000))
+    assert interval.from_str('', shape=10).normalized_intervals == ()
+    for invalid in ['1:4, 5', '1:4,,5:6', '1:4:5', '1.5:3', 'a:b']:
+        with pytest.raises(Exception):
+            interval.from_str(invalid, shape=None)
+
+
+def test_n_ary_operations():
+    rng = np.random.RandomState(0)
+    size = 300
+    arrays = [rng.uniform(size=size) < p for p in [0.3, 0.5, 0.7, 0.9, 0.95]]
+    ais = [
+        interval.ArrayInterval(a, inverse_mode=i % 2 == 1)
+        for i, a in enumerate(arrays)
+    ]
+    count = np.sum(arrays, axis=0)
+
+    np.testing.assert_equal(interval.union(*ais)[:], count > 0)
+    np.testing.assert_equal(
+        interval.intersection(*ais)[:], count == len(arrays))
+    for k in range(1, len(arrays) + 2):
+        np.testing.assert_equal(
+            interval.at_least_k_active(ais, k)[:], count >= k)
+
+    intervals, counts = interval.count_active(*ais)
+    reference = np.zeros(size, dtype=np.int64)
+    for (start, stop), c in zip(intervals, counts):
+        reference[start:stop] = c
+    np.testing.assert_equal(reference, count)
+    # The sections are maximal
+    assert np.all(counts > 0)
+    touching = intervals[1:, 0] == intervals[:-1, 1]
+    assert np.all(counts[1:][touching] != counts[:-1][touching])
+
+    np.testing.assert_equal((ais[0] & ais[2])[:], arrays[0] & arrays[2])
+
+
+def test_n_ary_operations_edge_cases():
+    ai = interval.zeros(10)
+    intervals, counts = interval.count_active(ai, ai)
+    assert intervals.shape == (0, 2) and counts.shape == (0,)
+    assert interval.union(ai).normalized_intervals == ()
+    with pytest.raises(ValueError):
+        interval.union(interval.zeros(10), interval.zeros(11))
+    with pytest.raises(ValueError):
+        interval.union(interval.ones(), interval.zeros())
+    with pytest.raises(ValueError):
+        interval.union()
+
+
+def test_track_index():
+    rng = np.random.RandomState(0)
+    size = 300
+    tracks = {
+        f'spk{i}': interval.ArrayInterval(
+            rng.uniform(size=size) < p, inverse_mode=i == 2)
+        for i, p in enumerate([0.1, 0.3, 0.6, 0.0])
+    }
+    index = interval.TrackIndex.from_dict(tracks)
+    arrays = {k: v[:] for k, v in tracks.items()}
+    count = np.sum(list(arrays.values()), axis=0)
+
+    for i in range(-5, size + 5):
+        assert index.active(i) == [
+            k for k, v in arrays.items() if 0 <= i < size and v[i]]
+        assert index.count(i) == (count[i] if 0 <= i < size else 0)
+    for _ in range(200):
+        start, stop = sorted(rng.randint(-5, size + 5, size=2).tolist())
+        assert index.active(start, stop) == [
+            k for k, v in arrays.items()
+            if np.any(v[max(start, 0):max(stop, 0)])
+        ], (start, stop)
+
+    intervals, counts = index.count_active()
+    ref_intervals, ref_counts = interval.count_active(*tracks.values())
+    np.testing.assert_equal(intervals, ref_intervals)
+    np.testing.assert_equal(counts, ref_counts)
+    for k in [1, 2, 3]:
+        np.testing.assert_equal(index.at_least_k_active(k)[:], count >= k)
+    for name, ai in tracks.items():
+        np.testing.assert_equal(index[name][:], ai[:])
+
+
+def test_activity_index_serialize():
+    import pickle
+    activity = {
+        'S01': {
+            'A': interval.from_str('0:10, 20:30', shape=None),
+            'B': interval.from_str('5:25', shape=None),
+        },
+        'S02': {},
+    }
+    index = interval.ActivityIndex.from_dict(activity)
+    for loaded in [
+        interval.ActivityIndex.from_serializable(index.to_serializable()),
+        pickle.loads(pickle.dumps(index)),
+    ]:
+        assert sorted(loaded) == ['S01', 'S02']
+        assert loaded['S01'].active(7) == ['A', 'B']
+        assert loaded['S01'].active(10, 20) == ['B']
+        assert loaded['S02'].active(7) == []
+        assert loaded['S02'].count(7) == 0
+        assert str(loaded['S01'].at_least_k_active(2)) == str(
+            interval.from_str('5:10, 20:25', shape=None))
+
+
+def test_binary_dump_load(tmp_path):
+    import paderbox as pb
+    inverse = interval.ones(20)
+    inverse[5:8] = False
+    activity = {
+        'S01': {
+            'A': interval.from_str('0:10, 20:30', shape=None),
+            'B': interval.from_str('5:25', shape=40),
+            'C': interval.zeros(30),
+        },
+        'S02': {'D': inverse},
+        'S03': {},
+    }
+
+    pb.io.dump(activity, tmp_path / 'activity.intervals')
+    interval.dump_binary(activity, tmp_path / 'activity_copy.intervals')
+    for loaded in [
+        pb.io.load(tmp_path / 'activity.intervals'),
+        interval.load_binary(tmp_path / 'activity_copy.intervals', mmap=False),
+    ]:
+        assert loaded.keys() == activity.keys()
+        for session, tracks in activity.items():
+            assert loaded[session].keys() == tracks.keys()
+            for name, ai in tracks.items():
+                assert repr(loaded[session][name]) == repr(ai)
+                assert loaded[session][name].inverse_mode == ai.inverse_mode
+                if ai.shape is not None:
+                    np.testing.assert_equal(loaded[session][name][:], ai[:])
+
+    loaded = pb.io.load(tmp_path / 'activity.intervals')
+    a = loaded['S01']['A']
+    base = a._buffer
+    while not isinstance(base, np.memmap):
+        base = base.base
+    assert not a._buffer.flags.writeable
+    # Modification copies the memory map
+    a[12:14] = True
+    assert a._buffer.flags.writeable
+    assert str(a) == str(interval.from_str('0:10, 12:14, 20:30', shape=None))
+    assert str(interval.load_binary(tmp_path / 'activity.intervals')) == str(
+        pb.io.load(tmp_path / 'activity_copy.intervals'))
+
+    single = interval.from_str('3:5', shape=10)
+    interval.dump_binary(single, tmp_path / 'single.intervals')
+    assert repr(interval.load_binary(tmp_path / 'single.intervals')) == \
+        repr(single)
+
+    # The human readable string format is still supported
+    pb.io.dump(activity['S01']['A'].to_serializable(), tmp_path / 'a.json')
+    assert str(interval.ArrayInterval.from_serializable(
+        pb.io.load(tmp_path / 'a.json'))) == str(activity['S01']['A'])
+
+    with pytest.raises(TypeError):
+        interval.dump_binary({1: single}, tmp_path / 'invalid.intervals')
+    with pytest.raises(ValueError):
+        interval.load_binary(tmp_path / 'a.json')
@@ -0,0 +1,53 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import paderbox.testing as tc
+from paderbox.io.json_module import dump_json
+from paderbox.testing import benchmark
+
+
+class TestBenchmark(unittest.TestCase):
+    overrides = {
+        'channels': [1],
+        'batch_size': [1],
+        'seconds': [0.1],
+        'iterations': [1],
+        'frames': [100],
+    }
+
+    def test_all_benchmarks_run(self):
+        results = benchmark.run(repeat=1, number=1, overrides=self.overrides)
+        names = {r['name'] for r in results['results'].values()}
+        names |= {k.split('[')[0] for k in results['skipped']}
+        tc.assert_equal(sorted(names), sorted(benchmark.names()))
+        for result in results['results'].values():
+            tc.assert_array_less(0, result['best'])
+
+    def test_compare_json(self):
+        results = benchmark.run(
+            ['stft'], repeat=1, number=1, overrides=self.overrides)
+        slower = {
+            'results': {
+                k: {**v, 'best': v['best'] * 2}
+                for k, v in results['results'].items()
+            }
+        }
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            baseline = Path(tmp_dir) / 'baseline.json'
+            current = Path(tmp_dir) / 'current.json'
+            dump_json(results, baseline)
+            dump_json(slower, current)
+
+            tc.assert_equal(benchmark.compare(baseline, baseline), [])
+            regressions = benchmark.compare(baseline, current, tolerance=0.5)
+            tc.assert_equal(
+                sorted(r['key'] for r in regressions),
+                sorted(results['results'].keys()),
+            )
+            tc.assert_equal(
+                benchmark.compare(baseline, current, tolerance=1.5), [])
+
+    def test_unknown_benchmark(self):
+        with tc.assert_raises(KeyError):
+            benchmark.run(['unknown'])
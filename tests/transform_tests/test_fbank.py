@@ -60,3 +60,179 @@ class TestSTFTMethods(unittest.TestCase):
         tc.assert_almost_equal(
             mels, transform.module_fbank.hz2mel(hz, htk_mel=False),
         )
+
+
+class TestBandedFilterbank(unittest.TestCase):
+    def test_equals_dense(self):
+        from paderbox.transform.module_fbank import BandedFilterbank
+        from paderbox.transform.module_fbank import MelTransform
+        for stft_size in [64, 512, 4096]:
+            for number_of_filters in [10, 40, 80]:
+                for block_size in [1, 3, 8, 100]:
+                    fbanks = MelTransform(
+                        16000, stft_size, number_of_filters).fbanks
+                    banded = BandedFilterbank(fbanks, block_size=block_size)
+                    x = np.random.uniform(size=(3, 20, fbanks.shape[0]))
+                    tc.assert_allclose(banded(x), x @ fbanks, atol=1e-12)
+
+    def test_dtype(self):
+        from paderbox.transform.module_fbank import MelTransform
+        mel_transform = MelTransform(16000, 2048, 40, log=False)
+        x = np.random.uniform(size=(50, 1025)).astype(np.float32)
+        tc.assert_equal(
+            mel_transform.banded_fbanks(x).dtype, (x @ mel_transform.fbanks).dtype)
+
+    def test_mel_transform(self):
+        from paderbox.transform.module_fbank import MelTransform
+        x = np.random.uniform(size=(2, 100, 2049))
+        expected = MelTransform(16000, 4096, 80, banded=False)(x)
+        tc.assert_allclose(
+            MelTransform(16000, 4096, 80, banded=True)(x), expected,
+            rtol=1e-12,
+        )
+        tc.assert_allclose(
+            MelTransform(16000, 4096, 80)(x), expected, rtol=1e-12)
+
+    def test_fbank_caches_filterbank(self):
+        from paderbox.transform.module_fbank import _get_fbanks_cached
+        _get_fbanks_cached.cache_clear()
+        x = np.random.normal(size=16000)
+        a = transform.fbank(x, stft_size=2048, window_length=2048)
+        b = transform.fbank(x, stft_size=2048, window_length=2048)
+        tc.assert_equal(a, b)
+        tc.assert_equal(_get_fbanks_cached.cache_info().hits, 1)
+
+    def test_shared_filterbank_is_read_only(self):
+        from paderbox.transform.module_fbank import MelTransform
+        a = MelTransform(16000, 512, 40)
+        b = MelTransform(16000, 512, 40)
+        self.assertIs(a.fbanks, b.fbanks)
+        with tc.assert_raises(ValueError):
+            a.fbanks[0, 0] = 1
+        self.assertIsNot(MelTransform(16000, 512, 40, eps=1e-6).fbanks, a.fbanks)
+
+    def test_fbank_close_to_dense(self):
+        # fbank uses the banded product for long signals, which matches the
+        # dense product only up to floating point rounding.
+        from paderbox.transform.module_fbank import MelTransform
+        from paderbox.transform.module_filter import \
+            preemphasis_with_offset_compensation
+        from paderbox.transform.module_stft import stft, stft_to_spectrogram
+        import scipy.signal
+        x = np.random.normal(size=16000 * 10)
+        spectrogram = stft_to_spectrogram(stft(
+            preemphasis_with_offset_compensation(x, 0.97),
+            size=512, shift=160, window=scipy.signal.windows.hamming,
+            window_length=400, fading=None,
+        )) / 512
+        dense = MelTransform(
+            16000, 512, 23, lowest_frequency=0, highest_frequency=8000,
+            log=False, banded=False,
+        )(spectrogram)
+        tc.assert_allclose(transform.fbank(x), dense, rtol=1e-12)
+
+
+class TestWarping(unittest.TestCase):
+    @staticmethod
+    def get_warping_fn(cls=None, seed=None):
+        from paderbox.transform.module_fbank import HzWarping
+        from paderbox.utils.random_utils import Uniform
+        cls = HzWarping if cls is None else cls
+        return cls(
+            warp_factor_sampling_fn=Uniform(low=.9, high=1.1),
+            boundary_frequency_ratio_sampling_fn=Uniform(low=.6, high=.7),
+            highest_frequency=8000,
+            seed=seed,
+        )
+
+    def test_seed(self):
+        np.random.seed(1)
+        global_state = np.random.get_state()[1].copy()
+        a = self.get_warping_fn(seed=0).sample((3, 4))
+        b = self.get_warping_fn(seed=0).sample((3, 4))
+        tc.assert_equal(a, b)
+        # The global random state is not touched
+        tc.assert_equal(np.random.get_state()[1], global_state)
+
+        # Same samples as with a seeded global random state
+        np.random.seed(0)
+        tc.assert_equal(self.get_warping_fn().sample((3, 4)), a)
+
+    def test_quantized_equals_continuous(self):
+        from paderbox.transform.module_fbank import MelTransform
+        from paderbox.transform.module_fbank import HzWarping, MelWarping
+        x = np.abs(np.random.normal(size=(4, 2, 50, 257)))
+        for cls in [HzWarping, MelWarping]:
+            for independent_axis in [(0,), (0, 1), (0, 1, 2)]:
+                expected = MelTransform(
+                    16000, 512, 40,
+                    warping_fn=self.get_warping_fn(cls, seed=3),
+                    independent_axis=independent_axis,
+                )(x)
+                actual = MelTransform(
+                    16000, 512, 40,
+                    warping_fn=self.get_warping_fn(cls, seed=3),
+                    independent_axis=independent_axis,
+                    warping_resolution=1e-12,
+                )(x)
+                tc.assert_allclose(actual, expected, rtol=1e-5, atol=1e-6)
+
+    def test_quantized_cache(self):
+        from paderbox.transform.module_fbank import MelTransform
+        x = np.abs(np.random.normal(size=(8, 20, 257)))
+        mel_transform = MelTransform(
+            16000, 512, 40, warping_fn=self.get_warping_fn(seed=0),
+            warping_resolution=0.1,
+        )
+        for _ in range(5):
+            mel_transform(x)
+        info = mel_transform.warping_cache_info()
+        # warp factors in {0.9, 1.0, 1.1}, boundary ratios in {0.6, 0.7}
+        tc.assert_array_less(info.currsize, 7)
+        tc.assert_array_less(info.currsize, info.hits)
+
+        mel_transform = MelTransform(
+            16000, 512, 40, warping_fn=self.get_warping_fn(seed=0),
+            warping_resolution=1e-6, warping_cache_size=2,
+        )
+        mel_transform(x)
+        tc.assert_equal(mel_transform.warping_cache_info().currsize, 2)
+
+    def test_pickle(self):
+        import pickle
+        from paderbox.transform.module_fbank import MelTransform
+        x = np.abs(np.random.normal(size=(8, 20, 257)))
+        for warping_resolution in [None, 0.1]:
+            mel_transform = MelTransform(
+                16000, 512, 40, warping_fn=self.get_warping_fn(seed=0),
+                warping_resolution=warping_resolution,
+            )
+            mel_transform(x)
+            loaded = pickle.loads(pickle.dumps(mel_transform))
+            tc.assert_equal(loaded(x), mel_transform(x))
+            tc.assert_equal(loaded(x), mel_transform(x))
+
+    def test_unpickle_old_version(self):
+        import pickle
+        from paderbox.transform.module_fbank import MelTransform
+        x = np.abs(np.random.normal(size=(8, 20, 257)))
+        for warping_fn in [None, self.get_warping_fn(seed=0)]:
+            mel_transform = MelTransform(16000, 512, 40, warping_fn=warping_fn)
+            expected = MelTransform(16000, 512, 40, warping_fn=warping_fn)
+            # Attributes that an older version of MelTransform did not have.
+            for key in [
+                    'banded', 'warping_resolution', 'warping_cache_size',
+                    '_warped_fbanks_cache',
+            ]:
+                del mel_transform.__dict__[key]
+            loaded = pickle.loads(pickle.dumps(mel_transform))
+            tc.assert_equal(loaded.warping_resolution, None)
+            tc.assert_equal(loaded(x), expected(x))
+
+    def test_quantized_requires_hz_warping(self):
+        from paderbox.transform.module_fbank import MelTransform
+        with tc.assert_raises(AssertionError):
+            MelTransform(
+                16000, 512, 40, warping_fn=lambda f, size: f,
+                warping_resolution=0.1,
+            )
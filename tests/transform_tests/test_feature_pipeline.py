@@ -0,0 +1,94 @@
+import unittest
+
+import numpy as np
+
+import paderbox.testing as tc
+from paderbox.transform import FeaturePipeline
+from paderbox.transform.module_fbank import fbank, logfbank
+from paderbox.transform.module_filter import preemphasis_with_offset_compensation
+from paderbox.transform.module_mfcc import mfcc, delta
+from paderbox.transform.module_mfcc import mfcc_velocity_acceleration
+from paderbox.transform.module_stft import stft, spectrogram
+
+
+class TestFeaturePipeline(unittest.TestCase):
+    def check_pipeline(self, x, **kwargs):
+        pipeline = FeaturePipeline(
+            outputs=FeaturePipeline._features, **kwargs)
+        features = pipeline(x)
+
+        fbank_kwargs = dict(
+            sample_rate=pipeline.sample_rate,
+            window_length=pipeline.window_length,
+            stft_shift=pipeline.stft_shift,
+            number_of_filters=pipeline.number_of_filters,
+            stft_size=pipeline.stft_size,
+            lowest_frequency=pipeline.lowest_frequency,
+            highest_frequency=pipeline.highest_frequency,
+            preemphasis_factor=pipeline.preemphasis_factor,
+            window=pipeline.window,
+        )
+        stft_kwargs = dict(
+            size=pipeline.stft_size,
+            shift=pipeline.stft_shift,
+            window=pipeline.window,
+            window_length=pipeline.window_length,
+            fading=None,
+        )
+        x_preemphasis = preemphasis_with_offset_compensation(
+            x, pipeline.preemphasis_factor)
+        mfcc_signal = mfcc(
+            x, numcep=pipeline.numcep, ceplifter=pipeline.ceplifter,
+            **fbank_kwargs,
+        )
+
+        tc.assert_equal(features['stft'], stft(x_preemphasis, **stft_kwargs))
+        tc.assert_equal(
+            features['spectrogram'], spectrogram(x_preemphasis, **stft_kwargs))
+        tc.assert_equal(features['fbank'], fbank(x, **fbank_kwargs))
+        tc.assert_equal(features['logfbank'], logfbank(x, **fbank_kwargs))
+        tc.assert_equal(features['mfcc'], mfcc_signal)
+        tc.assert_allclose(
+            features['mfcc_delta'], delta(mfcc_signal, order=1), atol=1e-10)
+        tc.assert_allclose(
+            features['mfcc_delta_delta'], delta(mfcc_signal, order=2),
+            atol=1e-10)
+
+    def test_default(self):
+        self.check_pipeline(np.random.normal(size=16000))
+
+    def test_multichannel(self):
+        self.check_pipeline(np.random.normal(size=(3, 8000)))
+
+    def test_parameters(self):
+        self.check_pipeline(
+            np.random.normal(size=8000),
+            sample_rate=8000, number_of_filters=26, stft_size=256,
+            window_length=200, stft_shift=80, lowest_frequency=100,
+            highest_frequency=3800, numcep=20, ceplifter=0,
+        )
+
+    def test_mfcc_velocity_acceleration(self):
+        x = np.random.normal(size=16000)
+        features = FeaturePipeline(
+            outputs=['mfcc', 'mfcc_delta', 'mfcc_delta_delta'],
+            number_of_filters=26,
+        )(x)
+        tc.assert_equal(
+            np.concatenate(list(features.values()), axis=1),
+            mfcc_velocity_acceleration(x),
+        )
+
+    def test_pickle(self):
+        import pickle
+        x = np.random.normal(size=16000)
+        pipeline = FeaturePipeline()
+        expected = pipeline(x)
+        features = pickle.loads(pickle.dumps(pipeline))(x)
+        tc.assert_equal(features.keys(), expected.keys())
+        for key in expected:
+            tc.assert_equal(features[key], expected[key])
+
+    def test_unknown_output(self):
+        with tc.assert_raises(ValueError):
+            FeaturePipeline(outputs=['mfcc', 'unknown'])
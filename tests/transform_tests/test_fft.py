@@ -0,0 +1,102 @@
+import unittest
+
+import numpy as np
+
+import paderbox.testing as tc
+from paderbox.transform.module_fft import NumpyFFT
+from paderbox.transform.module_fft import PyFFTW
+from paderbox.transform.module_fft import ScipyFFT
+from paderbox.transform.module_fft import get_fft_backend
+from paderbox.transform.module_fft import use_fft_backend
+from paderbox.transform.module_stft import STFT
+from paderbox.transform.module_stft import istft
+from paderbox.transform.module_stft import stft
+
+
+def _has_pyfftw():
+    try:
+        import pyfftw
+    except ImportError:
+        return False
+    return True
+
+
+class TestFFTBackend(unittest.TestCase):
+    backends = [
+        NumpyFFT(),
+        ScipyFFT(),
+        ScipyFFT(workers=2),
+        ScipyFFT(workers=-1),
+        'numpy',
+        'scipy',
+    ]
+
+    def setUp(self):
+        self.x = np.random.normal(size=(3, 4000))
+
+    def check_backend(self, fft_backend):
+        for kwargs in [
+            dict(size=512, shift=128),
+            dict(size=512, shift=160, window_length=400),
+            dict(size=151, shift=50),
+        ]:
+            X_ref = stft(self.x, **kwargs)
+            X = stft(self.x, fft_backend=fft_backend, **kwargs)
+            tc.assert_allclose(X, X_ref, rtol=1e-10, atol=1e-10)
+
+            x_ref = istft(X_ref, **kwargs)
+            x_hat = istft(X_ref, fft_backend=fft_backend, **kwargs)
+            tc.assert_allclose(x_hat, x_ref, rtol=1e-10, atol=1e-10)
+
+    def test_backends(self):
+        for fft_backend in self.backends:
+            with self.subTest(fft_backend=fft_backend):
+                self.check_backend(fft_backend)
+
+    @unittest.skipUnless(_has_pyfftw(), 'pyfftw is not installed')
+    def test_pyfftw(self):
+        self.check_backend(PyFFTW())
+        self.check_backend(PyFFTW(threads=2))
+        self.check_backend('pyfftw')
+
+    def test_single_precision(self):
+        X_ref = stft(self.x, 512, 128)
+        for fft_backend in self.backends:
+            X = stft(self.x, 512, 128, dtype=np.float32,
+                     fft_backend=fft_backend)
+            tc.assert_equal(X.dtype, np.complex64)
+            tc.assert_allclose(X, X_ref, rtol=1e-4, atol=1e-4)
+            x_hat = istft(X, 512, 128, dtype=np.float32,
+                          fft_backend=fft_backend)
+            tc.assert_equal(x_hat.dtype, np.float32)
+
+    def test_context_manager(self):
+        self.assertEqual(get_fft_backend(), NumpyFFT())
+        with use_fft_backend(ScipyFFT(workers=2)):
+            self.assertEqual(get_fft_backend(), ScipyFFT(workers=2))
+            # An explicit backend has priority
+            self.assertEqual(get_fft_backend('numpy'), NumpyFFT())
+            tc.assert_allclose(
+                stft(self.x, 512, 128), stft(self.x, 512, 128,
+                                             fft_backend='numpy'))
+        self.assertEqual(get_fft_backend(), NumpyFFT())
+
+    def test_stft_class(self):
+        stft_ = STFT(size=512, shift=128, fft_backend=ScipyFFT(workers=2))
+        X = stft_(self.x)
+        tc.assert_allclose(X, stft(self.x, 512, 128))
+        tc.assert_allclose(stft_.inverse(X), istft(X, 512, 128))
+
+        inverse_stream = stft_.inverse_stream()
+        tc.assert_allclose(
+            np.concatenate([inverse_stream(X[..., :10, :]),
+                            inverse_stream(X[..., 10:, :]),
+                            inverse_stream.flush()], axis=-1),
+            stft_.inverse(X),
+        )
+
+    def test_invalid_backend(self):
+        with self.assertRaises(KeyError):
+            get_fft_backend('fftw')
+        with self.assertRaises(TypeError):
+            get_fft_backend(np.fft)
@@ -1,5 +1,7 @@
 import unittest
 
+import numpy as np
+
 from paderbox.io import load_audio
 # from scipy import signal
 
@@ -43,3 +45,70 @@ class TestSTFTMethods(unittest.TestCase):
         y_both = transform.preemphasis_with_offset_compensation(y)
 
         tc.assert_almost_equal(y_ref, y_both)
+
+
+class TestFilterStreams(unittest.TestCase):
+    streams = [
+        (transform.preemphasis, transform.PreemphasisStream, (0.97,)),
+        (transform.inverse_preemphasis, transform.InversePreemphasisStream,
+         (0.97,)),
+        (transform.offset_compensation, transform.OffsetCompensationStream,
+         ()),
+        (transform.preemphasis_with_offset_compensation,
+         transform.PreemphasisWithOffsetCompensationStream, (0.97,)),
+    ]
+
+    def test_matches_whole_signal(self):
+        x = np.random.normal(size=(3, 2, 4000))
+        for function, stream_cls, args in self.streams:
+            for dtype in [np.float64, np.float32]:
+                x_ = x.astype(dtype)
+                stream = stream_cls(*args)
+                chunks = np.split(x_, [0, 1, 160, 161, 400, 3999], axis=-1)
+                y = np.concatenate([stream(c) for c in chunks], axis=-1)
+                tc.assert_equal(y, function(x_, *args))
+
+                # reset starts a new signal
+                stream.reset()
+                tc.assert_equal(
+                    stream(x_[..., :100]), function(x_, *args)[..., :100])
+
+    def test_out(self):
+        x = np.random.normal(size=(2, 1000))
+        for function, stream_cls, args in self.streams:
+            stream = stream_cls(*args)
+            buffer = np.empty((2, 250))
+            y = []
+            for chunk in np.split(x, 4, axis=-1):
+                tc.assert_equal(stream(chunk, out=buffer) is buffer, True)
+                y.append(buffer.copy())
+            tc.assert_equal(np.concatenate(y, axis=-1), function(x, *args))
+
+            # inplace
+            stream.reset()
+            x_inplace = x.copy()
+            for chunk in np.split(x_inplace, 4, axis=-1):
+                stream(chunk, out=chunk)
+            tc.assert_equal(x_inplace, function(x, *args))
+
+            # blocks inside of a chunk
+            stream.reset()
+            stream.block_size = 7
+            x_inplace = x.copy()
+            for chunk in np.split(x_inplace, [0, 3, 500], axis=-1):
+                stream(chunk, out=chunk)
+            tc.assert_equal(x_inplace, function(x, *args))
+
+    def test_out_peak_memory(self):
+        import tracemalloc
+        x = np.random.normal(size=(8, 16000 * 60))
+        for _, stream_cls, args in self.streams:
+            stream = stream_cls(*args)
+            tracemalloc.start()
+            try:
+                stream(x, out=x)
+                _, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            # Only one block is allocated at a time and not the whole result.
+            tc.assert_array_less(peak, x.nbytes / 50)
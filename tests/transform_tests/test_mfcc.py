@@ -1,11 +1,14 @@
 import unittest
 
+import numpy as np
+
 from paderbox.io import load_audio
 # from scipy import signal
 
 import paderbox.testing as tc
 from paderbox.testing.testfile_fetcher import get_file_path
 import paderbox.transform as transform
+from paderbox.transform.module_mfcc import delta, DeltaStream
 # from pymatbridge import Matlab
 
 
@@ -19,3 +22,77 @@ class TestSTFTMethods(unittest.TestCase):
 
         tc.assert_equal(y_filtered.shape, (291, 13))
         tc.assert_isreal(y_filtered)
+
+
+class TestDeltas(unittest.TestCase):
+    shapes = [(1,), (7,), (30,), (100, 13), (3, 40, 5)]
+
+    def test_equals_delta(self):
+        for shape in self.shapes:
+            x = np.random.normal(size=shape)
+            for width in [3, 5, 9]:
+                for axis in range(-x.ndim, x.ndim):
+                    actual = transform.deltas(
+                        x, width=width, orders=(0, 1, 2, 3), axis=axis)
+                    tc.assert_equal(actual.shape, (4, *shape))
+                    tc.assert_equal(actual[0], x)
+                    for i, order in enumerate([1, 2, 3], start=1):
+                        tc.assert_allclose(
+                            actual[i],
+                            delta(x, width=width, order=order, axis=axis),
+                            atol=1e-12,
+                        )
+
+    def test_invalid_arguments(self):
+        x = np.random.normal(size=10)
+        for kwargs in [
+            dict(width=4), dict(width=1), dict(orders=()),
+            dict(orders=(-1,)), dict(orders=(1.5,)),
+        ]:
+            with tc.assert_raises(ValueError):
+                transform.deltas(x, **kwargs)
+
+    def test_mfcc_velocity_acceleration(self):
+        x = np.random.normal(size=8000)
+        mfcc = transform.mfcc(x)
+        tc.assert_allclose(
+            transform.mfcc_velocity_acceleration(x),
+            np.concatenate(
+                [mfcc, delta(mfcc, order=1), delta(mfcc, order=2)], axis=1),
+            atol=1e-12,
+        )
+
+
+class TestDeltaStream(unittest.TestCase):
+    def test_stream(self):
+        for shape in TestDeltas.shapes:
+            x = np.random.normal(size=shape)
+            for axis in range(-x.ndim, x.ndim):
+                frames = x.shape[axis]
+                stream = DeltaStream(orders=(0, 1, 2), axis=axis)
+                for _ in range(2):  # flush resets the stream
+                    chunks = np.sort(np.random.randint(0, frames + 1, size=3))
+                    actual = np.concatenate(
+                        [stream(c) for c in np.split(x, chunks, axis=axis)]
+                        + [stream.flush()],
+                        axis=axis % x.ndim + 1,
+                    )
+                    tc.assert_allclose(
+                        actual,
+                        transform.deltas(x, orders=(0, 1, 2), axis=axis),
+                        atol=1e-12,
+                    )
+
+    def test_latency(self):
+        # The delta of a frame is returned width // 2 frames later.
+        stream = DeltaStream(width=5, orders=(1,), axis=0)
+        x = np.random.normal(size=(20, 3))
+        tc.assert_equal(
+            [stream(frame[None]).shape[1] for frame in x],
+            [0, 0] + [1] * 18,
+        )
+        tc.assert_equal(stream.flush().shape, (1, 2, 3))
+
+    def test_flush_without_frames(self):
+        with tc.assert_raises(ValueError):
+            DeltaStream().flush()
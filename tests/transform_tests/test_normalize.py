@@ -0,0 +1,159 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import paderbox as pb
+import paderbox.testing as tc
+from paderbox.transform.module_normalize import (
+    normalize_mean_variance,
+    MeanVarianceStatistics,
+    GroupedMeanVarianceStatistics,
+)
+
+
+def _utterances(lengths=(120, 7, 300, 1, 55), features=13, seed=0):
+    r = np.random.RandomState(seed)
+    return [
+        r.normal(loc=3, scale=2, size=(length, features))
+        for length in lengths
+    ]
+
+
+class TestMeanVarianceStatistics(unittest.TestCase):
+    def test_matches_concatenated(self):
+        utterances = _utterances()
+        data = np.concatenate(utterances)
+        stats = MeanVarianceStatistics()
+        for utterance in utterances:
+            stats.update(utterance)
+
+        tc.assert_equal(stats.count, len(data))
+        tc.assert_allclose(stats.mean[0], np.mean(data, axis=0), rtol=1e-12)
+        tc.assert_allclose(stats.variance[0], np.var(data, axis=0), rtol=1e-12)
+        tc.assert_allclose(
+            stats.normalize(data), normalize_mean_variance(data), atol=1e-10)
+
+    def test_axis(self):
+        utterances = [
+            np.random.normal(size=(2, 13, length)) for length in [10, 20, 5]]
+        data = np.concatenate(utterances, axis=-1)
+        stats = MeanVarianceStatistics(axis=(0, -1))
+        for utterance in utterances:
+            stats.update(utterance)
+        tc.assert_equal(stats.mean.shape, (1, 13, 1))
+        tc.assert_allclose(
+            stats.normalize(data),
+            normalize_mean_variance(data, axis=(0, -1)),
+            atol=1e-10,
+        )
+
+    def test_merge(self):
+        utterances = _utterances()
+        stats = MeanVarianceStatistics()
+        for utterance in utterances:
+            stats.update(utterance)
+
+        # e.g. one statistic per worker
+        stats_a = MeanVarianceStatistics()
+        stats_b = MeanVarianceStatistics()
+        for utterance in utterances[:2]:
+            stats_a.update(utterance)
+        for utterance in utterances[2:]:
+            stats_b.update(utterance)
+        merged = stats_a + stats_b
+
+        tc.assert_equal(merged.count, stats.count)
+        tc.assert_allclose(merged.mean, stats.mean, rtol=1e-12)
+        tc.assert_allclose(merged.m2, stats.m2, rtol=1e-12)
+        # `+` does not modify the operands
+        tc.assert_equal(stats_a.count, 127)
+
+        empty = MeanVarianceStatistics()
+        tc.assert_equal((empty + stats).mean, stats.mean)
+        tc.assert_equal((stats + empty).mean, stats.mean)
+
+    def test_float32(self):
+        utterances = [u.astype(np.float32) for u in _utterances()]
+        data = np.concatenate(utterances).astype(np.float64)
+        stats = MeanVarianceStatistics(dtype=np.float32)
+        for utterance in utterances:
+            stats.update(utterance)
+        tc.assert_equal(stats.dtype, 'float32')
+        tc.assert_equal(stats.mean.dtype, np.float32)
+        tc.assert_equal(stats.normalize(utterances[0]).dtype, np.float32)
+        tc.assert_allclose(
+            stats.normalize(data), normalize_mean_variance(data), atol=1e-5)
+
+    def test_serialize(self):
+        stats = MeanVarianceStatistics()
+        for utterance in _utterances():
+            stats.update(utterance)
+
+        for suffix in ['.json', '.yaml', '.pkl']:
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                file = Path(tmp_dir) / f'stats{suffix}'
+                pb.io.dump(stats.to_serializable(), file, unsafe=True)
+                loaded = MeanVarianceStatistics.from_serializable(
+                    pb.io.load(file, unsafe=True))
+            tc.assert_equal(loaded.count, stats.count)
+            tc.assert_equal(loaded.mean, stats.mean)
+            tc.assert_equal(loaded.m2, stats.m2)
+
+    def test_errors(self):
+        with tc.assert_raises(ValueError):
+            MeanVarianceStatistics().normalize(np.zeros((3, 2)))
+        stats = MeanVarianceStatistics().update(np.zeros((3, 2)))
+        with tc.assert_raises(ValueError):
+            stats.update(np.zeros((3, 4)))
+        with tc.assert_raises(ValueError):
+            stats.merge(MeanVarianceStatistics(axis=1))
+
+
+class TestGroupedMeanVarianceStatistics(unittest.TestCase):
+    def test_speaker_and_global(self):
+        utterances = _utterances()
+        speakers = ['a', 'b', 'a', 'c', 'b']
+        stats = GroupedMeanVarianceStatistics()
+        for speaker, utterance in zip(speakers, utterances):
+            stats.update(speaker, utterance)
+
+        for speaker in ['a', 'b', 'c']:
+            data = np.concatenate([
+                u for s, u in zip(speakers, utterances) if s == speaker])
+            tc.assert_allclose(
+                stats.normalize(data, speaker),
+                normalize_mean_variance(data),
+                atol=1e-10,
+            )
+
+        data = np.concatenate(utterances)
+        tc.assert_allclose(
+            stats.normalize(data), normalize_mean_variance(data), atol=1e-10)
+
+    def test_merge_and_serialize(self):
+        utterances = _utterances()
+        speakers = ['a', 'b', 'a', 'c', 'b']
+        stats = GroupedMeanVarianceStatistics(dtype='float32')
+        stats_a = GroupedMeanVarianceStatistics(dtype='float32')
+        stats_b = GroupedMeanVarianceStatistics(dtype='float32')
+        for i, (speaker, utterance) in enumerate(zip(speakers, utterances)):
+            stats.update(speaker, utterance)
+            (stats_a if i % 2 else stats_b).update(speaker, utterance)
+        merged = stats_a + stats_b
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            file = Path(tmp_dir) / 'stats.json'
+            pb.io.dump(merged.to_serializable(), file)
+            loaded = GroupedMeanVarianceStatistics.from_serializable(
+                pb.io.load(file))
+
+        tc.assert_equal(sorted(loaded.statistics), ['a', 'b', 'c'])
+        for speaker in ['a', 'b', 'c']:
+            tc.assert_equal(loaded[speaker].count, stats[speaker].count)
+            tc.assert_equal(loaded[speaker].mean.dtype, np.float32)
+            tc.assert_allclose(
+                loaded[speaker].mean, stats[speaker].mean, rtol=1e-5)
+            tc.assert_allclose(
+                loaded[speaker].variance, stats[speaker].variance, rtol=1e-4)
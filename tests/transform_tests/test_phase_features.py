@@ -0,0 +1,81 @@
+import unittest
+from copy import deepcopy
+
+import numpy as np
+
+import paderbox.math.directional as directional
+import paderbox.testing as tc
+from paderbox.transform.module_phase_features import get_phase_features
+from paderbox.transform.module_phase_features import transform_to_baseband
+
+
+def transform_to_baseband_loop(X, size, shift):
+    X = deepcopy(X)
+    T, _, F = X.shape
+    for t in range(T):
+        for f in range(F):
+            X[t, :, f] *= np.exp(-2j * np.pi * t * f * shift / size)
+    return X
+
+
+def get_phase_features_reference(X, size, shift):
+    phase = np.angle(transform_to_baseband_loop(X, size, shift))
+    delta = np.zeros_like(phase)
+    delta[1:, ...] = directional.minus(phase[1:, ...], phase[:-1, ...])
+    delta_delta = np.zeros_like(phase)
+    delta_delta[1:, ...] = delta[1:, ...] - delta[:-1, ...]
+    return phase, delta, delta_delta
+
+
+def random_stft(shape, dtype=np.complex128):
+    return (
+        np.random.normal(size=shape) + 1j * np.random.normal(size=shape)
+    ).astype(dtype)
+
+
+class TestTransformToBaseband(unittest.TestCase):
+    def test_loop_reference(self):
+        for size, shift in [(512, 128), (512, 160), (64, 64), (30, 7)]:
+            X = random_stft((50, 3, size // 2 + 1))
+            tc.assert_allclose(
+                transform_to_baseband(X, size, shift),
+                transform_to_baseband_loop(X, size, shift),
+                atol=1e-10,
+            )
+
+    def test_inplace(self):
+        X = random_stft((20, 2, 33))
+        expected = transform_to_baseband(X, 64, 16)
+        actual = transform_to_baseband(X, 64, 16, inplace=True)
+        assert actual is X
+        tc.assert_equal(actual, expected)
+
+    def test_dtype_and_shape(self):
+        X = random_stft((20, 33), np.complex64)
+        actual = transform_to_baseband(X, 64, 16)
+        tc.assert_equal(actual.dtype, np.complex64)
+        tc.assert_allclose(
+            actual,
+            transform_to_baseband_loop(X[:, None, :], 64, 16)[:, 0, :],
+            atol=1e-5,
+        )
+        # Real input is converted to complex
+        tc.assert_equal(
+            transform_to_baseband(np.ones((4, 1, 3)), 8, 2).dtype,
+            np.complex128,
+        )
+
+
+class TestPhaseFeatures(unittest.TestCase):
+    def test_reference(self):
+        X = random_stft((40, 2, 65))
+        for actual, expected in zip(
+                get_phase_features(X, 128, 32),
+                get_phase_features_reference(X, 128, 32),
+        ):
+            tc.assert_allclose(actual, expected, atol=1e-10)
+
+    def test_wrapped(self):
+        X = random_stft((40, 2, 65))
+        _, delta, _ = get_phase_features(X, 128, 32)
+        tc.assert_array_less(np.abs(delta), np.pi + 1e-12)
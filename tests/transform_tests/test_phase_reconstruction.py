@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+import paderbox.testing as tc
+from paderbox.transform.module_phase_reconstruction import GriffinLim
+from paderbox.transform.module_phase_reconstruction import _griffin_lim_step
+from paderbox.transform.module_stft import STFT
+
+
+class TestGriffinLim(unittest.TestCase):
+    def reference(self, x, stft, init_phase, alpha, iterations):
+        reconstruction = x * np.exp(1j * init_phase)
+        y = reconstruction
+        for _ in range(iterations):
+            new, audio = _griffin_lim_step(x, y, stft)
+            y = new + alpha * (new - reconstruction)
+            reconstruction = new
+        return audio
+
+    def check_reference(self, stft, alpha, shape=(2, 3, 4000)):
+        x = np.abs(stft(np.random.normal(size=shape)))
+        init_phase = np.random.uniform(-np.pi, np.pi, size=x.shape)
+        audio = GriffinLim(stft, 5, alpha=alpha)(x, init_phase=init_phase)
+        tc.assert_allclose(
+            audio, self.reference(x, stft, init_phase, alpha, 5), atol=1e-10)
+
+    def test_reference(self):
+        for fading in [None, False, 'half', 'full']:
+            for alpha in [0, 0.99]:
+                with self.subTest(fading=fading, alpha=alpha):
+                    self.check_reference(
+                        STFT(160, 512, window_length=400, fading=fading),
+                        alpha,
+                    )
+
+    def test_reference_single_item(self):
+        self.check_reference(STFT(128, 256), 0.5, shape=(3000,))
+
+    def test_float32(self):
+        stft = STFT(128, 512)
+        x = np.abs(stft(np.random.normal(size=(2, 4000))))
+        init_phase = np.random.uniform(-np.pi, np.pi, size=x.shape)
+        gla = GriffinLim(stft, 10, alpha=0.99, dtype=np.float32)
+        audio = gla(x, init_phase=init_phase)
+        tc.assert_equal(audio.dtype, np.float32)
+        tc.assert_allclose(
+            audio,
+            GriffinLim(stft, 10, alpha=0.99)(x, init_phase=init_phase),
+            atol=1e-3,
+        )
+
+    def test_early_stopping(self):
+        stft = STFT(128, 512)
+        signal = np.random.normal(size=(4, 4000))
+        x = np.abs(stft(signal))
+        # The second item has the true phase and converges immediately.
+        init_phase = np.random.uniform(-np.pi, np.pi, size=x.shape)
+        init_phase[1] = np.angle(stft(signal[1]))
+
+        gla = GriffinLim(stft, 20, tolerance=1e-6)
+        audio, info = gla(x, init_phase=init_phase, return_info=True)
+        tc.assert_equal(info['iterations'], [20, 1, 20, 20])
+        tc.assert_array_less(info['spectral_convergence'][1], 1e-6)
+        tc.assert_allclose(audio[1, :4000], signal[1], atol=1e-10)
+
+        # Without the converged item the result is unchanged.
+        audio_ = GriffinLim(stft, 20)(
+            x[[0, 2, 3]], init_phase=init_phase[[0, 2, 3]])
+        tc.assert_allclose(audio[[0, 2, 3]], audio_, atol=1e-10)
+
+    def test_convergence(self):
+        stft = STFT(128, 512)
+        x = np.abs(stft(np.random.normal(size=(3, 4000))))
+        init_phase = np.random.uniform(-np.pi, np.pi, size=x.shape)
+        _, info_5 = GriffinLim(stft, 5, alpha=0.99)(
+            x, init_phase=init_phase, return_info=True)
+        _, info_50 = GriffinLim(stft, 50, alpha=0.99)(
+            x, init_phase=init_phase, return_info=True)
+        tc.assert_array_less(
+            info_50['spectral_convergence'], info_5['spectral_convergence'])
+
+    def test_invalid_alpha(self):
+        with tc.assert_raises(ValueError):
+            GriffinLim(STFT(128, 512), alpha=1.5)
@@ -0,0 +1,228 @@
+import itertools
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+import paderbox.testing as tc
+from paderbox.io import dump_audio, load_audio
+from paderbox.transform.module_resample import PolyphaseResampler
+from paderbox.transform.module_resample import resample_batch
+from paderbox.transform.module_resample import resample_files
+from paderbox.transform.module_resample import resample_polyphase
+from paderbox.transform.module_resample import resample_sox
+
+
+def snr(estimate, reference):
+    return 10 * np.log10(
+        np.sum(reference ** 2) / np.sum((estimate - reference) ** 2))
+
+
+rate_pairs = [
+    (16000, 8000), (8000, 16000), (44100, 16000), (16000, 44100),
+    (48000, 16000), (8000, 11025),
+]
+
+
+class TestPolyphaseResampler(unittest.TestCase):
+    def test_sox_reference_values(self):
+        # Output of sox v14.4.2, see the doctest of resample_sox.
+        signal = np.array([1, -1, 1, -1], dtype=np.float32)
+        tc.assert_allclose(
+            resample_polyphase(signal, in_rate=2, out_rate=1),
+            [0.28615332, -0.13513082],
+            atol=1e-5,
+        )
+
+    @unittest.skipIf(shutil.which('sox') is None, 'sox is not installed')
+    def test_close_to_sox(self):
+        for in_rate, out_rate in rate_pairs:
+            with self.subTest(in_rate=in_rate, out_rate=out_rate):
+                # Small amplitude, because sox clips the output at +-1.
+                signal = np.random.uniform(-0.3, 0.3, size=(2, 20000))
+                expected = resample_sox(
+                    signal, in_rate=in_rate, out_rate=out_rate,
+                    normalize=False,
+                )
+                actual = resample_polyphase(
+                    signal, in_rate=in_rate, out_rate=out_rate)
+                tc.assert_equal(actual.shape, expected.shape)
+                tc.assert_array_less(50, snr(actual, expected))
+
+    def test_num_samples(self):
+        # sox rounds half up
+        for (in_rate, out_rate, samples), expected in {
+            (2, 1, 4): 2,
+            (16000, 8000, 5): 3,
+            (8000, 16000, 7): 14,
+            (44100, 16000, 7): 3,
+            (44100, 16000, 101): 37,
+        }.items():
+            resampler = PolyphaseResampler(in_rate, out_rate)
+            tc.assert_equal(resampler.num_samples(samples), expected)
+            tc.assert_equal(
+                resampler(np.ones(samples)).shape, (expected,))
+
+    def test_passband_and_stopband(self):
+        t = np.arange(16000) / 16000
+        for quality, rejection in [('sox', 120), ('low', 75)]:
+            resampler = PolyphaseResampler(16000, 8000, quality)
+            passband = resampler(np.sin(2 * np.pi * 1000 * t))[1000:-1000]
+            tc.assert_allclose(np.max(np.abs(passband)), 1, atol=1e-3)
+            stopband = resampler(np.sin(2 * np.pi * 4500 * t))[1000:-1000]
+            tc.assert_array_less(
+                20 * np.log10(np.max(np.abs(stopband))), -rejection)
+
+    def test_dtype(self):
+        signal = np.random.normal(size=(3, 1000))
+        resampler = PolyphaseResampler(16000, 8000)
+        actual = resampler(signal.astype(np.float32))
+        tc.assert_equal(actual.dtype, np.float32)
+        tc.assert_allclose(actual, resampler(signal), atol=1e-5)
+        tc.assert_equal(
+            resampler(np.ones(100, dtype=np.int16)).dtype, np.float64)
+
+    def test_multichannel(self):
+        signal = np.random.normal(size=(2, 3, 1000))
+        resampler = PolyphaseResampler(8000, 11025)
+        actual = resampler(signal)
+        for index in np.ndindex(2, 3):
+            tc.assert_allclose(actual[index], resampler(signal[index]))
+
+    def test_same_rate(self):
+        signal = np.random.normal(size=100)
+        tc.assert_equal(PolyphaseResampler(16000, 16000)(signal), signal)
+
+    def test_unknown_quality(self):
+        with tc.assert_raises(ValueError):
+            PolyphaseResampler(16000, 8000, quality='unknown')
+
+
+class TestResampleStream(unittest.TestCase):
+    def check_stream(self, resampler, signal, chunks):
+        stream = resampler.stream()
+        actual = np.concatenate(
+            [stream(chunk) for chunk in np.split(signal, chunks, axis=-1)]
+            + [stream.flush()],
+            axis=-1,
+        )
+        tc.assert_allclose(actual, resampler(signal), atol=1e-12)
+
+    def test_stream(self):
+        for in_rate, out_rate in rate_pairs + [(16000, 16000)]:
+            resampler = PolyphaseResampler(in_rate, out_rate)
+            for samples in [0, 1, 7, 100, 3000]:
+                with self.subTest(
+                        in_rate=in_rate, out_rate=out_rate, samples=samples):
+                    chunks = np.sort(
+                        np.random.randint(0, samples + 1, size=4))
+                    self.check_stream(
+                        resampler, np.random.normal(size=(2, samples)),
+                        chunks,
+                    )
+
+    def test_sample_by_sample(self):
+        self.check_stream(
+            PolyphaseResampler(8000, 11025), np.random.normal(size=300),
+            np.arange(1, 300),
+        )
+
+    def test_reuse(self):
+        resampler = PolyphaseResampler(16000, 8000)
+        stream = resampler.stream()
+        for _ in range(2):
+            signal = np.random.normal(size=1000)
+            actual = np.concatenate([stream(signal), stream.flush()])
+            tc.assert_allclose(actual, resampler(signal), atol=1e-12)
+
+
+class TestResampleBatch(unittest.TestCase):
+    def test_order(self):
+        signals = [np.random.normal(size=(2, 100 * i)) for i in range(1, 8)]
+        resampler = PolyphaseResampler(16000, 8000)
+        for max_workers, chunksize in [(0, 1), (2, 1), (2, 3)]:
+            actual = list(resample_batch(
+                signals, in_rate=16000, out_rate=8000,
+                max_workers=max_workers, chunksize=chunksize,
+            ))
+            tc.assert_equal(len(actual), len(signals))
+            for a, signal in zip(actual, signals):
+                tc.assert_allclose(a, resampler(signal))
+
+    def test_lazy(self):
+        # An infinite iterator works, because the input is consumed lazily.
+        signals = itertools.repeat(np.ones(160))
+        actual = list(itertools.islice(resample_batch(
+            signals, in_rate=16000, out_rate=8000, max_workers=2,
+        ), 5))
+        tc.assert_equal([a.shape for a in actual], [(80,)] * 5)
+
+    def test_files(self):
+        signal = np.random.uniform(-0.5, 0.5, size=(2, 8000))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+            dump_audio(signal, tmp_dir / 'a.wav', normalize=False,
+                       sample_rate=8000)
+            actual = list(resample_batch(
+                [tmp_dir / 'a.wav'], out_rate=16000, max_workers=0))
+            tc.assert_allclose(
+                actual[0],
+                resample_polyphase(
+                    load_audio(tmp_dir / 'a.wav'), in_rate=8000,
+                    out_rate=16000,
+                ),
+            )
+            with tc.assert_raises(ValueError):
+                list(resample_batch(
+                    [tmp_dir / 'a.wav'], in_rate=16000, out_rate=8000,
+                    max_workers=0,
+                ))
+
+    def test_unknown_backend(self):
+        with tc.assert_raises(ValueError):
+            resample_batch([], in_rate=16000, out_rate=8000, backend='x')
+
+
+class TestResampleFiles(unittest.TestCase):
+    def test_resample_files(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+            signals = {}
+            for i, dtype in enumerate([np.int16, np.float32, np.int16]):
+                signals[tmp_dir / f'{i}.wav'] = signal = \
+                    np.random.uniform(-0.5, 0.5, size=(i + 1, 5000 + i))
+                dump_audio(
+                    signal, tmp_dir / f'{i}.wav', sample_rate=16000,
+                    dtype=dtype, normalize=False,
+                )
+            files = {src: tmp_dir / 'out' / src.name for src in signals}
+            # A small block_size to test the streaming.
+            actual = resample_files(
+                files, out_rate=8000, max_workers=2, chunksize=2,
+                block_size=1000,
+            )
+            tc.assert_equal(actual, [str(f) for f in files.values()])
+            for src, dst in files.items():
+                expected = resample_polyphase(
+                    load_audio(src), in_rate=16000, out_rate=8000)
+                signal, sample_rate = load_audio(dst, return_sample_rate=True)
+                tc.assert_equal(sample_rate, 8000)
+                tc.assert_allclose(signal, expected, atol=2 ** -15)
+
+    @unittest.skipIf(shutil.which('sox') is None, 'sox is not installed')
+    def test_sox_backend(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            tmp_dir = Path(tmp_dir)
+            signal = np.random.uniform(-0.3, 0.3, size=16000)
+            dump_audio(signal, tmp_dir / 'a.wav', normalize=False,
+                       dtype=np.float32)
+            resample_files(
+                [(tmp_dir / 'a.wav', tmp_dir / 'b.wav')], out_rate=8000,
+                backend='sox', max_workers=0,
+            )
+            tc.assert_array_less(50, snr(
+                load_audio(tmp_dir / 'b.wav'),
+                resample_polyphase(signal, in_rate=16000, out_rate=8000),
+            ))
@@ -352,6 +352,390 @@ class TestSTFTMethods(unittest.TestCase):
         tc.assert_almost_equal(Y_matlab, Y_python)
 
 
+class TestWindowCache(unittest.TestCase):
+    def setUp(self):
+        from paderbox.transform.module_stft import window_cache_clear
+        window_cache_clear()
+
+    def test_cache_hits(self):
+        from paderbox.transform.module_stft import window_cache_info
+        from paderbox.transform.module_stft import STFT
+        x = np.random.normal(size=1000)
+
+        stft_ = STFT(size=64, shift=16, window=signal.windows.blackman)
+        self.assertEqual(window_cache_info()['analysis'].misses, 1)
+        self.assertEqual(window_cache_info()['synthesis'].misses, 0)
+
+        for _ in range(10):
+            stft_.inverse(stft_(x))
+            istft(stft(x, 64, 16), 64, 16)
+
+        self.assertEqual(window_cache_info()['analysis'].misses, 1)
+        self.assertEqual(window_cache_info()['synthesis'].misses, 1)
+        self.assertGreaterEqual(window_cache_info()['analysis'].hits, 20)
+        # The first inverse call calculates the synthesis window.
+        self.assertGreaterEqual(window_cache_info()['synthesis'].hits, 19)
+
+    def test_synthesis_window_is_lazy(self):
+        import warnings
+        from paderbox.transform.module_stft import window_cache_info
+        from paderbox.transform.module_stft import STFT
+        with warnings.catch_warnings():
+            warnings.simplefilter('error')
+            # The synthesis window of a zero window is invalid, but that
+            # matters only for the inverse.
+            stft_ = STFT(size=16, shift=4, window=lambda n: np.zeros(n))
+            stft_(np.ones(100))
+        self.assertEqual(window_cache_info()['synthesis'].currsize, 0)
+
+    def test_cached_window_is_read_only(self):
+        from paderbox.transform.module_stft import _get_analysis_window
+        window = _get_analysis_window('hann', False, 16)
+        with self.assertRaises(ValueError):
+            window[0] = 1
+
+    def test_unhashable_window(self):
+        from paderbox.transform.module_stft import window_cache_info
+
+        class UnhashableWindow:
+            __hash__ = None
+
+            def __call__(self, length):
+                return signal.windows.hann(length)
+
+        x = np.random.normal(size=1000)
+        tc.assert_equal(
+            stft(x, 64, 16, window=UnhashableWindow()),
+            stft(x, 64, 16, window='hann'),
+        )
+        self.assertEqual(window_cache_info()['analysis'].currsize, 1)
+
+    def test_thread_safety(self):
+        from concurrent.futures import ThreadPoolExecutor
+        x = np.random.normal(size=(8, 1000))
+        reference = [stft(x_, 64, 16) for x_ in x]
+        with ThreadPoolExecutor(4) as executor:
+            results = list(executor.map(lambda x_: stft(x_, 64, 16), x))
+        for result, ref in zip(results, reference):
+            tc.assert_equal(result, ref)
+
+
+class TestSTFTChunked(unittest.TestCase):
+    def test_chunked_equals_stft(self):
+        x = np.random.normal(size=(2, 3000))
+        for kwargs in [
+            dict(),
+            dict(size=512, shift=160, window_length=400),
+            dict(size=512, shift=128, fading=None, pad=False),
+        ]:
+            X = stft(x, **kwargs)
+            for max_frames_per_chunk in [1, 4, 5, 1000]:
+                tc.assert_equal(
+                    stft(x, max_frames_per_chunk=max_frames_per_chunk,
+                         **kwargs),
+                    X,
+                )
+
+    def test_chunked_axis(self):
+        x = np.random.normal(size=(2, 3000, 3))
+        tc.assert_equal(
+            stft(x, axis=1, max_frames_per_chunk=3),
+            stft(x, axis=1),
+        )
+
+    def test_chunked_edges(self):
+        x = np.random.normal(size=(2, 37))
+        for kwargs in [
+            dict(size=16, shift=4),
+            dict(size=16, shift=3, fading='half'),
+            dict(size=20, shift=3, window_length=12, pad=False),
+            dict(size=16, shift=4, fading=None),
+        ]:
+            for samples in [0, 1, 15, 16, 17, 37]:
+                X = stft(x[:, :samples], **kwargs)
+                for max_frames_per_chunk in [1, 2, 3, 1000]:
+                    tc.assert_equal(
+                        stft(x[:, :samples],
+                             max_frames_per_chunk=max_frames_per_chunk,
+                             **kwargs),
+                        X,
+                    )
+
+    def test_chunked_peak_memory(self):
+        import tracemalloc
+        x = np.random.normal(size=(8, 16000 * 5))
+        tracemalloc.start()
+        try:
+            X = stft(x, size=512, shift=128, max_frames_per_chunk=32)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        # The padded signal and the windowed frames exist only per chunk
+        # (without chunking, the peak is more than twice the output).
+        tc.assert_array_less(peak, 1.2 * X.nbytes)
+
+
+class TestSTFTSinglePrecision(unittest.TestCase):
+    def test_dtype(self):
+        x = np.random.normal(size=(2, 3000))
+        for dtype in [np.float32, np.complex64, 'float32']:
+            X = stft(x, 512, 128, dtype=dtype)
+            tc.assert_equal(X.dtype, np.complex64)
+            x_hat = istft(X, 512, 128, dtype=dtype, num_samples=3000)
+            tc.assert_equal(x_hat.dtype, np.float32)
+            tc.assert_allclose(x_hat, x, atol=1e-5)
+
+    def test_close_to_double_precision(self):
+        x = np.random.normal(size=(2, 3000))
+        for kwargs in [
+            dict(size=512, shift=128),
+            dict(size=512, shift=160, window_length=400, fading='half'),
+        ]:
+            X = stft(x, dtype=np.float32, **kwargs)
+            tc.assert_allclose(X, stft(x, **kwargs), rtol=1e-4, atol=1e-4)
+            tc.assert_allclose(
+                istft(X, dtype=np.float32, **kwargs),
+                istft(X, **kwargs),
+                rtol=1e-4, atol=1e-5,
+            )
+
+    def test_stft_class(self):
+        from paderbox.transform.module_stft import STFT
+        stft_ = STFT(size=512, shift=128, dtype=np.float32)
+        x = np.random.normal(size=3000).astype(np.float32)
+        X = stft_(x)
+        tc.assert_equal(X.dtype, np.complex64)
+        tc.assert_equal(stft_.inverse(X).dtype, np.float32)
+
+        stream = stft_.stream()
+        tc.assert_equal(
+            np.concatenate([stream(x[:1000]), stream(x[1000:]),
+                            stream.flush()]),
+            X,
+        )
+        inverse_stream = stft_.inverse_stream()
+        tc.assert_equal(
+            np.concatenate([inverse_stream(X[:10]), inverse_stream(X[10:]),
+                            inverse_stream.flush()]),
+            stft_.inverse(X),
+        )
+
+
+class TestRaggedSTFT(unittest.TestCase):
+    def setUp(self):
+        self.xs = [
+            np.random.normal(size=1000),
+            np.random.normal(size=513),
+            np.random.normal(size=10),
+            np.random.normal(size=(2, 3, 900)),
+        ]
+
+    def test_equals_stft(self):
+        from paderbox.transform.module_stft import ragged_stft
+        for fading in [None, False, True, 'full', 'half']:
+            for pad in [True, False]:
+                for kwargs in [
+                    dict(size=64, shift=16),
+                    dict(size=512, shift=160, window_length=400),
+                    dict(size=15, shift=4, window='hann'),
+                ]:
+                    xs = [x for x in self.xs
+                          if pad or fading or x.shape[-1] >= 512]
+                    Xs = ragged_stft(xs, fading=fading, pad=pad, **kwargs)
+                    self.assertEqual(len(Xs), len(xs))
+                    for X, x in zip(Xs, xs):
+                        tc.assert_equal(
+                            X, stft(x, fading=fading, pad=pad, **kwargs),
+                            err_msg=str((fading, pad, kwargs, x.shape))
+                        )
+
+    def test_packed(self):
+        from paderbox.transform.module_stft import ragged_stft
+        packed, offsets = ragged_stft(self.xs, 64, 16, packed=True)
+        tc.assert_equal(len(offsets), len(self.xs) + 1)
+        tc.assert_equal(packed.shape, (offsets[-1], 33))
+        for x, start, stop in zip(self.xs, offsets[:-1], offsets[1:]):
+            X = stft(x, 64, 16)
+            tc.assert_equal(packed[start:stop].reshape(X.shape), X)
+
+    def test_stft_class(self):
+        from paderbox.transform.module_stft import STFT
+        stft_ = STFT(size=64, shift=16, dtype=np.float32)
+        for X, x in zip(stft_.ragged(self.xs), self.xs):
+            tc.assert_equal(X, stft_(x))
+
+    def test_empty(self):
+        from paderbox.transform.module_stft import ragged_stft
+        self.assertEqual(ragged_stft([], 64, 16), [])
+
+
+class TestSTFTStream(unittest.TestCase):
+    def check_stream(self, stft_params, num_samples, chunk_sizes):
+        from paderbox.transform.module_stft import STFT
+        stft = STFT(**stft_params)
+        x = np.random.normal(size=(2, num_samples))
+
+        stream = stft.stream()
+        split_points = np.cumsum(chunk_sizes)
+        X = np.concatenate(
+            [stream(chunk) for chunk in np.split(x, split_points, axis=-1)]
+            + [stream.flush()],
+            axis=-2,
+        )
+        tc.assert_equal(X, stft(x), err_msg=str(stft_params))
+
+    def test_stream_equals_stft(self):
+        for fading in [None, False, True, 'full', 'half']:
+            for pad in [True, False]:
+                for chunk_sizes in [[], [1, 1, 1], [100], [7, 300, 3], [999]]:
+                    self.check_stream(
+                        dict(size=512, shift=128, fading=fading, pad=pad),
+                        num_samples=1000,
+                        chunk_sizes=chunk_sizes,
+                    )
+
+    def test_stream_kaldi_params(self):
+        for fading in [None, 'full', 'half']:
+            self.check_stream(
+                dict(size=512, shift=160, window_length=400, fading=fading,
+                     window='hann', symmetric_window=True),
+                num_samples=8000,
+                chunk_sizes=[160] * 20 + [1, 333],
+            )
+
+    def test_stream_short_signal(self):
+        for fading in [None, 'full', 'half']:
+            self.check_stream(
+                dict(size=512, shift=128, fading=fading),
+                num_samples=10,
+                chunk_sizes=[3],
+            )
+
+    def test_stream_reset_after_flush(self):
+        from paderbox.transform.module_stft import STFT
+        stft = STFT(size=64, shift=16)
+        x = np.random.normal(size=300)
+        stream = stft.stream()
+
+        for _ in range(2):
+            X = np.concatenate([stream(x[:100]), stream(x[100:]),
+                                stream.flush()])
+            tc.assert_equal(X, stft(x))
+
+    def check_inverse_stream(self, stft_params, num_samples, block_sizes):
+        from paderbox.transform.module_stft import STFT
+        stft = STFT(**stft_params)
+        x = np.random.normal(size=(2, num_samples))
+        X = stft(x)
+
+        stream = stft.inverse_stream(num_samples=num_samples)
+        split_points = np.cumsum(block_sizes)
+        x_hat = np.concatenate(
+            [stream(block) for block in np.split(X, split_points, axis=-2)]
+            + [stream.flush()],
+            axis=-1,
+        )
+        tc.assert_equal(
+            x_hat, stft.inverse(X, num_samples=num_samples),
+            err_msg=str(stft_params)
+        )
+
+    def test_inverse_stream_equals_istft(self):
+        for fading in [None, False, True, 'full', 'half']:
+            for block_sizes in [[], [1, 1, 1], [3], [2, 1, 4]]:
+                self.check_inverse_stream(
+                    dict(size=512, shift=128, fading=fading),
+                    num_samples=1000,
+                    block_sizes=block_sizes,
+                )
+
+    def test_inverse_stream_kaldi_params(self):
+        for fading in [None, 'full', 'half']:
+            self.check_inverse_stream(
+                dict(size=512, shift=160, window_length=400, fading=fading,
+                     window='hann'),
+                num_samples=8000,
+                block_sizes=[1] * 20 + [5, 7],
+            )
+
+    def test_stream_round_trip(self):
+        from paderbox.transform.module_stft import STFT
+        stft = STFT(size=512, shift=128)
+        x = np.random.normal(size=5000)
+
+        stream = stft.stream()
+        inverse_stream = stft.inverse_stream(num_samples=len(x))
+        x_hat = np.concatenate(
+            [inverse_stream(stream(chunk)) for chunk in np.split(x, 10)]
+            + [inverse_stream(stream.flush()), inverse_stream.flush()]
+        )
+        tc.assert_allclose(x_hat, x, atol=1e-10)
+
+
+class TestLazySTFT(unittest.TestCase):
+    def check_lazy(self, stft_params, num_samples):
+        from paderbox.transform.module_stft import STFT
+        stft = STFT(**stft_params)
+        x = np.random.normal(size=(2, num_samples))
+        X = stft(x)
+        view = stft.lazy(x)
+        tc.assert_equal(view.shape, X.shape)
+        tc.assert_equal(view.dtype, X.dtype)
+
+        frames = X.shape[-2]
+        for start in range(-2, frames + 2):
+            for stop in range(start, frames + 3):
+                tc.assert_equal(
+                    view[start:stop], X[..., start:stop, :],
+                    err_msg=str((stft_params, start, stop)),
+                )
+        for index in range(-frames, frames):
+            tc.assert_equal(view[index], X[..., index, :])
+        tc.assert_equal(view[::-3], X[..., ::-3, :])
+        tc.assert_equal(np.asarray(view), X)
+
+    def test_lazy_equals_stft(self):
+        for fading in [None, False, True, 'full', 'half']:
+            for pad in [True, False]:
+                self.check_lazy(
+                    dict(size=16, shift=4, fading=fading, pad=pad),
+                    num_samples=50,
+                )
+
+    def test_lazy_short_signal(self):
+        for fading in [None, 'full', 'half']:
+            self.check_lazy(
+                dict(size=16, shift=4, window_length=15, fading=fading),
+                num_samples=5,
+            )
+
+    def test_lazy_index_error(self):
+        from paderbox.transform.module_stft import STFT
+        view = STFT(size=16, shift=4).lazy(np.zeros(50))
+        with tc.assert_raises(IndexError):
+            view[view.shape[-2]]
+        with tc.assert_raises(TypeError):
+            view[[1, 2]]
+
+    def test_lazy_audio_file(self):
+        import tempfile
+        from pathlib import Path
+        import soundfile
+        from paderbox.transform.module_stft import STFT
+        stft = STFT(size=512, shift=160, window_length=400)
+        x = np.random.uniform(-0.5, 0.5, size=(3, 8000))
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = Path(tmp_dir) / 'audio.wav'
+            soundfile.write(str(path), x.T, 16000, subtype='DOUBLE')
+
+            view = stft.lazy(path)
+            tc.assert_equal(view.shape, stft(x).shape)
+            tc.assert_equal(view[3:40], stft(x)[..., 3:40, :])
+
+            view = stft.lazy(path, channel=1)
+            tc.assert_equal(view[-5:], stft(x[1])[-5:])
+
+
 class TestSTFTModule(unittest.TestCase):
     # pad=False, fading=False, additional_pad=0
     # pad=False, fading=False, additional_pad=10
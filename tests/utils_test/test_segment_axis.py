@@ -4,6 +4,7 @@ import numpy as np
 from numpy.testing import assert_equal
 
 from paderbox.array.segment import segment_axis
+from paderbox.array.segment import overlap_add
 
 
 class TestSegment(unittest.TestCase):
@@ -60,3 +61,31 @@ class TestSegment(unittest.TestCase):
             segment_axis(np.ones((2, 3, 4, 5, 6)), axis=2, length=3, shift=2,
                          end='pad').shape,
             (2, 3, 2, 3, 5, 6))
+
+
+class TestOverlapAdd(unittest.TestCase):
+    def reference(self, x, shift):
+        out = np.zeros(
+            (*x.shape[:-2], x.shape[-2] * shift + x.shape[-1] - shift))
+        for t in range(x.shape[-2]):
+            out[..., t * shift:t * shift + x.shape[-1]] += x[..., t, :]
+        return out
+
+    def test_against_reference(self):
+        for length in [1, 3, 4, 16]:
+            for shift in [1, 2, 3, 4, 16, 20]:
+                for frames in [1, 2, 7]:
+                    x = np.random.normal(size=(3, frames, length))
+                    np.testing.assert_allclose(
+                        overlap_add(x, shift), self.reference(x, shift))
+
+    def test_inverts_segment_axis_without_overlap(self):
+        x = np.arange(12)
+        assert_equal(overlap_add(segment_axis(x, 4, 4), 4), x)
+
+    def test_axis(self):
+        x = np.random.normal(size=(2, 5, 6, 3))
+        assert_equal(
+            overlap_add(x, 2, axis=1),
+            np.moveaxis(overlap_add(np.moveaxis(x, -1, 1), 2), 1, -1),
+        )